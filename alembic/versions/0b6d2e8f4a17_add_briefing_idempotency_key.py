@@ -0,0 +1,30 @@
+"""add briefing_snapshots.idempotency_key
+
+Revision ID: 0b6d2e8f4a17
+Revises: f3b81d6a4c29
+Create Date: 2026-10-19 21:40:08.112954
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6d2e8f4a17'
+down_revision: Union[str, Sequence[str], None] = 'f3b81d6a4c29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('briefing_snapshots', sa.Column('idempotency_key', sa.String(length=64), nullable=True))
+    op.create_index('idx_briefing_idempotency', 'briefing_snapshots', ['user_id', 'idempotency_key', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_briefing_idempotency', table_name='briefing_snapshots')
+    op.drop_column('briefing_snapshots', 'idempotency_key')
@@ -0,0 +1,28 @@
+"""add briefing_snapshots.stage_state_zlib
+
+Revision ID: 3e9c5a7b1d62
+Revises: 0b6d2e8f4a17
+Create Date: 2026-10-19 22:15:31.604418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e9c5a7b1d62'
+down_revision: Union[str, Sequence[str], None] = '0b6d2e8f4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('briefing_snapshots', sa.Column('stage_state_zlib', sa.LargeBinary(length=16777215), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('briefing_snapshots', 'stage_state_zlib')
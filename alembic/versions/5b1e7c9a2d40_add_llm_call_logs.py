@@ -0,0 +1,50 @@
+"""add llm_call_logs
+
+Revision ID: 5b1e7c9a2d40
+Revises: 28cdcdfee275
+Create Date: 2026-10-19 10:12:41.203117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c9a2d40'
+down_revision: Union[str, Sequence[str], None] = '28cdcdfee275'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('llm_call_logs',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=True),
+    sa.Column('village_id', sa.BigInteger(), nullable=True),
+    sa.Column('briefing_id', sa.BigInteger(), nullable=True),
+    sa.Column('agent', sa.String(length=64), nullable=False),
+    sa.Column('provider', sa.String(length=32), nullable=False),
+    sa.Column('model', sa.String(length=128), nullable=False),
+    sa.Column('prompt_tokens', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('completion_tokens', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('latency_ms', sa.Float(), server_default=sa.text('0'), nullable=False),
+    sa.Column('queue_wait_ms', sa.Float(), server_default=sa.text('0'), nullable=False),
+    sa.Column('cost_usd', sa.DECIMAL(precision=12, scale=6), server_default=sa.text('0'), nullable=False),
+    sa.Column('success', sa.Boolean(), server_default=sa.text('1'), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_llm_call_agent', 'llm_call_logs', ['agent', 'created_at'], unique=False)
+    op.create_index('idx_llm_call_briefing', 'llm_call_logs', ['briefing_id'], unique=False)
+    op.create_index('idx_llm_call_user', 'llm_call_logs', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_llm_call_user', table_name='llm_call_logs')
+    op.drop_index('idx_llm_call_briefing', table_name='llm_call_logs')
+    op.drop_index('idx_llm_call_agent', table_name='llm_call_logs')
+    op.drop_table('llm_call_logs')
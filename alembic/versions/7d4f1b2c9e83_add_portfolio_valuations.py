@@ -0,0 +1,50 @@
+"""add portfolio valuation tables
+
+Revision ID: 7d4f1b2c9e83
+Revises: 3e9c5a7b1d62
+Create Date: 2026-10-19 23:41:08.114620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4f1b2c9e83'
+down_revision: Union[str, Sequence[str], None] = '3e9c5a7b1d62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('portfolio_asset_valuations',
+    sa.Column('user_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('asset_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('quantity', sa.DECIMAL(precision=24, scale=8), server_default=sa.text('0'), nullable=False),
+    sa.Column('avg_buy_price', sa.DECIMAL(precision=24, scale=8), server_default=sa.text('0'), nullable=False),
+    sa.Column('price', sa.DECIMAL(precision=24, scale=8), nullable=True),
+    sa.Column('market_value', sa.DECIMAL(precision=28, scale=4), server_default=sa.text('0'), nullable=False),
+    sa.Column('cost_value', sa.DECIMAL(precision=28, scale=4), server_default=sa.text('0'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'asset_id')
+    )
+    op.create_index('idx_asset_valuation_asset', 'portfolio_asset_valuations', ['asset_id'], unique=False)
+    op.create_table('portfolio_village_valuations',
+    sa.Column('user_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('village_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('market_value', sa.DECIMAL(precision=28, scale=4), server_default=sa.text('0'), nullable=False),
+    sa.Column('cost_value', sa.DECIMAL(precision=28, scale=4), server_default=sa.text('0'), nullable=False),
+    sa.Column('holding_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'village_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('portfolio_village_valuations')
+    op.drop_index('idx_asset_valuation_asset', table_name='portfolio_asset_valuations')
+    op.drop_table('portfolio_asset_valuations')
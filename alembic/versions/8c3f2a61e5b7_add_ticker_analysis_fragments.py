@@ -0,0 +1,41 @@
+"""add ticker_analysis_fragments
+
+Revision ID: 8c3f2a61e5b7
+Revises: 5b1e7c9a2d40
+Create Date: 2026-10-19 14:03:27.551842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f2a61e5b7'
+down_revision: Union[str, Sequence[str], None] = '5b1e7c9a2d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ticker_analysis_fragments',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('ticker', sa.String(length=32), nullable=False),
+    sa.Column('time_slot', sa.Enum('morning', 'evening', name='briefing_time_slot'), nullable=False),
+    sa.Column('trade_date', sa.String(length=10), nullable=False),
+    sa.Column('price', sa.Float(), nullable=True),
+    sa.Column('change_percent', sa.Float(), nullable=True),
+    sa.Column('note', sa.String(length=512), nullable=False),
+    sa.Column('source', sa.String(length=16), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uk_ticker_fragment', 'ticker_analysis_fragments', ['ticker', 'time_slot', 'trade_date'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uk_ticker_fragment', table_name='ticker_analysis_fragments')
+    op.drop_table('ticker_analysis_fragments')
@@ -0,0 +1,168 @@
+"""compress and partition snapshots, add archive tables
+
+Revision ID: a41d7e93c0f2
+Revises: 8c3f2a61e5b7
+Create Date: 2026-10-19 16:21:08.402517
+
+"""
+import json
+import zlib
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41d7e93c0f2'
+down_revision: Union[str, Sequence[str], None] = '8c3f2a61e5b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BLOB = sa.LargeBinary(length=16777215)
+_MONTHS_AHEAD = 3
+_RESTORE_BATCH = 500
+_ARCHIVE_COLUMNS = {
+    'briefing_snapshots': 'id, user_id, village_id, time_slot, payload_json, payload_zlib, created_at',
+    'rebalancing_snapshots': 'id, user_id, payload_json, payload_zlib, created_at',
+}
+
+
+def _month_start(year: int, month: int) -> date:
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return date(year, month, 1)
+
+
+def _partition_clause() -> str:
+    """기존 행은 p_legacy, 이번 달부터 _MONTHS_AHEAD개월은 월별, 나머지는 pmax."""
+    today = datetime.now(timezone.utc).date()
+    current = _month_start(today.year, today.month)
+    parts = [f"PARTITION p_legacy VALUES LESS THAN (UNIX_TIMESTAMP('{current.isoformat()} 00:00:00'))"]
+    for offset in range(_MONTHS_AHEAD + 1):
+        start = _month_start(today.year, today.month + offset)
+        end = _month_start(start.year, start.month + 1)
+        parts.append(
+            f"PARTITION p{start.year:04d}{start.month:02d} "
+            f"VALUES LESS THAN (UNIX_TIMESTAMP('{end.isoformat()} 00:00:00'))"
+        )
+    parts.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (UNIX_TIMESTAMP(created_at)) (" + ", ".join(parts) + ")"
+
+
+def _snapshot_columns(with_village: bool) -> list:
+    columns = [
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+    ]
+    if with_village:
+        columns += [
+            sa.Column('village_id', sa.BigInteger(), nullable=False),
+            sa.Column('time_slot', sa.Enum('morning', 'evening', name='briefing_time_slot'), nullable=False),
+        ]
+    columns += [
+        sa.Column('payload_json', sa.JSON(), nullable=True),
+        sa.Column('payload_zlib', _BLOB, nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    ]
+    return columns
+
+
+def _upgrade_snapshot_table(table: str, with_village: bool, indexes: dict) -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table(table):
+        # init_db(create_all)로만 만들어졌던 테이블: 마이그레이션 환경에서는 여기서 생성
+        op.create_table(table, *_snapshot_columns(with_village), sa.PrimaryKeyConstraint('id'))
+        for name, cols in indexes.items():
+            op.create_index(name, table, cols, unique=False)
+    else:
+        op.alter_column(table, 'payload_json', existing_type=sa.JSON(), nullable=True)
+        op.add_column(table, sa.Column('payload_zlib', _BLOB, nullable=True))
+
+    if bind.dialect.name == 'mysql':
+        # 파티션 키(created_at)가 모든 unique key에 포함되어야 함
+        op.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)")
+        op.execute(f"ALTER TABLE {table} {_partition_clause()}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _upgrade_snapshot_table(
+        'briefing_snapshots',
+        with_village=True,
+        indexes={
+            'idx_briefing_user': ['user_id'],
+            'idx_briefing_village': ['village_id'],
+            'idx_briefing_latest': ['user_id', 'village_id', 'created_at'],
+        },
+    )
+    _upgrade_snapshot_table(
+        'rebalancing_snapshots',
+        with_village=False,
+        indexes={
+            'idx_rebalancing_user': ['user_id'],
+            'idx_rebalancing_latest': ['user_id', 'created_at'],
+        },
+    )
+
+    op.create_table('briefing_snapshots_archive',
+    sa.Column('id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('village_id', sa.BigInteger(), nullable=False),
+    sa.Column('time_slot', sa.Enum('morning', 'evening', name='briefing_time_slot'), nullable=False),
+    sa.Column('payload_json', sa.JSON(), nullable=True),
+    sa.Column('payload_zlib', _BLOB, nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('archived_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    mysql_row_format='COMPRESSED',
+    )
+    op.create_index('idx_briefing_archive_latest', 'briefing_snapshots_archive', ['user_id', 'village_id', 'created_at'], unique=False)
+    op.create_table('rebalancing_snapshots_archive',
+    sa.Column('id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('payload_json', sa.JSON(), nullable=True),
+    sa.Column('payload_zlib', _BLOB, nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('archived_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    mysql_row_format='COMPRESSED',
+    )
+    op.create_index('idx_rebalancing_archive_latest', 'rebalancing_snapshots_archive', ['user_id', 'created_at'], unique=False)
+
+
+def _restore_json_payloads(table: str) -> None:
+    """payload_zlib에만 있는 payload를 payload_json으로 되돌린다."""
+    bind = op.get_bind()
+    t = sa.table(table, sa.column('id', sa.BigInteger()), sa.column('payload_json', sa.JSON()), sa.column('payload_zlib', _BLOB))
+    while True:
+        rows = bind.execute(
+            sa.select(t.c.id, t.c.payload_zlib)
+            .where(t.c.payload_json.is_(None), t.c.payload_zlib.isnot(None))
+            .limit(_RESTORE_BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.update(t).where(t.c.id == sa.bindparam('b_id')).values(payload_json=sa.bindparam('b_payload', type_=sa.JSON())),
+            [{'b_id': row.id, 'b_payload': json.loads(zlib.decompress(row.payload_zlib).decode('utf-8'))} for row in rows],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema. archive 행은 hot 테이블로 되돌리고, 압축 payload는 payload_json으로 복원."""
+    for table, columns in _ARCHIVE_COLUMNS.items():
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_archive")
+    op.drop_index('idx_rebalancing_archive_latest', table_name='rebalancing_snapshots_archive')
+    op.drop_table('rebalancing_snapshots_archive')
+    op.drop_index('idx_briefing_archive_latest', table_name='briefing_snapshots_archive')
+    op.drop_table('briefing_snapshots_archive')
+    for table in ('rebalancing_snapshots', 'briefing_snapshots'):
+        if op.get_bind().dialect.name == 'mysql':
+            op.execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
+            op.execute(f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+        _restore_json_payloads(table)
+        op.drop_column(table, 'payload_zlib')
+        op.alter_column(table, 'payload_json', existing_type=mysql.JSON(), nullable=False)
@@ -0,0 +1,28 @@
+"""add rebalancing_snapshots.input_key
+
+Revision ID: b8e4d2a6f153
+Revises: 7d4f1b2c9e83
+Create Date: 2026-10-20 00:52:17.430981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4d2a6f153'
+down_revision: Union[str, Sequence[str], None] = '7d4f1b2c9e83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rebalancing_snapshots', sa.Column('input_key', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rebalancing_snapshots', 'input_key')
@@ -0,0 +1,53 @@
+"""add jobs
+
+Revision ID: c7e2b5f18d93
+Revises: a41d7e93c0f2
+Create Date: 2026-10-19 18:44:52.117306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2b5f18d93'
+down_revision: Union[str, Sequence[str], None] = 'a41d7e93c0f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('jobs',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.Enum('queued', 'running', 'succeeded', 'failed', 'cancelled', name='job_status'), server_default=sa.text("'queued'"), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('dedup_key', sa.String(length=191), nullable=True),
+    sa.Column('active_dedup_key', sa.String(length=191), nullable=True),
+    sa.Column('priority', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), server_default=sa.text('3'), nullable=False),
+    sa.Column('run_after', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('locked_by', sa.String(length=128), nullable=True),
+    sa.Column('locked_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('finished_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_jobs_claim', 'jobs', ['status', 'kind', 'run_after', 'priority'], unique=False)
+    op.create_index('idx_jobs_running', 'jobs', ['status', 'locked_at'], unique=False)
+    op.create_index('uk_jobs_active_dedup', 'jobs', ['active_dedup_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uk_jobs_active_dedup', table_name='jobs')
+    op.drop_index('idx_jobs_running', table_name='jobs')
+    op.drop_index('idx_jobs_claim', table_name='jobs')
+    op.drop_table('jobs')
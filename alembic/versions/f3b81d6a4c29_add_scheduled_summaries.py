@@ -0,0 +1,37 @@
+"""add scheduled_summaries
+
+Revision ID: f3b81d6a4c29
+Revises: e5a90c4b7f21
+Create Date: 2026-10-19 21:12:40.517302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b81d6a4c29'
+down_revision: Union[str, Sequence[str], None] = 'e5a90c4b7f21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scheduled_summaries',
+    sa.Column('user_id', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('time_slot', sa.Enum('morning', 'evening', name='briefing_time_slot'), nullable=False),
+    sa.Column('trade_date', sa.String(length=10), nullable=False),
+    sa.Column('summary', sa.Text(), nullable=False),
+    sa.Column('news_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('tickers', sa.JSON(), nullable=True),
+    sa.Column('generated_at', sa.TIMESTAMP(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'time_slot')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('scheduled_summaries')
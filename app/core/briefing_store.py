@@ -1,27 +1,171 @@
-"""최신 브리핑 저장소 (서버 메모리). 스케줄 job이 저장, GET /briefing이 조회."""
+"""
+스케줄 브리핑 요약 저장소. 스케줄 job이 저장, GET /briefing/summary가 조회.
 
+- (user_id, time_slot)별 최신 1건을 scheduled_summaries 테이블에 upsert (user_id=0은 전체 공용 요약)
+- 조회는 프로세스 내 LRU를 먼저 보고, 없으면 DB에서 읽어 채운다 (read-through)
+- 다른 프로세스가 쓴 요약은 TTL(SCHEDULED_SUMMARY_CACHE_TTL_SECONDS)이 지나면 반영
+- DB_ENABLED=False면 LRU만 사용 (단일 프로세스 개발용)
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, Optional
-
-_latest: Optional[Dict[str, Any]] = None
-
-
-def set_latest(
-    summary: str,
-    news_count: int = 0,
-    tickers: Optional[list] = None,
-    generated_at: Optional[datetime] = None,
-) -> None:
-    """가장 최근 생성된 브리핑을 저장."""
-    global _latest
-    _latest = {
-        "summary": summary,
-        "news_count": news_count,
-        "tickers": tickers or [],
-        "generated_at": (generated_at or datetime.utcnow()).isoformat(),
+from typing import Any, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_USER_ID = 0
+_ANY_SLOT = "*"
+
+_Key = Tuple[int, str]
+
+
+def _row_to_dict(row: Any) -> Dict[str, Any]:
+    generated_at = row.generated_at
+    return {
+        "user_id": int(row.user_id),
+        "time_slot": row.time_slot,
+        "trade_date": row.trade_date,
+        "summary": row.summary,
+        "news_count": int(row.news_count or 0),
+        "tickers": list(row.tickers or []),
+        "generated_at": generated_at.isoformat() if isinstance(generated_at, datetime) else str(generated_at),
     }
 
 
-def get_latest() -> Optional[Dict[str, Any]]:
-    """가장 최근 브리핑 반환. 없으면 None."""
-    return _latest
+class BriefingStore:
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        # 값이 None이면 "DB에도 없음" (TTL 동안 반복 조회 방지)
+        self._entries: "OrderedDict[_Key, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def _cache_get(self, key: _Key) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            stored_at, value = entry
+            # DB가 꺼져 있으면 메모리가 유일한 저장소이므로 만료시키지 않음
+            if settings.DB_ENABLED and time.monotonic() - stored_at > self._ttl:
+                del self._entries[key]
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, value
+
+    def _cache_put(self, key: _Key, value: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _save(self, item: Dict[str, Any]) -> None:
+        from app.domain.briefing.model import ScheduledSummary
+
+        values = dict(item, generated_at=datetime.fromisoformat(item["generated_at"]))
+        db = SessionLocal()
+        try:
+            for _attempt in range(2):
+                try:
+                    db.merge(ScheduledSummary(**values))
+                    db.commit()
+                    return
+                except IntegrityError:
+                    # 다른 워커가 같은 키를 먼저 넣은 경우 → 다시 merge하면 update
+                    db.rollback()
+        finally:
+            db.close()
+
+    def _load(self, user_id: int, time_slot: Optional[str]) -> Optional[Dict[str, Any]]:
+        from app.domain.briefing.model import ScheduledSummary
+
+        db = SessionLocal()
+        try:
+            query = db.query(ScheduledSummary).filter(ScheduledSummary.user_id == user_id)
+            if time_slot:
+                query = query.filter(ScheduledSummary.time_slot == time_slot)
+            row = query.order_by(ScheduledSummary.generated_at.desc()).first()
+            return _row_to_dict(row) if row else None
+        finally:
+            db.close()
+
+    def set(
+        self,
+        summary: str,
+        news_count: int = 0,
+        tickers: Optional[list] = None,
+        generated_at: Optional[datetime] = None,
+        user_id: int = GLOBAL_USER_ID,
+        time_slot: str = "morning",
+        trade_date: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """요약 저장. DB 저장이 실패해도 이 프로세스의 캐시에는 남긴다."""
+        generated_at = generated_at or datetime.utcnow()
+        item = {
+            "user_id": int(user_id),
+            "time_slot": time_slot,
+            "trade_date": trade_date or datetime.now(ZoneInfo(settings.BRIEFING_SCHEDULE_TIMEZONE)).date().isoformat(),
+            "summary": summary,
+            "news_count": news_count,
+            "tickers": list(tickers or []),
+            "generated_at": generated_at.isoformat(),
+        }
+        if settings.DB_ENABLED:
+            try:
+                self._save(item)
+            except Exception as e:
+                logger.warning("Failed to persist scheduled summary (user_id=%s, slot=%s): %s", user_id, time_slot, e)
+        self._cache_put((int(user_id), time_slot), item)
+        with self._lock:
+            self._entries.pop((int(user_id), _ANY_SLOT), None)
+        return item
+
+    def get(self, user_id: int = GLOBAL_USER_ID, time_slot: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """(user, 슬롯)의 최신 요약. time_slot이 없으면 두 슬롯 중 가장 최근 것."""
+        key = (int(user_id), time_slot or _ANY_SLOT)
+        found, value = self._cache_get(key)
+        if found:
+            return value
+        if not settings.DB_ENABLED:
+            return None
+        try:
+            value = self._load(int(user_id), time_slot)
+        except Exception as e:
+            logger.warning("Failed to load scheduled summary (user_id=%s, slot=%s): %s", user_id, time_slot, e)
+            return None
+        self._cache_put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+
+briefing_store = BriefingStore(
+    ttl_seconds=settings.SCHEDULED_SUMMARY_CACHE_TTL_SECONDS,
+    max_entries=settings.SCHEDULED_SUMMARY_CACHE_MAX_ENTRIES,
+)
+
+
+def get_latest(user_id: int = GLOBAL_USER_ID, time_slot: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """가장 최근 브리핑 요약 반환. 없으면 None."""
+    return briefing_store.get(user_id=user_id, time_slot=time_slot)
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Dict, Literal
 
 from pydantic_settings import BaseSettings
 
@@ -14,14 +14,96 @@ class Settings(BaseSettings):
     DB_ENABLED: bool = True
 
     # AI 브리핑 (개미 마을 수석 이장)
-    BRIEFING_LLM_PROVIDER: Literal["openai", "anthropic", "none"] = "none"
+    BRIEFING_LLM_PROVIDER: Literal["openai", "anthropic", "fake", "none"] = "none"
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o-mini"
     ANTHROPIC_API_KEY: str = ""
     ANTHROPIC_MODEL: str = "claude-3-5-haiku-20241022"
 
+    # LLM 동시성 제한 (전체 상한 / batch 레인 상한 / 슬롯 대기 타임아웃)
+    LLM_MAX_CONCURRENCY: int = 4
+    LLM_BATCH_MAX_CONCURRENCY: int = 2
+    LLM_QUEUE_TIMEOUT_SECONDS: float = 120.0
+    # LLM 호출 deadline 및 헤징 (primary p95 지연 초과 시 secondary provider 동시 호출)
+    LLM_CALL_TIMEOUT_SECONDS: float = 45.0
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_PROVIDER: str = ""  # 비우면 openai <-> anthropic
+    LLM_HEDGE_DELAY_SECONDS: float = 8.0  # p95 표본이 부족할 때 사용
+    LLM_HEALTH_FAILOVER_THRESHOLD: float = 0.5
+    # 프롬프트 레지스트리 버전 확인 주기 (초)
+    PROMPT_CACHE_TTL_SECONDS: float = 30.0
+    # LLM 호출 로그(llm_call_logs) DB 저장 여부
+    LLM_CALL_LOG_ENABLED: bool = False
+    # 뉴스 분석 결과 공유 캐시 (정규화된 뉴스 세트 + 종목 + 슬롯 기준, 0이면 비활성)
+    NEWS_ANALYSIS_CACHE_TTL_SECONDS: float = 1800.0
+    NEWS_ANALYSIS_CACHE_MAX_ENTRIES: int = 2048
+    # 종목별 분석 조각 (llm: 종목당 1회 LLM 노트, template: 시세 기반 문장만)
+    TICKER_FRAGMENT_MODE: Literal["llm", "template"] = "llm"
+    TICKER_FRAGMENT_CACHE_TTL_SECONDS: float = 21600.0
+    TICKER_FRAGMENT_CACHE_MAX_ENTRIES: int = 8192
+
+    # tracing (HTTP 요청·SQL·시세/뉴스 수집·LLM 호출 span). exporter: none | console | file | "모듈:팩토리"
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "file"
+    TRACING_FILE_PATH: str = "traces/spans.jsonl"
+
+    # 부하 테스트용 fake provider (지연: 로그정규 분포 ms, 오류율: 0~1)
+    FAKE_LLM_SEED: int = 0
+    FAKE_LLM_LATENCY_MEDIAN_MS: float = 800.0
+    FAKE_LLM_LATENCY_SIGMA: float = 0.5
+    FAKE_LLM_LATENCY_MAX_MS: float = 30000.0
+    FAKE_LLM_ERROR_RATE: float = 0.0
+
     # 스케줄 브리핑 (APScheduler: 9시·17시)
     BRIEFING_SCHEDULE_TIMEZONE: str = "Asia/Seoul"
+    # 스케줄 요약(scheduled_summaries) 조회 캐시 (다른 프로세스가 쓴 요약 반영 지연 상한)
+    SCHEDULED_SUMMARY_CACHE_TTL_SECONDS: float = 60.0
+    SCHEDULED_SUMMARY_CACHE_MAX_ENTRIES: int = 50000
+    # 스케줄 요약('오늘의 투자 포인트') 생성 provider (BRIEFING_LLM_PROVIDER와 별도 고정, fake 모드에서는 fake로 대체)
+    SCHEDULED_SUMMARY_LLM_PROVIDER: Literal["openai", "anthropic", "fake", "none"] = "openai"
+    # 다중 프로세스/레플리카에서 스케줄 job은 lease를 잡은 리더 한 곳에서만 실행
+    SCHEDULER_LEADER_ELECTION_ENABLED: bool = True
+    SCHEDULER_LEASE_TTL_SECONDS: float = 30.0
+    SCHEDULER_LEASE_RENEW_SECONDS: float = 10.0
+    SCHEDULER_MISFIRE_GRACE_SECONDS: int = 120
+    # 슬롯별 배치 브리핑 (활성 user×village 전체, 8시·16시). 전체 사용자 LLM 호출이 생기므로 명시적으로 켠다
+    BRIEFING_BATCH_ENABLED: bool = False
+    BRIEFING_BATCH_CONCURRENCY: int = 8
+    # /briefing/latest 직렬화 캐시 (다른 프로세스가 쓴 스냅샷 반영 지연 상한, 0이면 비활성)
+    LATEST_BRIEFING_CACHE_TTL_SECONDS: float = 60.0
+    LATEST_BRIEFING_CACHE_MAX_ENTRIES: int = 50000
+    # POST /briefing/generate 멱등 윈도우: 같은 키의 스냅샷이 이 시간 안에 있으면 재생성 없이 반환 (0이면 비활성)
+    BRIEFING_IDEMPOTENCY_WINDOW_SECONDS: float = 600.0
+    # 비동기 브리핑 생성 (POST /briefing/jobs → 202): 대기+실행 중 작업 상한, SSE 구독 폴링 주기/최대 시간
+    BRIEFING_ASYNC_MAX_PENDING: int = 500
+    BRIEFING_JOB_EVENTS_POLL_SECONDS: float = 1.0
+    BRIEFING_JOB_EVENTS_TIMEOUT_SECONDS: float = 120.0
+    # JOB_QUEUE_ENABLED=False(별도 워커 없음)일 때 API 프로세스 안에서 브리핑 작업을 처리할 스레드 수 (0이면 끔)
+    BRIEFING_ASYNC_EMBEDDED_WORKERS: int = 2
+    # 리밸런싱 추천 스냅샷 유효 시간. 지나면 요약 조회 시 기존 스냅샷을 보여주고 백그라운드로 갱신
+    REBALANCING_SNAPSHOT_MAX_AGE_SECONDS: float = 21600.0
+    # 스냅샷 retention (매일 03:30): 키별 최신 N개만 hot, 나머지는 archive / 월별 파티션 유지
+    SNAPSHOT_RETENTION_ENABLED: bool = True
+    BRIEFING_SNAPSHOT_KEEP_PER_VILLAGE: int = 10
+    REBALANCING_SNAPSHOT_KEEP_PER_USER: int = 5
+    SNAPSHOT_RETENTION_BATCH_SIZE: int = 1000
+    SNAPSHOT_PARTITION_MONTHS_AHEAD: int = 3
+    SNAPSHOT_PARTITION_KEEP_MONTHS: int = 12
+
+    # DB 작업 큐 (켜면 한줄평 등 생성 작업을 jobs 테이블에 넣고 별도 워커 프로세스가 처리)
+    JOB_QUEUE_ENABLED: bool = False
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: float = 10.0
+    JOB_RETRY_MAX_SECONDS: float = 600.0
+    JOB_LOCK_TIMEOUT_SECONDS: float = 900.0
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_WORKER_CONCURRENCY: int = 4
+    # kind별 전체 워커 합산 동시 실행 상한
+    JOB_KIND_CONCURRENCY: Dict[str, int] = {
+        "briefing.generate": 8,
+        "rebalancing.snapshot": 4,
+        "village.one_liner": 2,
+    }
 
     class Config:
         env_file = ".env"
@@ -1,9 +1,11 @@
+import time
 from typing import Generator
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import Pool
 
 from app.core.config import settings
+from app.core.tracing import record_span, tracing_enabled
 
 # Create SQLAlchemy engine
 engine = create_engine(
@@ -25,6 +27,50 @@ def set_mysql_pragma(dbapi_conn, connection_record):
     cursor.close()
 
 
+# SQL 실행 구간을 tracing span(db.query)으로 기록
+_TRACE_STATEMENT_MAX_LENGTH = 500
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _trace_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if tracing_enabled():
+        conn.info.setdefault("trace_starts", []).append((time.time(), time.perf_counter()))
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _trace_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("trace_starts")
+    if not starts:
+        return
+    wall, perf = starts.pop()
+    record_span(
+        "db.query",
+        wall,
+        time.perf_counter() - perf,
+        statement=statement[:_TRACE_STATEMENT_MAX_LENGTH],
+        rowcount=cursor.rowcount,
+        executemany=executemany,
+    )
+
+
+@event.listens_for(engine, "handle_error")
+def _trace_handle_error(exception_context):
+    conn = exception_context.connection
+    starts = conn.info.get("trace_starts") if conn is not None else None
+    if not starts:
+        return
+    wall, perf = starts.pop()
+    statement = exception_context.statement or ""
+    record_span(
+        "db.query",
+        wall,
+        time.perf_counter() - perf,
+        status="error",
+        statement=statement[:_TRACE_STATEMENT_MAX_LENGTH],
+        error=type(exception_context.original_exception).__name__,
+    )
+
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -0,0 +1,215 @@
+"""
+경량 tracing: span 단위로 소요 시간과 속성을 기록해 exporter로 보낸다.
+
+- span("name", key=value): with 블록 하나가 span 하나. 부모는 contextvar로 자동 연결
+  (스레드로 넘길 때는 contextvars.copy_context()로 컨텍스트를 복사해야 같은 trace로 묶인다)
+- record_span(): 시작/끝 시각을 이미 알고 있는 구간(SQL 실행 등)을 사후 기록
+- exporter: TRACING_EXPORTER = none | console | file | "모듈:팩토리" (SpanExporter를 반환하는 callable)
+  file은 TRACING_FILE_PATH에 JSON Lines로 append → 오프라인 분석용
+- TRACING_ENABLED=False면 span()은 아무것도 하지 않는다
+"""
+
+from __future__ import annotations
+
+import contextvars
+from abc import ABC, abstractmethod
+import importlib
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_time: float = 0.0  # epoch seconds
+    duration_ms: float = 0.0
+    status: str = "ok"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attrs: Any) -> None:
+        self.attributes.update(attrs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(ABC):
+    """span이 끝날 때마다 export()가 호출된다. 느린 exporter는 내부에서 버퍼링할 것."""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        ...
+
+    def shutdown(self) -> None:
+        pass
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """로거(app.core.tracing)로 span 한 줄씩 출력."""
+
+    def export(self, span: Span) -> None:
+        logger.info("span %s", json.dumps(span.to_dict(), ensure_ascii=False, default=str))
+
+
+class FileSpanExporter(SpanExporter):
+    """JSON Lines 파일에 append."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_exporter: Optional[SpanExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def _build_exporter(name: str) -> Optional[SpanExporter]:
+    if name in ("", "none"):
+        return None
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "file":
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    module_name, _, attr = name.partition(":")
+    factory = getattr(importlib.import_module(module_name), attr)
+    exporter = factory()
+    if not isinstance(exporter, SpanExporter):
+        raise TypeError(f"TRACING_EXPORTER {name!r} did not return a SpanExporter")
+    return exporter
+
+
+def set_exporter(exporter: Optional[SpanExporter]) -> None:
+    """exporter 교체 (None이면 수집 중단). 이전 exporter는 shutdown."""
+    global _exporter
+    with _exporter_lock:
+        previous, _exporter = _exporter, exporter
+    if previous is not None and previous is not exporter:
+        previous.shutdown()
+
+
+def get_exporter() -> Optional[SpanExporter]:
+    return _exporter
+
+
+def configure_tracing() -> None:
+    """설정(TRACING_ENABLED, TRACING_EXPORTER)에 따라 exporter 설치. 앱 시작 시 1회 호출."""
+    if not settings.TRACING_ENABLED:
+        set_exporter(None)
+        return
+    try:
+        set_exporter(_build_exporter(settings.TRACING_EXPORTER))
+    except Exception as e:
+        logger.warning("Failed to configure tracing exporter %r: %s", settings.TRACING_EXPORTER, e)
+        set_exporter(None)
+
+
+def tracing_enabled() -> bool:
+    return _exporter is not None
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def _new_span(name: str, attrs: Dict[str, Any]) -> Span:
+    parent = _current_span.get()
+    return Span(
+        name=name,
+        trace_id=parent.trace_id if parent else secrets.token_hex(16),
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id if parent else None,
+        attributes=dict(attrs),
+    )
+
+
+def _export(span: Span) -> None:
+    exporter = _exporter
+    if exporter is None:
+        return
+    try:
+        exporter.export(span)
+    except Exception as e:
+        logger.debug("Span export failed: %s", e)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Any]:
+    """with span("market.quote", ticker="AAPL") as s: ... s.set_attribute("rows", 3)"""
+    if _exporter is None:
+        yield _NOOP_SPAN
+        return
+    s = _new_span(name, attrs)
+    s.start_time = time.time()
+    started = time.perf_counter()
+    token = _current_span.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.status = "error"
+        s.attributes.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        s.duration_ms = round((time.perf_counter() - started) * 1000.0, 3)
+        _export(s)
+
+
+def propagate_context(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """fn을 호출 시점이 아닌 지금의 컨텍스트(현재 span 등)에서 실행하도록 감싼다. 스레드 풀 제출용."""
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.copy().run(fn, *args, **kwargs)
+
+
+def record_span(name: str, start_time: float, duration_seconds: float, status: str = "ok", **attrs: Any) -> None:
+    """이미 끝난 구간을 현재 span의 자식으로 기록 (start_time: epoch seconds)."""
+    if _exporter is None:
+        return
+    s = _new_span(name, attrs)
+    s.start_time = start_time
+    s.duration_ms = round(duration_seconds * 1000.0, 3)
+    s.status = status
+    _export(s)
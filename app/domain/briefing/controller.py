@@ -1,12 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 
 from app.domain.briefing.schema.request import BriefingGenerateRequest
-from app.domain.briefing.schema.response import BriefingGenerateResponse
+from app.domain.briefing.schema.response import (
+    BriefingGenerateResponse,
+    BriefingJobResponse,
+    ScheduledSummaryResponse,
+)
+from app.core.config import settings
+from app.core.briefing_store import GLOBAL_USER_ID, get_latest
 from app.core.database import get_db
 from app.domain.briefing.model import BriefingSnapshot
-from app.services.briefing import generate_briefing
+from app.services.briefing.async_jobs import (
+    BriefingQueueFull,
+    get_briefing_job,
+    iter_job_events,
+    job_view,
+    submit_briefing_job,
+)
+from app.services.briefing.idempotency import generate_briefing_idempotent
+from app.services.briefing.batch import get_batch_progress
+from app.services.briefing.snapshot_cache import latest_snapshot_cache
 
 router = APIRouter()
 
@@ -14,13 +32,66 @@ router = APIRouter()
 @router.post("/generate", response_model=BriefingGenerateResponse)
 async def post_briefing_generate(
     payload: BriefingGenerateRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
 ) -> BriefingGenerateResponse:
-    """브리핑 생성 API."""
+    """
+    브리핑 생성 API. 같은 (user, village, 슬롯, 거래일) 또는 같은 Idempotency-Key의 반복 요청은
+    진행 중인 생성에 합류하거나 기존 스냅샷을 반환한다 (Idempotent-Replayed: true).
+    """
     try:
-        return await generate_briefing(payload, db=db)
+        result, replayed = await generate_briefing_idempotent(payload, db=db, client_key=idempotency_key)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+def _job_urls(job_id: int) -> dict:
+    base = f"{settings.API_V1_STR}/briefing/jobs/{job_id}"
+    return {"status_url": base, "events_url": f"{base}/events"}
+
+
+@router.post("/jobs", response_model=BriefingJobResponse, status_code=202)
+def post_briefing_job(
+    payload: BriefingGenerateRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """
+    비동기 브리핑 생성. 작업을 등록하고 바로 202 + job_id 반환 (status_url 폴링 또는 events_url SSE 구독).
+    멱등 키가 같은 스냅샷이 이미 있으면 200 + 결과, 진행 중인 작업이 있으면 그 작업을 반환.
+    """
+    try:
+        job, existing = submit_briefing_job(db, payload, client_key=idempotency_key)
+    except BriefingQueueFull:
+        raise HTTPException(status_code=429, detail="Too many pending briefing jobs.", headers={"Retry-After": "5"})
+    if existing is not None:
+        body = BriefingJobResponse(status="succeeded", briefing=existing)
+        return JSONResponse(status_code=200, content=body.model_dump(mode="json"))
+    body = BriefingJobResponse(**job_view(db, job), **_job_urls(job.id))
+    return JSONResponse(status_code=202, content=body.model_dump(mode="json"))
+
+
+@router.get("/jobs/{job_id}", response_model=BriefingJobResponse)
+def get_briefing_job_status(job_id: int, db: Session = Depends(get_db)) -> BriefingJobResponse:
+    """비동기 브리핑 작업 상태 조회 (성공 시 briefing 포함)."""
+    job = get_briefing_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return BriefingJobResponse(**job_view(db, job), **_job_urls(job.id))
+
+
+@router.get("/jobs/{job_id}/events")
+def get_briefing_job_events(job_id: int) -> StreamingResponse:
+    """비동기 브리핑 작업 완료 구독 (text/event-stream: status → done)."""
+    return StreamingResponse(
+        iter_job_events(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/latest", response_model=BriefingGenerateResponse)
@@ -28,14 +99,38 @@ def get_latest_briefing(
     user_id: int = Query(...),
     village_id: int = Query(...),
     db: Session = Depends(get_db),
-) -> BriefingGenerateResponse:
-    """가장 최신 브리핑 스냅샷 조회."""
-    latest = (
-        db.query(BriefingSnapshot)
-        .filter(BriefingSnapshot.user_id == user_id, BriefingSnapshot.village_id == village_id)
-        .order_by(desc(BriefingSnapshot.created_at))
-        .first()
-    )
-    if not latest:
-        raise HTTPException(status_code=404, detail="No briefing snapshot found.")
-    return BriefingGenerateResponse(**latest.payload_json)
+) -> Response:
+    """가장 최신 브리핑 스냅샷 조회. 직렬화된 JSON bytes를 캐시에서 그대로 반환."""
+    body = latest_snapshot_cache.get(user_id, village_id)
+    if body is None:
+        latest = (
+            db.query(BriefingSnapshot)
+            .filter(BriefingSnapshot.user_id == user_id, BriefingSnapshot.village_id == village_id)
+            .order_by(desc(BriefingSnapshot.created_at))
+            .first()
+        )
+        if not latest:
+            raise HTTPException(status_code=404, detail="No briefing snapshot found.")
+        body = BriefingGenerateResponse(**latest.payload).model_dump_json().encode("utf-8")
+        latest_snapshot_cache.put(user_id, village_id, body)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/summary", response_model=ScheduledSummaryResponse)
+def get_scheduled_summary(
+    user_id: int = Query(GLOBAL_USER_ID),
+    time_slot: Optional[Literal["morning", "evening"]] = Query(None),
+) -> dict:
+    """스케줄 job이 만든 최신 요약 조회. 사용자별 요약이 없으면 전체 공용 요약."""
+    summary = get_latest(user_id=user_id, time_slot=time_slot)
+    if summary is None and user_id != GLOBAL_USER_ID:
+        summary = get_latest(user_id=GLOBAL_USER_ID, time_slot=time_slot)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No scheduled summary found.")
+    return summary
+
+
+@router.get("/batch/progress")
+def get_briefing_batch_progress() -> dict:
+    """가장 최근 배치 브리핑 진행 상황 (실행 이력이 없으면 null)."""
+    return {"progress": get_batch_progress()}
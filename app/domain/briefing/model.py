@@ -1,15 +1,20 @@
-from sqlalchemy import BigInteger, Enum, JSON, Index, TIMESTAMP, func
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Boolean, DECIMAL, Enum, Float, Integer, Index, JSON, LargeBinary, String, TIMESTAMP, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.domain.common.model import Base
+from app.domain.common.model import Base, CompressedPayloadMixin
 
 
-class BriefingSnapshot(Base):
+class BriefingSnapshot(Base, CompressedPayloadMixin):
+    # MySQL에서는 created_at 기준 월별 RANGE 파티션 (DB PK는 (id, created_at), ORM 식별자는 id)
     __tablename__ = "briefing_snapshots"
     __table_args__ = (
         Index("idx_briefing_user", "user_id"),
         Index("idx_briefing_village", "village_id"),
         Index("idx_briefing_latest", "user_id", "village_id", "created_at"),
+        Index("idx_briefing_idempotency", "user_id", "idempotency_key", "created_at"),
     )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
@@ -19,10 +24,101 @@ class BriefingSnapshot(Base):
         Enum("morning", "evening", name="briefing_time_slot"),
         nullable=False,
     )
-    payload_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # POST /briefing/generate 멱등 키 (요청 파라미터+거래일 또는 요청 파라미터+클라이언트 Idempotency-Key 해시)
+    idempotency_key: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # 단계별 입력 fingerprint와 출력 (압축 JSON). 다음 생성 때 입력이 같은 단계는 재계산하지 않는다
+    stage_state_zlib: Mapped[Optional[bytes]] = mapped_column(LargeBinary(16777215), nullable=True, deferred=True)
     created_at: Mapped[str] = mapped_column(
         TIMESTAMP, nullable=False, server_default=func.current_timestamp()
     )
 
 
-__all__ = ["BriefingSnapshot"]
+class BriefingSnapshotArchive(Base, CompressedPayloadMixin):
+    """retention job이 hot 테이블에서 옮겨 온 오래된 브리핑 스냅샷 (id/created_at은 원본 유지)."""
+
+    __tablename__ = "briefing_snapshots_archive"
+    __table_args__ = (
+        Index("idx_briefing_archive_latest", "user_id", "village_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    village_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    time_slot: Mapped[str] = mapped_column(
+        Enum("morning", "evening", name="briefing_time_slot"),
+        nullable=False,
+    )
+    created_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=False)
+    archived_at: Mapped[str] = mapped_column(
+        TIMESTAMP, nullable=False, server_default=func.current_timestamp()
+    )
+
+
+class LLMCallLog(Base):
+    __tablename__ = "llm_call_logs"
+    __table_args__ = (
+        Index("idx_llm_call_user", "user_id", "created_at"),
+        Index("idx_llm_call_briefing", "briefing_id"),
+        Index("idx_llm_call_agent", "agent", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    user_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    village_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    briefing_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    agent: Mapped[str] = mapped_column(String(64), nullable=False)
+    provider: Mapped[str] = mapped_column(String(32), nullable=False)
+    model: Mapped[str] = mapped_column(String(128), nullable=False)
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    latency_ms: Mapped[float] = mapped_column(Float, nullable=False, server_default=text("0"))
+    queue_wait_ms: Mapped[float] = mapped_column(Float, nullable=False, server_default=text("0"))
+    cost_usd: Mapped[float] = mapped_column(DECIMAL(12, 6), nullable=False, server_default=text("0"))
+    success: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("1"))
+    created_at: Mapped[str] = mapped_column(
+        TIMESTAMP, nullable=False, server_default=func.current_timestamp()
+    )
+
+
+class TickerAnalysisFragment(Base):
+    """(종목, 슬롯, 날짜)별 짧은 분석 노트. 모든 사용자/마을 브리핑이 공유."""
+
+    __tablename__ = "ticker_analysis_fragments"
+    __table_args__ = (
+        Index("uk_ticker_fragment", "ticker", "time_slot", "trade_date", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    ticker: Mapped[str] = mapped_column(String(32), nullable=False)
+    time_slot: Mapped[str] = mapped_column(
+        Enum("morning", "evening", name="briefing_time_slot"),
+        nullable=False,
+    )
+    trade_date: Mapped[str] = mapped_column(String(10), nullable=False)
+    price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    change_percent: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    note: Mapped[str] = mapped_column(String(512), nullable=False)
+    source: Mapped[str] = mapped_column(String(16), nullable=False)
+    created_at: Mapped[str] = mapped_column(
+        TIMESTAMP, nullable=False, server_default=func.current_timestamp()
+    )
+
+
+class ScheduledSummary(Base):
+    """스케줄 job이 만든 '오늘의 투자 포인트' 요약. (user, 슬롯)별 최신 1건 (user_id=0은 전체 공용)."""
+
+    __tablename__ = "scheduled_summaries"
+
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    time_slot: Mapped[str] = mapped_column(
+        Enum("morning", "evening", name="briefing_time_slot"),
+        primary_key=True,
+    )
+    trade_date: Mapped[str] = mapped_column(String(10), nullable=False)
+    summary: Mapped[str] = mapped_column(Text, nullable=False)
+    news_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    tickers: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    generated_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+
+
+__all__ = ["BriefingSnapshot", "BriefingSnapshotArchive", "LLMCallLog", "ScheduledSummary", "TickerAnalysisFragment"]
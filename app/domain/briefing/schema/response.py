@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import List, Literal, Optional
 
 from pydantic import ConfigDict
 
@@ -81,3 +81,27 @@ class BriefingGenerateResponse(BaseSchema):
             ]
         },
     )
+
+
+class ScheduledSummaryResponse(BaseSchema):
+    """스케줄 job이 만든 '오늘의 투자 포인트' 요약."""
+
+    user_id: int
+    time_slot: Literal["morning", "evening"]
+    trade_date: str
+    summary: str
+    news_count: int
+    tickers: List[str]
+    generated_at: str
+
+
+class BriefingJobResponse(BaseSchema):
+    """비동기 브리핑 생성 작업 상태. 성공하면 briefing에 결과가 담긴다."""
+
+    job_id: Optional[int] = None
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    attempts: int = 0
+    error: Optional[str] = None
+    briefing: Optional[BriefingGenerateResponse] = None
+    status_url: Optional[str] = None
+    events_url: Optional[str] = None
@@ -1,8 +1,14 @@
+import json
+import zlib
 from datetime import datetime
+from typing import Any, Optional
 
-from sqlalchemy import TIMESTAMP, func
+from sqlalchemy import JSON, LargeBinary, TIMESTAMP, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+# MySQL MEDIUMBLOB
+_MEDIUM_BLOB_LENGTH = 16777215
+
 
 class Base(DeclarativeBase):
     pass
@@ -24,3 +30,36 @@ class CreatedAtMixin:
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP, nullable=False, server_default=func.current_timestamp()
     )
+
+
+def encode_payload(value: Any) -> bytes:
+    """JSON 직렬화 후 zlib 압축."""
+    raw = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    return zlib.compress(raw.encode("utf-8"), 6)
+
+
+def decode_payload(data: Optional[bytes]) -> Any:
+    if data is None:
+        return None
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+class CompressedPayloadMixin:
+    """
+    스냅샷 payload를 압축(payload_zlib)해 저장. 읽기/쓰기는 payload 속성으로.
+    압축 도입 전 행은 payload_json에 남아 있으며 그대로 읽힌다 (retention job이 점진적으로 압축).
+    """
+
+    payload_json: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+    payload_zlib: Mapped[Optional[bytes]] = mapped_column(LargeBinary(_MEDIUM_BLOB_LENGTH), nullable=True)
+
+    @property
+    def payload(self) -> Any:
+        if self.payload_zlib is not None:
+            return decode_payload(self.payload_zlib)
+        return self.payload_json
+
+    @payload.setter
+    def payload(self, value: Any) -> None:
+        self.payload_zlib = encode_payload(value)
+        self.payload_json = None
@@ -1,10 +1,10 @@
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, List, Tuple
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.domain.asset.model import Asset, AssetPrice
+from app.domain.asset.model import Asset
 from app.domain.dashboard.schema.response import (
     Allocation,
     AllocationGroup,
@@ -12,8 +12,9 @@ from app.domain.dashboard.schema.response import (
     DashboardResponse,
     MdaInfo,
 )
-from app.domain.portfolio.model import UserPortfolio
+from app.domain.portfolio.model import PortfolioAssetValuation
 from app.domain.user.model import User
+from app.services.portfolio.valuation import ensure_user_valuations
 
 
 def _decimal_to_int(value: Decimal) -> int:
@@ -50,44 +51,22 @@ def get_dashboard(user_id: int, db: Session) -> DashboardResponse | None:
     if user is None:
         return None
 
-    latest_price_subq = (
-        select(
-            AssetPrice.asset_id.label("asset_id"),
-            func.max(AssetPrice.as_of).label("max_as_of"),
-        )
-        .group_by(AssetPrice.asset_id)
-        .subquery()
-    )
-
-    price_subq = (
-        select(
-            AssetPrice.asset_id.label("asset_id"),
-            AssetPrice.price.label("price"),
-        )
-        .join(
-            latest_price_subq,
-            and_(
-                AssetPrice.asset_id == latest_price_subq.c.asset_id,
-                AssetPrice.as_of == latest_price_subq.c.max_as_of,
-            ),
-        )
-        .subquery()
-    )
-
-    price_expr = func.coalesce(price_subq.c.price, UserPortfolio.avg_buy_price, 0)
+    # 평가 테이블((user, asset) PK 범위 조회). 현재가가 없는 종목은 평균 매수가로 평가
+    price_expr = func.coalesce(PortfolioAssetValuation.price, PortfolioAssetValuation.avg_buy_price, 0)
     stmt = (
         select(
-            UserPortfolio.quantity.label("quantity"),
+            PortfolioAssetValuation.quantity.label("quantity"),
             price_expr.label("price"),
             Asset.country_code.label("country"),
             Asset.asset_type.label("asset_type"),
         )
-        .join(Asset, Asset.asset_id == UserPortfolio.asset_id)
-        .outerjoin(price_subq, price_subq.c.asset_id == UserPortfolio.asset_id)
-        .where(UserPortfolio.user_id == user_id)
+        .join(Asset, Asset.asset_id == PortfolioAssetValuation.asset_id)
+        .where(PortfolioAssetValuation.user_id == user_id)
     )
 
     rows = db.execute(stmt).all()
+    if not rows and ensure_user_valuations(db, user_id):
+        rows = db.execute(stmt).all()
     total_value = Decimal("0")
     country_totals: Dict[str, Decimal] = {}
     type_totals: Dict[str, Decimal] = {}
@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import BigInteger, Enum, Index, Integer, JSON, String, TIMESTAMP, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.domain.common.model import Base, CreatedUpdatedMixin
+
+
+class Job(Base, CreatedUpdatedMixin):
+    """
+    DB 기반 작업 큐. 워커는 SELECT ... FOR UPDATE SKIP LOCKED로 queued 작업을 가져간다.
+    active_dedup_key는 queued/running 동안만 채워져, 같은 키의 활성 작업이 둘 생기지 않게 한다.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("idx_jobs_claim", "status", "kind", "run_after", "priority"),
+        Index("idx_jobs_running", "status", "locked_at"),
+        Index("uk_jobs_active_dedup", "active_dedup_key", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[str] = mapped_column(
+        Enum("queued", "running", "succeeded", "failed", "cancelled", name="job_status"),
+        nullable=False,
+        server_default=text("'queued'"),
+    )
+    payload: Mapped[Any] = mapped_column(JSON, nullable=False)
+    result: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
+    dedup_key: Mapped[Optional[str]] = mapped_column(String(191), nullable=True)
+    active_dedup_key: Mapped[Optional[str]] = mapped_column(String(191), nullable=True)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("3"))
+    run_after: Mapped[datetime] = mapped_column(
+        TIMESTAMP, nullable=False, server_default=func.current_timestamp()
+    )
+    locked_by: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+
+class SchedulerLease(Base):
+    """스케줄러 리더 lease. holder가 expires_at 전에 갱신하지 못하면 다른 프로세스가 가져간다."""
+
+    __tablename__ = "scheduler_leases"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(128), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+    acquired_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False)
+
+
+__all__ = ["Job", "SchedulerLease"]
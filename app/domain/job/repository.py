@@ -0,0 +1,11 @@
+from sqlalchemy.orm import Session
+
+from app.domain.common.repository import BaseRepository
+from app.domain.job.model import Job
+
+
+class JobRepository(BaseRepository[Job]):
+    model = Job
+
+    def __init__(self, db: Session) -> None:
+        super().__init__(db)
@@ -1,28 +1,35 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from datetime import date
+from typing import Iterator
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
 from app.domain.portfolio.schema.response import PortfolioSummaryResponse
 from app.domain.portfolio.schema.response import RebalancingRecommendation
-from app.services.portfolio.summary import build_portfolio_summary, generate_rebalancing_snapshot, get_latest_rebalancing
+from app.services.portfolio.export import EXPORT_FORMATS, EXPORT_SHEETS, MEDIA_TYPES, iter_export
+from app.services.portfolio.rebalancing import get_latest_rebalancing, refresh_rebalancing_snapshot
+from app.services.portfolio.summary import build_portfolio_summary
 
 router = APIRouter()
 
 
 @router.get("/summary", response_model=PortfolioSummaryResponse)
 async def get_portfolio_summary(
+    background_tasks: BackgroundTasks,
     user_id: int = Query(...),
     db: Session = Depends(get_db),
 ) -> PortfolioSummaryResponse:
-    return await build_portfolio_summary(user_id=user_id, db=db)
+    return await build_portfolio_summary(user_id=user_id, db=db, background_tasks=background_tasks)
 
 
 @router.post("/rebalancing/generate", response_model=list[RebalancingRecommendation])
-async def generate_rebalancing(
+def generate_rebalancing(
     user_id: int = Query(...),
     db: Session = Depends(get_db),
 ) -> list[RebalancingRecommendation]:
-    return await generate_rebalancing_snapshot(user_id=user_id, db=db)
+    return refresh_rebalancing_snapshot(db, user_id)
 
 
 @router.get("/rebalancing/latest", response_model=list[RebalancingRecommendation])
@@ -34,3 +41,32 @@ def latest_rebalancing(
     if latest is None:
         raise HTTPException(status_code=404, detail="No rebalancing snapshot found.")
     return latest
+
+
+def _export_chunks(user_id: int, export_format: str, sheet: str) -> Iterator[bytes]:
+    # 응답 본문을 다 보낼 때까지 커서를 유지해야 하므로 요청 의존성(get_db) 대신 스트림 전용 세션
+    db = SessionLocal()
+    try:
+        yield from iter_export(db, user_id, export_format, sheet)
+    finally:
+        db.close()
+
+
+@router.get("/export")
+def export_portfolio(
+    user_id: int = Query(...),
+    format: str = Query("xlsx"),
+    sheet: str = Query("holdings"),
+) -> StreamingResponse:
+    """보유 종목·월별 평가 이력 내보내기 (xlsx: 전체 시트, csv: sheet 하나). 행 단위 스트리밍."""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {format}")
+    if sheet not in EXPORT_SHEETS:
+        raise HTTPException(status_code=400, detail=f"Unknown sheet: {sheet}")
+    suffix = "" if format == "xlsx" else f"_{sheet}"
+    filename = f"portfolio_{user_id}{suffix}_{date.today():%Y%m%d}.{format}"
+    return StreamingResponse(
+        _export_chunks(user_id, format, sheet),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
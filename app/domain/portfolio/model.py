@@ -1,7 +1,9 @@
-from sqlalchemy import BigInteger, DECIMAL, JSON, TIMESTAMP, func, Index, text
+from typing import Optional
+
+from sqlalchemy import BigInteger, DECIMAL, Integer, String, TIMESTAMP, func, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.domain.common.model import Base
+from app.domain.common.model import Base, CompressedPayloadMixin
 
 
 class UserPortfolio(Base):
@@ -21,7 +23,8 @@ class UserPortfolio(Base):
     )
 
 
-class RebalancingSnapshot(Base):
+class RebalancingSnapshot(Base, CompressedPayloadMixin):
+    # MySQL에서는 created_at 기준 월별 RANGE 파티션 (DB PK는 (id, created_at), ORM 식별자는 id)
     __tablename__ = "rebalancing_snapshots"
     __table_args__ = (
         Index("idx_rebalancing_user", "user_id"),
@@ -30,10 +33,65 @@ class RebalancingSnapshot(Base):
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
-    payload_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # 생성 당시 입력 키 (app.services.portfolio.rebalancing). 다르면 스냅샷을 재사용하지 않음
+    input_key: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     created_at: Mapped[str] = mapped_column(
         TIMESTAMP, nullable=False, server_default=func.current_timestamp()
     )
 
 
-__all__ = ["UserPortfolio", "RebalancingSnapshot"]
+class RebalancingSnapshotArchive(Base, CompressedPayloadMixin):
+    """retention job이 hot 테이블에서 옮겨 온 오래된 리밸런싱 스냅샷."""
+
+    __tablename__ = "rebalancing_snapshots_archive"
+    __table_args__ = (Index("idx_rebalancing_archive_latest", "user_id", "created_at"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    created_at: Mapped[str] = mapped_column(TIMESTAMP, nullable=False)
+    archived_at: Mapped[str] = mapped_column(
+        TIMESTAMP, nullable=False, server_default=func.current_timestamp()
+    )
+
+
+class PortfolioAssetValuation(Base):
+    """(user, asset) 평가 결과. 가격 수집·보유 변경 시 해당 행만 갱신 (app.services.portfolio.valuation)."""
+
+    __tablename__ = "portfolio_asset_valuations"
+    __table_args__ = (Index("idx_asset_valuation_asset", "asset_id"),)
+
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    asset_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    quantity: Mapped[float] = mapped_column(DECIMAL(24, 8), nullable=False, server_default=text("0"))
+    avg_buy_price: Mapped[float] = mapped_column(DECIMAL(24, 8), nullable=False, server_default=text("0"))
+    # 현재가가 없으면 NULL (평가액은 0으로 계산)
+    price: Mapped[Optional[float]] = mapped_column(DECIMAL(24, 8), nullable=True)
+    market_value: Mapped[float] = mapped_column(DECIMAL(28, 4), nullable=False, server_default=text("0"))
+    cost_value: Mapped[float] = mapped_column(DECIMAL(28, 4), nullable=False, server_default=text("0"))
+    updated_at: Mapped[str] = mapped_column(
+        TIMESTAMP, nullable=False, server_default=func.current_timestamp()
+    )
+
+
+class PortfolioVillageValuation(Base):
+    """(user, village) 평가 합계. 소속 종목의 평가액 변화분(delta)만큼 갱신."""
+
+    __tablename__ = "portfolio_village_valuations"
+
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    village_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    market_value: Mapped[float] = mapped_column(DECIMAL(28, 4), nullable=False, server_default=text("0"))
+    cost_value: Mapped[float] = mapped_column(DECIMAL(28, 4), nullable=False, server_default=text("0"))
+    holding_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    updated_at: Mapped[str] = mapped_column(
+        TIMESTAMP, nullable=False, server_default=func.current_timestamp()
+    )
+
+
+__all__ = [
+    "UserPortfolio",
+    "RebalancingSnapshot",
+    "RebalancingSnapshotArchive",
+    "PortfolioAssetValuation",
+    "PortfolioVillageValuation",
+]
@@ -1,6 +1,6 @@
 """portfolio response schemas."""
 
-from typing import List
+from typing import List, Optional
 
 from pydantic import ConfigDict
 
@@ -46,7 +46,9 @@ class RebalancingRecommendation(BaseSchema):
 
 class ExportLinks(BaseSchema):
     excel_url: str
-    pdf_url: str
+    csv_url: str
+    # PDF 내보내기는 아직 지원하지 않음 (호환을 위해 필드만 유지)
+    pdf_url: Optional[str] = None
 
 
 class PortfolioSummaryResponse(BaseSchema):
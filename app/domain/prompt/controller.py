@@ -1,3 +1,73 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.domain.common.schema.response import OkResponse
+from app.domain.prompt.model import Prompt, VillagePrompt
+from app.domain.prompt.repository import PromptRepository
+from app.domain.prompt.schema.request import PromptUpsertRequest, VillagePromptLinkRequest
+from app.domain.prompt.schema.response import PromptItem, PromptsResponse
+from app.services.briefing.prompt_registry import bump_version, prompt_registry
 
 router = APIRouter()
+
+
+def _to_item(p: Prompt) -> PromptItem:
+    return PromptItem(
+        prompt_id=p.prompt_id,
+        key=p.prompt_key,
+        title=p.title,
+        content=p.content,
+        is_active=bool(p.is_active),
+    )
+
+
+@router.get("", response_model=PromptsResponse)
+def list_prompts(db: Session = Depends(get_db)) -> PromptsResponse:
+    rows = PromptRepository(db).get_many(limit=None)
+    return PromptsResponse(prompts=[_to_item(p) for p in rows], cache_version=prompt_registry.version)
+
+
+@router.put("/{key}", response_model=PromptItem)
+def upsert_prompt(
+    key: str,
+    payload: PromptUpsertRequest,
+    db: Session = Depends(get_db),
+) -> PromptItem:
+    """프롬프트 생성/수정. 저장 즉시 레지스트리 캐시를 갱신."""
+    repo = PromptRepository(db)
+    prompt = repo.get_one(prompt_key=key)
+    values = {"title": payload.title, "content": payload.content, "is_active": payload.is_active}
+    if prompt is None:
+        prompt = repo.create({"prompt_key": key, **values}, commit=False)
+    else:
+        prompt = repo.update(prompt, values, commit=False)
+    bump_version(db)
+    db.commit()
+    db.refresh(prompt)
+    prompt_registry.refresh(force=True)
+    return _to_item(prompt)
+
+
+@router.put("/villages/{village_id}", response_model=OkResponse)
+def link_village_prompt(
+    village_id: int,
+    payload: VillagePromptLinkRequest,
+    db: Session = Depends(get_db),
+) -> OkResponse:
+    """마을에 오버라이드 프롬프트 연결 (key 형식: '<기본 key>:<접미사>')."""
+    if ":" not in payload.prompt_key:
+        raise HTTPException(status_code=400, detail="Village prompts must use a '<base key>:<suffix>' key.")
+    prompt = PromptRepository(db).get_one(prompt_key=payload.prompt_key)
+    if prompt is None:
+        raise HTTPException(status_code=404, detail="Prompt not found.")
+    link = db.get(VillagePrompt, (village_id, prompt.prompt_id))
+    if link is None:
+        link = VillagePrompt(village_id=village_id, prompt_id=prompt.prompt_id)
+    link.sort_order = payload.sort_order
+    link.is_enabled = bool(payload.is_enabled)
+    db.add(link)
+    bump_version(db)
+    db.commit()
+    prompt_registry.refresh(force=True)
+    return OkResponse(ok=True)
@@ -35,4 +35,13 @@ class VillagePrompt(Base, CreatedAtMixin):
     )
 
 
-__all__ = ["Prompt", "VillagePrompt"]
+class PromptRegistryVersion(Base):
+    """프롬프트/마을 연결 변경 카운터 (단일 행). 쓰기마다 같은 트랜잭션에서 +1 → 다른 프로세스 캐시 무효화."""
+
+    __tablename__ = "prompt_registry_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+
+
+__all__ = ["Prompt", "PromptRegistryVersion", "VillagePrompt"]
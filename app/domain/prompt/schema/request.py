@@ -1 +1,17 @@
 """prompt request schemas."""
+
+from typing import Optional
+
+from app.domain.common.schema.dto import BaseSchema
+
+
+class PromptUpsertRequest(BaseSchema):
+    title: str
+    content: str
+    is_active: bool = True
+
+
+class VillagePromptLinkRequest(BaseSchema):
+    prompt_key: str
+    sort_order: int = 0
+    is_enabled: Optional[bool] = True
@@ -1 +1,22 @@
 """prompt response schemas."""
+
+from typing import List, Optional
+
+from pydantic import ConfigDict
+
+from app.domain.common.schema.dto import BaseSchema
+
+
+class PromptItem(BaseSchema):
+    prompt_id: int
+    key: str
+    title: str
+    content: str
+    is_active: bool
+
+
+class PromptsResponse(BaseSchema):
+    prompts: List[PromptItem]
+    cache_version: Optional[int] = None
+
+    model_config = ConfigDict(extra="forbid")
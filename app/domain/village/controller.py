@@ -1,10 +1,13 @@
-from typing import List
+from collections import defaultdict
+from typing import Dict, List, Tuple
 import asyncio
-from datetime import datetime
+
+import numpy as np
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.domain.village.model import Village, VillageAsset
 from app.domain.village.schema.request import VillageCreateRequest
@@ -33,11 +36,29 @@ from app.domain.village.schema.response import (
 from app.domain.asset.model import Asset, AssetPrice, AssetPriceMonthly
 from app.domain.portfolio.model import UserPortfolio
 from app.services.market_data import get_market_context, get_usdkrw_rate
+from app.services.portfolio.analytics import HoldingsFrame, weighted_period_returns
+from app.services.portfolio.valuation import (
+    get_user_totals,
+    get_village_valuations,
+    ingest_asset_prices,
+    refresh_user_valuations,
+    village_totals,
+)
+from app.services.jobs import JOB_KIND_VILLAGE_ONE_LINER, enqueue
 from app.services.village.ai import generate_village_one_liner
 
 router = APIRouter()
 
 
+def _user_holdings(db: Session, user_id: int) -> List[Tuple[UserPortfolio, Asset]]:
+    return (
+        db.query(UserPortfolio, Asset)
+        .join(Asset, Asset.asset_id == UserPortfolio.asset_id)
+        .filter(UserPortfolio.user_id == user_id)
+        .all()
+    )
+
+
 def _categorize_asset(asset: Asset) -> str:
     name = (asset.name or "").lower()
     symbol = (asset.symbol or "").upper()
@@ -77,7 +98,16 @@ def create_village(
     for a in payload.assets:
         db.add(VillageAsset(village_id=village.village_id, asset_id=a.asset_id))
     db.commit()
-    background_tasks.add_task(generate_village_one_liner, village.village_id)
+    refresh_user_valuations(db, payload.user_id)
+    if settings.JOB_QUEUE_ENABLED:
+        enqueue(
+            db,
+            JOB_KIND_VILLAGE_ONE_LINER,
+            {"village_id": village.village_id},
+            dedup_key=f"{JOB_KIND_VILLAGE_ONE_LINER}:{village.village_id}",
+        )
+    else:
+        background_tasks.add_task(generate_village_one_liner, village.village_id)
     return VillageCreateResponse(village_id=village.village_id)
 
 
@@ -95,113 +125,34 @@ def get_custom_villages(
     items: List[CustomVillageItem] = []
     total_assets_all = 0.0
 
-    # Refresh prices (KRW 기준)
-    all_assets = db.query(Asset).all()
-    tickers = [a.symbol for a in all_assets if a.symbol]
-    price_tickers = []
-    price_symbol_map = {}
-    for a in all_assets:
-        symbol = a.symbol
-        if a.country_code == "KR" and symbol.isdigit() and len(symbol) == 6:
-            yf_symbol = f"{symbol}.KS"
-        else:
-            yf_symbol = symbol
-        price_tickers.append(yf_symbol)
-        price_symbol_map[a.asset_id] = yf_symbol
-
-    market_ctx = asyncio.run(get_market_context(price_tickers, news_per_ticker=0, price_tickers=price_tickers))
-    usdkrw_rate = get_usdkrw_rate()
-    quotes_map = {q.ticker: q for q in market_ctx.ticker_quotes or [] if q and q.ticker}
-    price_updates = {}
-    for a in all_assets:
-        quote = quotes_map.get(price_symbol_map.get(a.asset_id, a.symbol))
-        if quote and quote.price is not None:
-            price = float(quote.price)
-            if a.country_code == "US":
-                price *= usdkrw_rate
-            price_updates[a.asset_id] = price
-    if price_updates:
-        from sqlalchemy.dialects.mysql import insert as mysql_insert
-        now = datetime.utcnow()
-        rows = [{"asset_id": aid, "price": p, "as_of": now} for aid, p in price_updates.items()]
-        stmt = mysql_insert(AssetPrice).values(rows)
-        stmt = stmt.on_duplicate_key_update(price=stmt.inserted.price, as_of=stmt.inserted.as_of)
-        db.execute(stmt)
-        db.commit()
-
-    asset_prices = {row.asset_id: float(row.price) for row in db.query(AssetPrice).all()}
-    normalize_updates = {}
-    for a in all_assets:
-        price = asset_prices.get(a.asset_id)
-        if price is None:
-            continue
-        if (a.country_code or "").upper() == "US":
-            price *= 1450.0
-            asset_prices[a.asset_id] = price
-            normalize_updates[a.asset_id] = price
-    if normalize_updates:
-        from sqlalchemy.dialects.mysql import insert as mysql_insert
-        now = datetime.utcnow()
-        rows = [{"asset_id": aid, "price": p, "as_of": now} for aid, p in normalize_updates.items()]
-        stmt = mysql_insert(AssetPrice).values(rows)
-        stmt = stmt.on_duplicate_key_update(price=stmt.inserted.price, as_of=stmt.inserted.as_of)
-        db.execute(stmt)
-        db.commit()
-    # normalize USD prices in DB if needed
-    normalize_updates = {}
-    for a in assets:
-        price = asset_prices.get(a.asset_id)
-        if price is None:
-            continue
-        if (a.country_code or "").upper() == "US":
-            logger = __import__("logging").getLogger(__name__)
-            logger.warning("Normalize price: asset_id=%s symbol=%s country=%s price=%s", a.asset_id, a.symbol, a.country_code, price)
-            price *= 1450.0
-            asset_prices[a.asset_id] = price
-            normalize_updates[a.asset_id] = price
-    if normalize_updates:
-        from sqlalchemy.dialects.mysql import insert as mysql_insert
-        now = datetime.utcnow()
-        rows = [{"asset_id": aid, "price": p, "as_of": now} for aid, p in normalize_updates.items()]
-        stmt = mysql_insert(AssetPrice).values(rows)
-        stmt = stmt.on_duplicate_key_update(price=stmt.inserted.price, as_of=stmt.inserted.as_of)
-        db.execute(stmt)
-        db.commit()
+    # 평가액·수익률은 가격 수집 시 갱신되는 평가 테이블에서 조회
+    valuations = get_village_valuations(db, user_id)
+    village_ids = [v.village_id for v in villages]
+    tickers_by_village: Dict[int, List[str]] = defaultdict(list)
+    if village_ids:
+        ticker_rows = (
+            db.query(VillageAsset.village_id, Asset.symbol)
+            .join(Asset, Asset.asset_id == VillageAsset.asset_id)
+            .filter(VillageAsset.village_id.in_(village_ids))
+            .order_by(VillageAsset.village_id, VillageAsset.asset_id)
+            .all()
+        )
+        for vid, symbol in ticker_rows:
+            if symbol:
+                tickers_by_village[vid].append(symbol)
 
     for v in villages:
-        va_rows = db.query(VillageAsset).filter(VillageAsset.village_id == v.village_id).all()
-        asset_ids = [va.asset_id for va in va_rows]
-        assets = db.query(Asset).filter(Asset.asset_id.in_(asset_ids)).all() if asset_ids else []
-        tickers = [a.symbol for a in assets if a.symbol]
-
-        total_assets = 0.0
-        total_cost = 0.0
-        for asset in assets:
-            up = (
-                db.query(UserPortfolio)
-                .filter(UserPortfolio.user_id == user_id, UserPortfolio.asset_id == asset.asset_id)
-                .first()
-            )
-            if not up:
-                continue
-            qty = float(up.quantity or 0)
-            avg = float(up.avg_buy_price or 0)
-            price = asset_prices.get(asset.asset_id, 0.0)
-            total_assets += qty * price
-            total_cost += qty * avg
-
-        total_assets_all += total_assets
-        return_rate = (total_assets - total_cost) / total_cost * 100.0 if total_cost > 0 else 0.0
-
+        totals = village_totals(valuations.get(v.village_id))
+        total_assets_all += totals.value
         items.append(
             CustomVillageItem(
                 id=v.village_id,
                 name=v.name,
                 icon=v.icon,
-                total_assets=round(total_assets, 0),
-                return_rate=round(return_rate, 2),
+                total_assets=round(totals.value, 0),
+                return_rate=round(totals.return_rate, 2),
                 portfolio_weight=0.0,
-                asset_tickers=tickers,
+                asset_tickers=tickers_by_village.get(v.village_id, []),
             )
         )
 
@@ -238,80 +189,13 @@ def get_village_summary(
         VillageAssetItem(asset_id=a.asset_id, ticker=a.symbol, name=a.name) for a in assets
     ]
 
-    # refresh prices (KRW 기준)
-    tickers = [a.symbol for a in assets if a.symbol]
-    price_tickers = []
-    price_symbol_map = {}
-    for a in assets:
-        symbol = a.symbol
-        if symbol.isdigit() and len(symbol) == 6:
-            yf_symbol = f"{symbol}.KS"
-        else:
-            yf_symbol = symbol
-        price_tickers.append(yf_symbol)
-        price_symbol_map[a.asset_id] = yf_symbol
-    __import__("logging").getLogger(__name__).warning(
-        "Village detail price_tickers: village_id=%s count=%d tickers=%s",
-        village_id,
-        len(price_tickers),
-        price_tickers,
-    )
-
-    market_ctx = asyncio.run(get_market_context([], news_per_ticker=0, price_tickers=price_tickers))
-    usdkrw_rate = get_usdkrw_rate()
-    quotes_map = {q.ticker: q for q in market_ctx.ticker_quotes or [] if q and q.ticker}
-    price_updates = {}
-    for a in assets:
-        quote = quotes_map.get(price_symbol_map.get(a.asset_id, a.symbol))
-        if quote and quote.price is not None:
-            price = float(quote.price)
-            if a.country_code == "US":
-                price *= usdkrw_rate
-            price_updates[a.asset_id] = price
-    if price_updates:
-        from sqlalchemy.dialects.mysql import insert as mysql_insert
-
-        now = datetime.utcnow()
-        rows = [{"asset_id": aid, "price": p, "as_of": now} for aid, p in price_updates.items()]
-        stmt = mysql_insert(AssetPrice).values(rows)
-        stmt = stmt.on_duplicate_key_update(price=stmt.inserted.price, as_of=stmt.inserted.as_of)
-        db.execute(stmt)
-        db.commit()
-
-    asset_prices = {row.asset_id: float(row.price) for row in db.query(AssetPrice).all()}
-
-    total_assets = 0.0
-    total_cost = 0.0
-    for asset in assets:
-        up = (
-            db.query(UserPortfolio)
-            .filter(UserPortfolio.user_id == user_id, UserPortfolio.asset_id == asset.asset_id)
-            .first()
-        )
-        if not up:
-            continue
-        qty = float(up.quantity or 0)
-        avg = float(up.avg_buy_price or 0)
-        price = asset_prices.get(asset.asset_id, 0.0)
-        total_assets += qty * price
-        total_cost += qty * avg
-
-    return_rate = (total_assets - total_cost) / total_cost * 100.0 if total_cost > 0 else 0.0
+    # 평가 테이블 조회 (가격 수집·보유 변경 시 갱신됨)
+    totals = village_totals(get_village_valuations(db, user_id).get(village_id))
+    total_assets = totals.value
+    return_rate = totals.return_rate
 
     # portfolio weight (vs all user assets)
-    total_assets_all = 0.0
-    all_assets = (
-        db.query(UserPortfolio, Asset)
-        .join(Asset, Asset.asset_id == UserPortfolio.asset_id)
-        .filter(UserPortfolio.user_id == user_id)
-        .all()
-    )
-    for p, a in all_assets:
-        qty = float(p.quantity or 0)
-        avg = float(p.avg_buy_price or 0)
-        price = asset_prices.get(a.asset_id, 0.0)
-        total_assets_all += qty * price
-
+    total_assets_all = get_user_totals(db, user_id).value
     portfolio_weight = (total_assets / total_assets_all * 100.0) if total_assets_all > 0 else 0.0
 
     metrics = VillageMetrics(
@@ -386,35 +270,18 @@ def get_village_detail(
             if a.country_code == "US":
                 price *= usdkrw_rate
             price_updates[a.asset_id] = price
-    if price_updates:
-        from sqlalchemy.dialects.mysql import insert as mysql_insert
-        now = datetime.utcnow()
-        rows = [{"asset_id": aid, "price": p, "as_of": now} for aid, p in price_updates.items()]
-        stmt = mysql_insert(AssetPrice).values(rows)
-        stmt = stmt.on_duplicate_key_update(price=stmt.inserted.price, as_of=stmt.inserted.as_of)
-        db.execute(stmt)
-        db.commit()
+    ingest_asset_prices(db, price_updates)
     logger.warning("Village detail price_updates count=%d keys=%s", len(price_updates), list(price_updates.keys()))
 
     asset_prices = {row.asset_id: float(row.price) for row in db.query(AssetPrice).all()}
 
-    total_assets = 0.0
-    total_cost = 0.0
+    frame = HoldingsFrame.from_rows(_user_holdings(db, user_id), asset_prices)
     holding_items: List[HoldingItem] = []
     for asset in assets:
-        up = (
-            db.query(UserPortfolio)
-            .filter(UserPortfolio.user_id == user_id, UserPortfolio.asset_id == asset.asset_id)
-            .first()
-        )
-        if not up:
+        row = frame.row_of(asset.asset_id)
+        if row is None:
             continue
-        qty = float(up.quantity or 0)
-        avg = float(up.avg_buy_price or 0)
-        price = asset_prices.get(asset.asset_id, 0.0)
-        value = qty * price
-        total_assets += value
-        total_cost += qty * avg
+        value = float(frame.value[row])
 
         quote = quotes_map.get(price_symbol_map.get(asset.asset_id, asset.symbol))
         daily_change = float(quote.change_percent) if quote and quote.change_percent is not None else 0.0
@@ -435,21 +302,12 @@ def get_village_detail(
         )
     logger.warning("Village detail holdings count=%d", len(holding_items))
 
-    return_rate = (total_assets - total_cost) / total_cost * 100.0 if total_cost > 0 else 0.0
+    detail_totals = frame.totals(frame.asset_mask(asset_ids))
+    total_assets = detail_totals.value
+    return_rate = detail_totals.return_rate
 
     # portfolio weight (vs all user assets)
-    total_assets_all = 0.0
-    all_assets = (
-        db.query(UserPortfolio, Asset)
-        .join(Asset, Asset.asset_id == UserPortfolio.asset_id)
-        .filter(UserPortfolio.user_id == user_id)
-        .all()
-    )
-    for p, a in all_assets:
-        qty = float(p.quantity or 0)
-        avg = float(p.avg_buy_price or 0)
-        price = asset_prices.get(a.asset_id, 0.0)
-        total_assets_all += qty * price
+    total_assets_all = frame.totals().value
     portfolio_weight = (total_assets / total_assets_all * 100.0) if total_assets_all > 0 else 0.0
 
     summary_cards = SummaryCards(
@@ -463,14 +321,7 @@ def get_village_detail(
         ),
     )
 
-    # monthly return trend (asset_price_monthly 기반)
-    qty_map = {
-        p.asset_id: float(p.quantity or 0)
-        for p, _a in db.query(UserPortfolio, Asset)
-        .join(Asset, Asset.asset_id == UserPortfolio.asset_id)
-        .filter(UserPortfolio.user_id == user_id, UserPortfolio.asset_id.in_(asset_ids))
-        .all()
-    }
+    # monthly return trend (asset_price_monthly 기반): (종목 × 월) 종가 행렬로 월별 가중 수익률 계산
     monthly_rows = (
         db.query(AssetPriceMonthly)
         .filter(AssetPriceMonthly.asset_id.in_(asset_ids))
@@ -478,27 +329,21 @@ def get_village_detail(
         .all()
     )
     month_list = sorted({row.month for row in monthly_rows})
-    price_map = {(row.asset_id, row.month): float(row.close_price) for row in monthly_rows}
-
-    monthly_items: List[MonthlyReturnItem] = []
-    for i in range(1, len(month_list)):
-        month = month_list[i]
-        prev_month = month_list[i - 1]
-        # 가중치 계산
-        total_value = 0.0
-        weighted_return = 0.0
-        for aid in asset_ids:
-            qty = qty_map.get(aid, 0.0)
-            cur_price = price_map.get((aid, month))
-            prev_price = price_map.get((aid, prev_month))
-            if qty <= 0 or cur_price is None or prev_price is None or prev_price == 0:
-                continue
-            value = qty * cur_price
-            total_value += value
-            asset_return = (cur_price - prev_price) / prev_price * 100.0
-            weighted_return += asset_return * value
-        rate = weighted_return / total_value if total_value > 0 else 0.0
-        monthly_items.append(MonthlyReturnItem(month=month.month, return_rate=round(rate, 2)))
+    month_index = {month: i for i, month in enumerate(month_list)}
+    asset_index = {aid: i for i, aid in enumerate(asset_ids)}
+    closes = np.full((len(asset_ids), len(month_list)), np.nan)
+    for row in monthly_rows:
+        closes[asset_index[row.asset_id], month_index[row.month]] = float(row.close_price)
+    quantities = np.zeros(len(asset_ids))
+    for aid, i in asset_index.items():
+        holding_row = frame.row_of(aid)
+        if holding_row is not None:
+            quantities[i] = frame.quantity[holding_row]
+    monthly_rates = weighted_period_returns(quantities, closes)
+    monthly_items: List[MonthlyReturnItem] = [
+        MonthlyReturnItem(month=month.month, return_rate=round(float(rate), 2))
+        for month, rate in zip(month_list[1:], monthly_rates)
+    ]
 
     monthly_trend = MonthlyReturnTrend(title="월별 수익률 추이", unit="percent", items=monthly_items)
 
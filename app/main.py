@@ -1,24 +1,38 @@
+import threading
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
 
 from apscheduler.schedulers.background import BackgroundScheduler
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.database import engine
+from app.core.tracing import configure_tracing, set_exporter, span, tracing_enabled
 from app.domain.common.model import Base
+from app.services.briefing.analysis_cache import get_analysis_cache_stats
+from app.services.briefing.batch import run_scheduled_batch_briefing
+from app.services.briefing.llm import get_dispatch_stats, get_provider_health
+from app.services.briefing.llm_metrics import get_llm_metrics
 from app.services.briefing.scheduled_briefing import run_scheduled_briefing
+from app.services.jobs import JOB_KIND_BRIEFING
+from app.services.jobs.worker import JobWorker
+from app.services.leader import LeaderElector
+from app.services.snapshot_retention import run_scheduled_snapshot_retention
 from app.utils.fixtures import FixtureInvalid, FixtureNotFound
 
 _scheduler: Optional[BackgroundScheduler] = None
+_leader: Optional[LeaderElector] = None
+_embedded_worker: Optional[JobWorker] = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """앱 시작 시 DB 연결 확인 및 APScheduler 등록(매일 9시·17시), 종료 시 리소스 정리."""
+    """앱 시작 시 DB 연결 확인 및 APScheduler 등록(매일 9시·17시 요약, 8시·16시 배치 브리핑, 3시 30분 스냅샷 retention), 종료 시 리소스 정리."""
+    configure_tracing()
+
     # Database connection check (optional)
     if settings.DB_ENABLED:
         try:
@@ -32,12 +46,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Start APScheduler
     global _scheduler
-    _scheduler = BackgroundScheduler(timezone=settings.BRIEFING_SCHEDULE_TIMEZONE)
+    _scheduler = BackgroundScheduler(
+        timezone=settings.BRIEFING_SCHEDULE_TIMEZONE,
+        # 리더 교체 중 지나간 실행 시각도 grace 이내면 새 리더가 한 번 실행
+        job_defaults={"coalesce": True, "misfire_grace_time": settings.SCHEDULER_MISFIRE_GRACE_SECONDS},
+    )
     _scheduler.add_job(
         run_scheduled_briefing,
         "cron",
         hour=9,
         minute=0,
+        args=["morning"],
         id="briefing_morning",
     )
     _scheduler.add_job(
@@ -45,18 +64,69 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         "cron",
         hour=17,
         minute=0,
+        args=["evening"],
         id="briefing_evening",
     )
-    _scheduler.start()
-    print("✓ APScheduler started")
+    if settings.BRIEFING_BATCH_ENABLED and settings.DB_ENABLED:
+        _scheduler.add_job(
+            run_scheduled_batch_briefing,
+            "cron",
+            hour=8,
+            minute=0,
+            args=["morning"],
+            id="briefing_batch_morning",
+            max_instances=1,
+        )
+        _scheduler.add_job(
+            run_scheduled_batch_briefing,
+            "cron",
+            hour=16,
+            minute=0,
+            args=["evening"],
+            id="briefing_batch_evening",
+            max_instances=1,
+        )
+    if settings.SNAPSHOT_RETENTION_ENABLED and settings.DB_ENABLED:
+        _scheduler.add_job(
+            run_scheduled_snapshot_retention,
+            "cron",
+            hour=3,
+            minute=30,
+            id="snapshot_retention",
+            max_instances=1,
+        )
+    global _leader
+    if settings.SCHEDULER_LEADER_ELECTION_ENABLED and settings.DB_ENABLED:
+        # 모든 프로세스가 paused 상태로 시작하고, lease를 잡은 프로세스만 resume
+        _scheduler.start(paused=True)
+        _leader = LeaderElector("scheduler", on_elected=_scheduler.resume, on_revoked=_scheduler.pause)
+        _leader.start()
+        print("✓ APScheduler started (leader election)")
+    else:
+        _scheduler.start()
+        print("✓ APScheduler started")
+
+    # 별도 워커 프로세스가 없으면 비동기 브리핑 작업(POST /briefing/jobs)은 이 프로세스의 제한된 스레드가 처리
+    global _embedded_worker
+    if not settings.JOB_QUEUE_ENABLED and settings.DB_ENABLED and settings.BRIEFING_ASYNC_EMBEDDED_WORKERS > 0:
+        _embedded_worker = JobWorker(kinds=[JOB_KIND_BRIEFING], concurrency=settings.BRIEFING_ASYNC_EMBEDDED_WORKERS)
+        threading.Thread(target=_embedded_worker.run, name="embedded-job-worker", daemon=True).start()
+        print("✓ Embedded briefing job worker started")
 
     yield
 
     # Shutdown
+    if _embedded_worker:
+        _embedded_worker.stop()
+        _embedded_worker = None
+    if _leader:
+        _leader.stop()
+        _leader = None
     if _scheduler:
         _scheduler.shutdown(wait=False)
         _scheduler = None
     engine.dispose()
+    set_exporter(None)
     print("✓ Resources cleaned up")
 
 
@@ -69,6 +139,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """요청 단위 루트 span(http.request). 하위 SQL·시세·LLM span이 같은 trace로 묶인다."""
+    if not tracing_enabled():
+        return await call_next(request)
+    with span("http.request", method=request.method, path=request.url.path) as s:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        s.set_attributes(route=getattr(route, "path", None), status_code=response.status_code)
+        response.headers["X-Trace-Id"] = s.trace_id
+        return response
+
 @app.exception_handler(FixtureNotFound)
 def fixture_not_found_handler(_request, exc: FixtureNotFound) -> JSONResponse:
     return JSONResponse(
@@ -98,3 +181,25 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.get("/health", tags=["health"])
 def health_check() -> dict:
     return {"status": "ok"}
+
+
+@app.get("/health/scheduler", tags=["health"])
+def scheduler_health() -> dict:
+    """이 프로세스가 스케줄 job을 실행하는 리더인지."""
+    return {
+        "running": bool(_scheduler and _scheduler.running),
+        "leader_election": _leader is not None,
+        "is_leader": _leader.is_leader if _leader else _scheduler is not None,
+        "holder": _leader.holder if _leader else None,
+    }
+
+
+@app.get("/health/llm", tags=["health"])
+def llm_health() -> dict:
+    """LLM dispatcher 상태(동시 실행 수, 레인별 큐 깊이·대기 시간), agent별 호출 집계, provider 건강 점수, 공유 분석 캐시."""
+    return {
+        "dispatcher": get_dispatch_stats(),
+        "usage": get_llm_metrics(),
+        "providers": get_provider_health(),
+        "analysis_cache": get_analysis_cache_stats(),
+    }
@@ -1,8 +1,15 @@
 from app.domain.asset.model import Asset, AssetPrice, AssetPriceMonthly
 from app.domain.common.model import Base
-from app.domain.portfolio.model import UserPortfolio, RebalancingSnapshot
-from app.domain.prompt.model import Prompt, VillagePrompt
-from app.domain.briefing.model import BriefingSnapshot
+from app.domain.portfolio.model import (
+    PortfolioAssetValuation,
+    PortfolioVillageValuation,
+    RebalancingSnapshot,
+    RebalancingSnapshotArchive,
+    UserPortfolio,
+)
+from app.domain.prompt.model import Prompt, PromptRegistryVersion, VillagePrompt
+from app.domain.briefing.model import BriefingSnapshot, BriefingSnapshotArchive, LLMCallLog, ScheduledSummary, TickerAnalysisFragment
+from app.domain.job.model import Job, SchedulerLease
 from app.domain.user.model import User
 from app.domain.village.model import Village, VillageAsset
 
@@ -14,9 +21,19 @@ __all__ = [
     "AssetPriceMonthly",
     "UserPortfolio",
     "RebalancingSnapshot",
+    "RebalancingSnapshotArchive",
+    "PortfolioAssetValuation",
+    "PortfolioVillageValuation",
     "Village",
     "VillageAsset",
     "Prompt",
+    "PromptRegistryVersion",
     "VillagePrompt",
     "BriefingSnapshot",
+    "BriefingSnapshotArchive",
+    "LLMCallLog",
+    "ScheduledSummary",
+    "Job",
+    "SchedulerLease",
+    "TickerAnalysisFragment",
 ]
@@ -1,3 +1,3 @@
-from app.domain.prompt.model import Prompt, VillagePrompt
+from app.domain.prompt.model import Prompt, PromptRegistryVersion, VillagePrompt
 
-__all__ = ["Prompt", "VillagePrompt"]
+__all__ = ["Prompt", "PromptRegistryVersion", "VillagePrompt"]
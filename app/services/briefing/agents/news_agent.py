@@ -1,10 +1,24 @@
 """News Analysis Agent: 뉴스 데이터 분석."""
 
+import copy
 import json
 import logging
 from typing import Any, Dict, List, Optional
 
+from app.services.briefing.analysis_cache import (
+    fingerprint,
+    news_analysis_cache,
+    normalize_news,
+    normalize_tickers,
+    trading_date,
+)
+from app.services.briefing.json_stream import extract_json
 from app.services.briefing.llm import call_llm
+from app.services.briefing.prompt_registry import (
+    NEWS_PROMPT_KEY,
+    NEWS_RELEVANCE_PROMPT_KEY,
+    prompt_registry,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +84,7 @@ def filter_relevant_news_with_llm(
     news_items: List[Dict[str, Any]],
     asset_names: List[str],
     max_items: int = 15,
+    system_prompt: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """LLM으로 자산 관련 뉴스만 필터링."""
     if not news_items or not asset_names:
@@ -101,16 +116,23 @@ def filter_relevant_news_with_llm(
 
 위 뉴스 중 자산명과 실질적으로 관련된 기사 인덱스를 JSON으로 반환해 주세요."""
 
-    raw_response = call_llm(NEWS_RELEVANCE_SYSTEM_PROMPT, prompt)
+    try:
+        raw_response = call_llm(
+            system_prompt or prompt_registry.get(NEWS_RELEVANCE_PROMPT_KEY, NEWS_RELEVANCE_SYSTEM_PROMPT),
+            prompt,
+            agent="news_relevance",
+        )
+    except Exception:
+        logger.exception("Relevance filter LLM call failed")
+        return []
     if not raw_response:
         return []
 
     try:
-        import re
-
-        json_match = re.search(r'```json\s*(\{.*?\})\s*```', raw_response, re.DOTALL)
-        json_str = json_match.group(1) if json_match else raw_response.strip()
-        result = json.loads(json_str)
+        result = extract_json(raw_response)
+        if result is None:
+            logger.warning("Relevance filter returned no JSON")
+            return []
         indices = result.get("relevant_indices") or []
         filtered: List[Dict[str, Any]] = []
         for i in indices:
@@ -125,10 +147,9 @@ def filter_relevant_news_with_llm(
 def _build_news_prompt(
     news_items: List[Dict[str, Any]],
     tickers: List[str],
-    user_name: str,
     time_slot: str,
 ) -> str:
-    """뉴스 분석 Agent용 프롬프트 생성."""
+    """뉴스 분석 Agent용 프롬프트 생성. 사용자 간 공유되므로 개인 정보는 넣지 않음."""
     time_desc = "오전 8시 출근길" if time_slot == "morning" else "오후 4시 퇴근길"
 
     news_json = json.dumps(news_items, ensure_ascii=False, indent=2)
@@ -137,7 +158,6 @@ def _build_news_prompt(
     return f"""## 분석 요청
 
 현재 시각: {time_desc}
-사용자: {user_name}
 보유 종목: {tickers_str}
 
 ### 뉴스 데이터
@@ -147,15 +167,36 @@ def _build_news_prompt(
 특히 보유 종목({tickers_str}) 관련 뉴스는 상세히 분석해 주세요."""
 
 
+def _remap_news_indices(result: Dict[str, Any], index_map: List[int]) -> Dict[str, Any]:
+    """정규형 기준 news_index/news_indices를 호출자 뉴스 목록 기준으로 변환 (캐시 값은 건드리지 않음)."""
+
+    def remap(i: Any) -> Any:
+        return index_map[i] if isinstance(i, int) and 0 <= i < len(index_map) else i
+
+    out = copy.deepcopy(result)
+    for headline in out.get("key_headlines") or []:
+        if isinstance(headline, dict) and "news_index" in headline:
+            headline["news_index"] = remap(headline["news_index"])
+    entries = list((out.get("ticker_specific") or {}).values()) + list(out.get("risk_alerts") or [])
+    for entry in entries:
+        if isinstance(entry, dict) and isinstance(entry.get("news_indices"), list):
+            entry["news_indices"] = [remap(i) for i in entry["news_indices"]]
+    return out
+
+
 def analyze_news_data(
     news_items: List[Dict[str, Any]],
     tickers: List[str],
     user_name: str = "주인님",
     time_slot: str = "morning",
+    system_prompt: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     뉴스 데이터를 분석하여 인사이트 생성.
 
+    결과는 (정규화된 뉴스 세트, 종목, 슬롯, 날짜, system prompt) 기준으로 사용자 간 공유된다.
+    user_name은 호환용으로만 남아 있고 분석에는 쓰지 않는다 (개인화는 orchestrator 단계).
+
     Returns:
         {
             "market_sentiment": str,
@@ -168,30 +209,42 @@ def analyze_news_data(
         logger.warning("No news items provided for news analysis")
         return None
 
+    system = system_prompt or prompt_registry.get(NEWS_PROMPT_KEY, NEWS_SYSTEM_PROMPT)
+    normalized, index_map = normalize_news(news_items)
+    norm_tickers = normalize_tickers(tickers)
+    key = fingerprint("news", normalized, norm_tickers, time_slot, trading_date(), fingerprint(system))
+
+    result = news_analysis_cache.get_or_compute(
+        key, lambda: _analyze_news(normalized, norm_tickers, time_slot, system)
+    )
+    if result is None:
+        return None
+    return _remap_news_indices(result, index_map)
+
+
+def _analyze_news(
+    news_items: List[Dict[str, Any]],
+    tickers: List[str],
+    time_slot: str,
+    system_prompt: str,
+) -> Optional[Dict[str, Any]]:
     try:
-        prompt = _build_news_prompt(news_items, tickers, user_name, time_slot)
-        raw_response = call_llm(NEWS_SYSTEM_PROMPT, prompt)
+        prompt = _build_news_prompt(news_items, tickers, time_slot)
+        raw_response = call_llm(system_prompt, prompt, agent="news")
 
         if not raw_response:
             logger.warning("News agent returned empty response")
             return None
 
-        # JSON 파싱
-        import re
-        json_match = re.search(r'```json\s*(\{.*?\})\s*```', raw_response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            json_str = raw_response.strip()
-
-        result = json.loads(json_str)
+        # JSON 파싱 (```json 펜스/bare/잘린 출력 모두 처리)
+        result = extract_json(raw_response)
+        if result is None:
+            logger.error("Failed to parse news analysis JSON")
+            logger.debug(f"Raw response: {raw_response}")
+            return None
         logger.info("News analysis completed successfully")
         return result
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse news analysis JSON: {e}")
-        logger.debug(f"Raw response: {raw_response}")
-        return None
     except Exception as e:
         logger.exception(f"News analysis failed: {e}")
         return None
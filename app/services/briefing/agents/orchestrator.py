@@ -4,6 +4,7 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from app.services.briefing.llm import call_llm
+from app.services.briefing.prompt_registry import ORCHESTRATOR_PROMPT_KEY, prompt_registry
 
 logger = logging.getLogger(__name__)
 
@@ -130,6 +131,7 @@ def orchestrate_briefing(
     villages_data: List[Dict[str, Any]],
     user_name: str = "주인님",
     time_slot: str = "morning",
+    system_prompt: Optional[str] = None,
 ) -> tuple[str, Dict[str, Any]]:
     """
     여러 Agent의 분석 결과를 통합하여 최종 브리핑 생성.
@@ -141,7 +143,11 @@ def orchestrate_briefing(
         prompt = _build_orchestrator_prompt(
             stock_analysis, news_analysis, villages_data, user_name, time_slot
         )
-        raw_response = call_llm(ORCHESTRATOR_SYSTEM_PROMPT, prompt)
+        raw_response = call_llm(
+            system_prompt or prompt_registry.get(ORCHESTRATOR_PROMPT_KEY, ORCHESTRATOR_SYSTEM_PROMPT),
+            prompt,
+            agent="orchestrator",
+        )
 
         if not raw_response:
             logger.warning("Orchestrator returned empty response, using fallback")
@@ -161,6 +167,17 @@ def orchestrate_briefing(
         return _fallback_briefing(stock_analysis, news_analysis, user_name, time_slot)
 
 
+def is_fallback_briefing(
+    result: Any,
+    stock_analysis: Optional[Dict[str, Any]],
+    news_analysis: Optional[Dict[str, Any]],
+    user_name: str,
+    time_slot: str,
+) -> bool:
+    """orchestrate_briefing 결과가 LLM 실패 시의 대체 브리핑인지."""
+    return tuple(result) == _fallback_briefing(stock_analysis, news_analysis, user_name, time_slot)
+
+
 def _fallback_briefing(
     stock_analysis: Optional[Dict[str, Any]],
     news_analysis: Optional[Dict[str, Any]],
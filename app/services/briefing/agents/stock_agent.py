@@ -4,7 +4,9 @@ import json
 import logging
 from typing import Any, Dict, List, Optional
 
+from app.services.briefing.json_stream import extract_json
 from app.services.briefing.llm import call_llm
+from app.services.briefing.prompt_registry import STOCK_PROMPT_KEY, prompt_registry
 from app.services.market_data import TickerQuote
 
 logger = logging.getLogger(__name__)
@@ -129,6 +131,7 @@ def analyze_stock_data(
     villages_data: List[Dict[str, Any]],
     user_name: str = "주인님",
     time_slot: str = "morning",
+    system_prompt: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     주식 시세 데이터를 분석하여 인사이트 생성.
@@ -147,30 +150,88 @@ def analyze_stock_data(
 
     try:
         prompt = _build_stock_prompt(ticker_quotes, villages_data, user_name, time_slot)
-        raw_response = call_llm(STOCK_SYSTEM_PROMPT, prompt)
+        raw_response = call_llm(
+            system_prompt or prompt_registry.get(STOCK_PROMPT_KEY, STOCK_SYSTEM_PROMPT),
+            prompt,
+            agent="stock",
+        )
 
         if not raw_response:
             logger.warning("Stock agent returned empty response")
             return None
 
-        # JSON 파싱
-        # LLM이 ```json ... ``` 형식으로 반환할 수 있으므로 처리
-        import re
-        json_match = re.search(r'```json\s*(\{.*?\})\s*```', raw_response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            # 전체가 JSON인 경우
-            json_str = raw_response.strip()
-
-        result = json.loads(json_str)
+        # JSON 파싱 (```json 펜스/bare/잘린 출력 모두 처리)
+        result = extract_json(raw_response)
+        if result is None:
+            logger.error("Failed to parse stock analysis JSON")
+            logger.debug(f"Raw response: {raw_response}")
+            return None
         logger.info("Stock analysis completed successfully")
         return result
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse stock analysis JSON: {e}")
-        logger.debug(f"Raw response: {raw_response}")
-        return None
     except Exception as e:
         logger.exception(f"Stock analysis failed: {e}")
         return None
+
+
+def assemble_stock_analysis(
+    ticker_quotes: List[TickerQuote],
+    fragments: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """
+    종목별 분석 조각(fragments)과 시세로 analyze_stock_data와 같은 스키마의 결과를 조립 (LLM 호출 없음).
+    개인화/마을 맥락은 이후 orchestrator 단계에서 반영한다.
+    """
+    quotes = [q for q in ticker_quotes if q and q.ticker]
+    if not quotes:
+        logger.warning("No ticker quotes provided for stock analysis")
+        return None
+
+    notes = {q.ticker: fragments[q.ticker].note for q in quotes if q.ticker in fragments}
+    changes = [(q.ticker, float(q.change_percent)) for q in quotes if q.change_percent is not None]
+    if not changes:
+        return {
+            "market_summary": "데이터 부족: 등락률 정보가 없습니다.",
+            "portfolio_performance": "데이터 부족",
+            "key_movers": [],
+            "technical_insights": "데이터 부족",
+            "ticker_notes": notes,
+        }
+
+    up = sum(1 for _t, c in changes if c > 0)
+    down = sum(1 for _t, c in changes if c < 0)
+    avg = sum(c for _t, c in changes) / len(changes)
+    top_ticker, top_change = max(changes, key=lambda x: x[1])
+    bottom_ticker, bottom_change = min(changes, key=lambda x: x[1])
+    losers = [f"{t}({c:+.2f}%)" for t, c in sorted(changes, key=lambda x: x[1]) if c < 0][:2]
+    max_abs = max(abs(c) for _t, c in changes)
+
+    # 라벨은 등락 부호로 결정 (모두 하락한 날 최소 하락 종목을 "상승"이라 부르지 않게)
+    key_movers: List[str] = []
+    if top_change > 0:
+        key_movers.append(f"가장 큰 상승 종목: {notes.get(top_ticker) or f'{top_ticker} {top_change:+.2f}%'}")
+    if bottom_change < 0:
+        key_movers.append(f"가장 큰 하락 종목: {notes.get(bottom_ticker) or f'{bottom_ticker} {bottom_change:+.2f}%'}")
+    if not key_movers:
+        key_movers.append(f"가장 큰 변동 종목: {notes.get(top_ticker) or f'{top_ticker} {top_change:+.2f}%'}")
+
+    if up > down:
+        trend = "상승 종목 우세"
+    elif down > up:
+        trend = "하락 종목 우세"
+    else:
+        trend = "상승·하락 종목 균형"
+    volatility = "변동성 확대 구간입니다" if max_abs >= 3.0 else "변동성은 보통 수준입니다"
+
+    return {
+        "market_summary": (
+            f"{len(changes)}개 종목 중 {up}개 상승, {down}개 하락했습니다. 평균 등락률은 {avg:+.2f}%입니다."
+        ),
+        "portfolio_performance": (
+            f"보유 종목 평균 등락률은 {avg:+.2f}%입니다. "
+            + (f"손실 기여 종목: {', '.join(losers)}." if losers else "하락한 종목은 없습니다.")
+        ),
+        "key_movers": key_movers,
+        "technical_insights": f"최대 등락폭 {max_abs:.2f}%로 {volatility}. 단기 추세는 {trend}입니다.",
+        "ticker_notes": notes,
+    }
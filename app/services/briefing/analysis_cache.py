@@ -0,0 +1,180 @@
+"""
+사용자 간 공유되는 agent 분석 결과 캐시.
+
+- 입력을 정규화한 fingerprint를 키로 TTL + 최대 개수(LRU) 캐시
+- 같은 키를 동시에 요청하면 한 번만 계산하고 나머지는 결과를 기다림 (single-flight)
+- None(실패) 결과는 캐시하지 않음 → 다음 요청이 다시 시도
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(*parts: Any) -> str:
+    """JSON 직렬화 가능한 입력들의 안정적인 해시."""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def trading_date() -> str:
+    """BRIEFING_SCHEDULE_TIMEZONE 기준 오늘 날짜 (YYYY-MM-DD)."""
+    return datetime.now(ZoneInfo(settings.BRIEFING_SCHEDULE_TIMEZONE)).date().isoformat()
+
+
+def normalize_tickers(tickers: Iterable[str]) -> List[str]:
+    return sorted({str(t).strip().upper() for t in tickers if t and str(t).strip()})
+
+
+def _news_key(item: Dict[str, Any]) -> str:
+    return (item.get("link") or item.get("url") or item.get("title") or "").strip()
+
+
+def normalize_news(news_items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    뉴스 목록을 순서·중복·부가 필드와 무관한 정규형으로 변환.
+    종목 귀속(tickers)과 발행 시각(published)은 분석 결과를 바꾸므로 정규형에 포함하고,
+    같은 기사가 여러 종목으로 수집됐으면 tickers를 합친다.
+
+    Returns:
+        (정규화된 뉴스 목록, 정규형 index → 원래 목록 index 매핑)
+    """
+    seen: Dict[str, int] = {}
+    tickers: Dict[str, Set[str]] = {}
+    for idx, item in enumerate(news_items):
+        key = _news_key(item)
+        if not key:
+            continue
+        if key not in seen:
+            seen[key] = idx
+        tickers.setdefault(key, set()).update(item.get("tickers") or [])
+    ordered = sorted(seen.items())
+    normalized = [
+        {
+            "title": (news_items[idx].get("title") or "").strip(),
+            "summary": (news_items[idx].get("summary") or "").strip(),
+            "source": news_items[idx].get("source") or "",
+            "link": news_items[idx].get("link") or news_items[idx].get("url") or "",
+            "tickers": normalize_tickers(tickers[key]),
+            "published": news_items[idx].get("published"),
+        }
+        for key, idx in ordered
+    ]
+    return normalized, [idx for _key, idx in ordered]
+
+
+class _Inflight:
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+
+
+class SharedAnalysisCache:
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int) -> None:
+        self.name = name
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, _Inflight] = {}
+        self._hits = 0
+        self._misses = 0
+        self._shared_waits = 0
+
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self._ttl:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            found, value = self._lookup(key)
+            return value if found else None
+
+    def put(self, key: str, value: Any) -> None:
+        if value is None or self._ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """캐시에 있으면 반환, 없으면 compute() 결과를 저장해 반환. 동시 요청은 한 번만 계산."""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self._hits += 1
+                return value
+            inflight = self._inflight.get(key)
+            owner = inflight is None
+            if owner:
+                inflight = _Inflight()
+                self._inflight[key] = inflight
+                self._misses += 1
+            else:
+                self._shared_waits += 1
+
+        if not owner:
+            inflight.event.wait()
+            if inflight.value is not None:
+                return inflight.value
+            # 선행 계산이 실패했으면 직접 시도
+            return compute()
+
+        try:
+            value = compute()
+            inflight.value = value
+            self.put(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.event.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses + self._shared_waits
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "shared_waits": self._shared_waits,
+                "hit_rate": round((self._hits + self._shared_waits) / lookups, 3) if lookups else None,
+            }
+
+
+news_analysis_cache = SharedAnalysisCache(
+    "news",
+    ttl_seconds=settings.NEWS_ANALYSIS_CACHE_TTL_SECONDS,
+    max_entries=settings.NEWS_ANALYSIS_CACHE_MAX_ENTRIES,
+)
+
+
+def get_analysis_cache_stats() -> Dict[str, Any]:
+    from app.services.briefing.fragments import fragment_store
+
+    return {cache.name: cache.stats() for cache in (news_analysis_cache, fragment_store.cache)}
@@ -0,0 +1,136 @@
+"""
+비동기(202) 브리핑 생성: 요청은 jobs 테이블에 등록만 하고 즉시 반환, 생성은 작업 큐 워커가 처리.
+
+- 같은 멱등 키의 스냅샷이 있으면 작업 없이 바로 결과 반환, 진행 중인 작업이 있으면 그 작업 id 반환
+- 대기+실행 중인 브리핑 작업이 BRIEFING_ASYNC_MAX_PENDING 이상이면 등록 거부 (BriefingQueueFull)
+- 실행 동시성은 워커 수 × JOB_KIND_CONCURRENCY["briefing.generate"]로 제한
+- 완료 구독은 DB 상태 폴링 기반 SSE (워커가 다른 프로세스일 수 있으므로)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.domain.briefing.model import BriefingSnapshot
+from app.domain.briefing.schema.request import BriefingGenerateRequest
+from app.domain.briefing.schema.response import BriefingGenerateResponse
+from app.domain.job.model import Job
+from app.services.briefing.idempotency import find_snapshot, idempotency_key
+from app.services.jobs import JOB_KIND_BRIEFING, count_active, enqueue, get_job
+from app.services.jobs.queue import find_active
+
+# interactive 요청은 배치/재시도 작업보다 먼저 가져가도록
+BRIEFING_JOB_PRIORITY = 10
+_TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+_KEEPALIVE_SECONDS = 15.0
+
+
+class BriefingQueueFull(Exception):
+    """대기 중인 브리핑 작업이 상한에 도달한 경우."""
+
+
+def submit_briefing_job(
+    db: Session,
+    req: BriefingGenerateRequest,
+    client_key: Optional[str] = None,
+) -> Tuple[Optional[Job], Optional[BriefingGenerateResponse]]:
+    """(작업, 기존 결과) 중 하나를 반환. 윈도우 안의 스냅샷이 있으면 작업 없이 결과만."""
+    key = idempotency_key(req, client_key)
+    existing = find_snapshot(db, int(req.user_id), key)
+    if existing is not None:
+        return None, existing
+
+    dedup_key = f"{JOB_KIND_BRIEFING}:{key}"
+    active = find_active(db, dedup_key)
+    if active is not None:
+        return active, None
+    if count_active(db, JOB_KIND_BRIEFING) >= settings.BRIEFING_ASYNC_MAX_PENDING:
+        raise BriefingQueueFull()
+    job = enqueue(
+        db,
+        JOB_KIND_BRIEFING,
+        {
+            "user_id": int(req.user_id),
+            "village_id": int(req.village_id),
+            "time_slot": req.time_slot,
+            "lane": "interactive",
+            "idempotency_key": key,
+        },
+        dedup_key=dedup_key,
+        priority=BRIEFING_JOB_PRIORITY,
+    )
+    return job, None
+
+
+def get_briefing_job(db: Session, job_id: int) -> Optional[Job]:
+    job = get_job(db, job_id)
+    return job if job is not None and job.kind == JOB_KIND_BRIEFING else None
+
+
+def job_view(db: Session, job: Job) -> Dict[str, Any]:
+    """작업 상태 응답. 성공했으면 생성된 브리핑도 포함."""
+    briefing = None
+    snapshot_id = (job.result or {}).get("snapshot_id") if job.status == "succeeded" else None
+    if snapshot_id:
+        snapshot = db.get(BriefingSnapshot, int(snapshot_id))
+        if snapshot is not None:
+            briefing = BriefingGenerateResponse(**snapshot.payload)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "attempts": int(job.attempts or 0),
+        "error": job.last_error if job.status == "failed" else None,
+        "briefing": briefing,
+    }
+
+
+def _load_job_view(job_id: int) -> Optional[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        job = get_briefing_job(db, job_id)
+        return job_view(db, job) if job is not None else None
+    finally:
+        db.close()
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def iter_job_events(job_id: int) -> AsyncIterator[str]:
+    """
+    SSE 스트림: 상태가 바뀔 때마다 status 이벤트, 끝나면 done 이벤트(브리핑 포함).
+    BRIEFING_JOB_EVENTS_TIMEOUT_SECONDS가 지나면 timeout 이벤트 후 종료 (클라이언트는 폴링으로 전환).
+    """
+    deadline = time.monotonic() + settings.BRIEFING_JOB_EVENTS_TIMEOUT_SECONDS
+    last_status = None
+    last_sent = time.monotonic()
+    while True:
+        view = await run_in_threadpool(_load_job_view, job_id)
+        if view is None:
+            yield _sse("error", {"job_id": job_id, "detail": "Job not found."})
+            return
+        if view["status"] in _TERMINAL_STATUSES:
+            briefing = view["briefing"]
+            view["briefing"] = briefing.model_dump(mode="json") if briefing is not None else None
+            yield _sse("done", view)
+            return
+        if view["status"] != last_status:
+            last_status = view["status"]
+            last_sent = time.monotonic()
+            yield _sse("status", {"job_id": job_id, "status": last_status, "attempts": view["attempts"]})
+        elif time.monotonic() - last_sent >= _KEEPALIVE_SECONDS:
+            last_sent = time.monotonic()
+            yield ": keep-alive\n\n"
+        if time.monotonic() >= deadline:
+            yield _sse("timeout", {"job_id": job_id, "status": last_status})
+            return
+        await asyncio.sleep(settings.BRIEFING_JOB_EVENTS_POLL_SECONDS)
@@ -0,0 +1,316 @@
+"""
+슬롯별 배치 브리핑 생성: 활성 (user, village) 쌍 전체에 대해 스냅샷을 미리 만들어 /briefing/latest를 채워 둔다.
+
+1. 활성 쌍 조회 (보유 수량 > 0인 자산이 마을에 하나 이상 있는 경우)
+2. 전체 종목 합집합의 시세·뉴스를 한 번만 수집, 마을 프롬프트·종목 조각도 한 번에 준비
+3. 제한된 워커 풀에서 쌍별 generate_briefing 실행, 진행 상황은 get_batch_progress()로 조회
+
+스냅샷은 (user, village, 슬롯, 거래일) 멱등 키로 저장되므로, skip_existing이면 이번 슬롯에 이미 만든 쌍은 건너뛴다
+(중단된 배치 재개).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.domain.asset.model import Asset
+from app.domain.briefing.model import BriefingSnapshot
+from app.domain.briefing.schema.request import BriefingGenerateRequest
+from app.domain.portfolio.model import UserPortfolio
+from app.domain.village.model import Village, VillageAsset
+from app.services.briefing.fragments import fragment_store
+from app.services.briefing.generator import BRIEFING_NEWS_PER_TICKER, generate_briefing, price_symbol
+from app.services.briefing.idempotency import idempotency_key
+from app.services.briefing.llm import llm_lane
+from app.services.briefing.prompt_registry import VillagePrompts, prompt_registry
+from app.services.market_data import MarketSnapshot, prefetch_market_snapshot
+
+logger = logging.getLogger(__name__)
+
+Pair = Tuple[int, int]  # (user_id, village_id)
+
+
+@dataclass
+class BatchProgress:
+    time_slot: str
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    skipped: int = 0  # 이번 슬롯 스냅샷이 이미 있어 건너뛴 쌍
+    running: bool = True
+    stage: str = "listing"
+    started_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    finished_at: Optional[str] = None
+    elapsed_seconds: float = 0.0
+    generating_seconds: float = 0.0
+    pairs_per_second: float = 0.0
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+    latency_max_ms: Optional[float] = None
+    failed_pairs: List[Pair] = field(default_factory=list)
+
+
+_progress_lock = threading.Lock()
+_progress: Optional[BatchProgress] = None
+_MAX_FAILED_PAIRS_REPORTED = 50
+_EXISTING_LOOKUP_CHUNK = 500
+
+
+def get_batch_progress() -> Optional[Dict[str, Any]]:
+    """가장 최근(또는 진행 중인) 배치의 진행 상황."""
+    with _progress_lock:
+        return asdict(_progress) if _progress else None
+
+
+def list_active_pairs(db: Session) -> List[Pair]:
+    """보유 수량이 있는 자산을 하나 이상 포함한 (user_id, village_id) 목록."""
+    rows = db.execute(
+        select(Village.user_id, Village.village_id)
+        .join(VillageAsset, VillageAsset.village_id == Village.village_id)
+        .join(
+            UserPortfolio,
+            (UserPortfolio.asset_id == VillageAsset.asset_id) & (UserPortfolio.user_id == Village.user_id),
+        )
+        .where(UserPortfolio.quantity > 0)
+        .distinct()
+        .order_by(Village.user_id, Village.village_id)
+    ).all()
+    return [(int(u), int(v)) for u, v in rows]
+
+
+def prefetch_market_for_villages(db: Session, village_ids: List[int]) -> MarketSnapshot:
+    """마을들이 담은 전체 종목 합집합의 시세·뉴스를 한 번만 수집."""
+    if not village_ids:
+        return MarketSnapshot()
+    assets = (
+        db.query(Asset)
+        .join(VillageAsset, VillageAsset.asset_id == Asset.asset_id)
+        .filter(VillageAsset.village_id.in_(village_ids))
+        .distinct()
+        .all()
+    )
+    tickers = [a.symbol for a in assets if a.symbol]
+    name_map = {a.symbol: a.name for a in assets if a.symbol and a.name}
+    price_tickers = [price_symbol(a) for a in assets if a.symbol]
+    return prefetch_market_snapshot(
+        tickers,
+        news_per_ticker=BRIEFING_NEWS_PER_TICKER,
+        name_map=name_map,
+        price_tickers=price_tickers,
+    )
+
+
+def find_generated_pairs(db: Session, pairs: List[Pair], time_slot: str) -> Set[Pair]:
+    """이번 슬롯(거래일 포함) 멱등 키로 스냅샷이 이미 저장된 쌍."""
+    key_to_pair: Dict[str, Pair] = {}
+    for user_id, village_id in pairs:
+        req = BriefingGenerateRequest(user_id=user_id, village_id=village_id, time_slot=time_slot)
+        key_to_pair[idempotency_key(req)] = (user_id, village_id)
+    keys = list(key_to_pair)
+    found: Set[Pair] = set()
+    for i in range(0, len(keys), _EXISTING_LOOKUP_CHUNK):
+        chunk = keys[i : i + _EXISTING_LOOKUP_CHUNK]
+        rows = db.execute(
+            select(BriefingSnapshot.user_id, BriefingSnapshot.idempotency_key)
+            .where(BriefingSnapshot.idempotency_key.in_(chunk))
+            .distinct()
+        ).all()
+        for user_id, key in rows:
+            pair = key_to_pair.get(key)
+            if pair is not None and pair[0] == int(user_id):
+                found.add(pair)
+    return found
+
+
+_thread_state = threading.local()
+
+
+def _worker_loop(loops: List[asyncio.AbstractEventLoop]) -> asyncio.AbstractEventLoop:
+    """워커 스레드마다 이벤트 루프 하나를 만들어 재사용 (쌍마다 asyncio.run으로 루프를 새로 만들지 않음)."""
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+        loops.append(loop)
+    return loop
+
+
+def _generate_pair(
+    pair: Pair,
+    time_slot: str,
+    market: MarketSnapshot,
+    village_prompts: VillagePrompts,
+    loops: List[asyncio.AbstractEventLoop],
+) -> float:
+    """쌍 하나 생성. 반환값은 소요 시간(초)."""
+    started = time.monotonic()
+    user_id, village_id = pair
+    req = BriefingGenerateRequest(user_id=user_id, village_id=village_id, time_slot=time_slot)
+    db = SessionLocal()
+    try:
+        with llm_lane("batch"):
+            _worker_loop(loops).run_until_complete(
+                generate_briefing(
+                    req,
+                    db=db,
+                    village_prompts=village_prompts,
+                    market=market,
+                    idempotency_key=idempotency_key(req),
+                )
+            )
+    finally:
+        db.close()
+    return time.monotonic() - started
+
+
+def _percentile_ms(sorted_seconds: List[float], pct: float) -> Optional[float]:
+    if not sorted_seconds:
+        return None
+    idx = min(len(sorted_seconds) - 1, max(0, int(round(pct / 100.0 * len(sorted_seconds))) - 1))
+    return round(sorted_seconds[idx] * 1000.0, 1)
+
+
+def run_batch_briefing(
+    time_slot: str,
+    pairs: Optional[List[Pair]] = None,
+    max_workers: Optional[int] = None,
+    skip_existing: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    배치 엔트리 (블로킹). pairs를 주지 않으면 활성 쌍 전체.
+    skip_existing이면 이번 슬롯 스냅샷이 이미 있는 쌍은 건너뛴다.
+    이미 다른 배치가 진행 중이면 건너뛴다. 반환값은 최종 진행 상황(처리량·지연 포함).
+    """
+    global _progress
+    if not settings.DB_ENABLED:
+        logger.warning("DB disabled; skipping batch briefing.")
+        return None
+    with _progress_lock:
+        if _progress is not None and _progress.running:
+            logger.warning("Batch briefing already running (slot=%s); skipping.", _progress.time_slot)
+            return None
+        progress = BatchProgress(time_slot=time_slot)
+        _progress = progress
+
+    started = time.monotonic()
+    workers = max(1, max_workers or settings.BRIEFING_BATCH_CONCURRENCY)
+    try:
+        _run_batch(progress, time_slot, pairs, workers, skip_existing, started)
+    finally:
+        # 반환값은 종료 필드까지 채운 뒤 같은 락 안에서 만든다
+        with _progress_lock:
+            progress.running = False
+            progress.stage = "finished"
+            progress.finished_at = datetime.now(timezone.utc).isoformat()
+            progress.elapsed_seconds = round(time.monotonic() - started, 2)
+            final = asdict(progress)
+        logger.info(
+            "Batch briefing finished: slot=%s done=%d/%d failed=%d skipped=%d elapsed=%.1fs",
+            time_slot,
+            progress.done,
+            progress.total,
+            progress.failed,
+            progress.skipped,
+            progress.elapsed_seconds,
+        )
+    return final
+
+
+def _run_batch(
+    progress: BatchProgress,
+    time_slot: str,
+    pairs: Optional[List[Pair]],
+    workers: int,
+    skip_existing: bool,
+    started: float,
+) -> None:
+    db = SessionLocal()
+    try:
+        if pairs is None:
+            pairs = list_active_pairs(db)
+        pairs = list(dict.fromkeys(pairs))
+        skipped = 0
+        if skip_existing and pairs:
+            existing = find_generated_pairs(db, pairs, time_slot)
+            skipped = len(existing)
+            pairs = [p for p in pairs if p not in existing]
+        with _progress_lock:
+            progress.total = len(pairs)
+            progress.skipped = skipped
+            progress.stage = "prefetch"
+        if not pairs:
+            logger.info("No active (user, village) pairs; nothing to generate.")
+            return
+
+        village_ids = sorted({v for _u, v in pairs})
+        market = prefetch_market_for_villages(db, village_ids)
+        prompts = prompt_registry.resolve_villages(village_ids)
+        with llm_lane("batch"):
+            fragment_store.get_fragments(list(market.quotes.values()), time_slot, db=db)
+    finally:
+        db.close()
+
+    with _progress_lock:
+        progress.stage = "generating"
+    logger.info(
+        "Batch briefing started: slot=%s pairs=%d skipped=%d workers=%d",
+        time_slot,
+        len(pairs),
+        progress.skipped,
+        workers,
+    )
+    generating_started = time.monotonic()
+    latencies: List[float] = []
+    loops: List[asyncio.AbstractEventLoop] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="briefing-batch") as pool:
+        futures = {
+            pool.submit(_generate_pair, pair, time_slot, market, prompts[pair[1]], loops): pair
+            for pair in pairs
+        }
+        for future in as_completed(futures):
+            pair = futures[future]
+            try:
+                latencies.append(future.result())
+                failed = False
+            except Exception:
+                logger.exception("Batch briefing failed: user_id=%s village_id=%s", *pair)
+                failed = True
+            with _progress_lock:
+                progress.done += 1
+                if failed:
+                    progress.failed += 1
+                    if len(progress.failed_pairs) < _MAX_FAILED_PAIRS_REPORTED:
+                        progress.failed_pairs.append(pair)
+                progress.elapsed_seconds = round(time.monotonic() - started, 2)
+            if progress.done % 100 == 0:
+                logger.info("Batch briefing progress: %d/%d (failed=%d)", progress.done, progress.total, progress.failed)
+    for loop in loops:
+        loop.close()
+    generating = time.monotonic() - generating_started
+    latencies.sort()
+    with _progress_lock:
+        progress.generating_seconds = round(generating, 2)
+        progress.pairs_per_second = round(progress.done / generating, 3) if generating > 0 else 0.0
+        progress.latency_p50_ms = _percentile_ms(latencies, 50)
+        progress.latency_p95_ms = _percentile_ms(latencies, 95)
+        progress.latency_max_ms = _percentile_ms(latencies, 100)
+
+
+def run_scheduled_batch_briefing(time_slot: str) -> None:
+    """APScheduler job 엔트리. 리더 교체 등으로 다시 실행되면 이미 만든 쌍은 건너뛴다."""
+    try:
+        run_batch_briefing(time_slot, skip_existing=True)
+    except Exception as e:
+        logger.exception("Scheduled batch briefing failed: %s", e)
@@ -0,0 +1,175 @@
+"""
+부하 테스트용 가짜 LLM provider (BRIEFING_LLM_PROVIDER=fake).
+
+system prompt로 agent 종류를 판별해 각 agent 스키마에 맞는 응답을 돌려준다.
+같은 프롬프트 + FAKE_LLM_SEED 조합이면 항상 같은 응답·지연·오류가 나온다.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+import time
+import zlib
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.services.briefing.llm import LLMResponse
+
+FAKE_MODEL = "fake"
+
+
+class FakeLLMError(RuntimeError):
+    """FAKE_LLM_ERROR_RATE에 따라 발생시키는 provider 오류."""
+
+
+def _rng(system_prompt: str, user_prompt: str) -> random.Random:
+    seed = zlib.crc32(f"{system_prompt}\x00{user_prompt}".encode("utf-8"))
+    return random.Random(seed ^ settings.FAKE_LLM_SEED)
+
+
+def _sample_latency(rng: random.Random) -> float:
+    """로그정규 분포 지연(초). median=FAKE_LLM_LATENCY_MEDIAN_MS, sigma=FAKE_LLM_LATENCY_SIGMA."""
+    median_ms = max(settings.FAKE_LLM_LATENCY_MEDIAN_MS, 0.0)
+    if median_ms <= 0:
+        return 0.0
+    ms = rng.lognormvariate(math.log(median_ms), max(settings.FAKE_LLM_LATENCY_SIGMA, 0.0))
+    return min(ms, settings.FAKE_LLM_LATENCY_MAX_MS) / 1000.0
+
+
+def _fenced(payload: Dict[str, Any]) -> str:
+    return "```json\n" + json.dumps(payload, ensure_ascii=False, indent=2) + "\n```"
+
+
+def _holding_tickers(user_prompt: str) -> List[str]:
+    m = re.search(r"보유 종목:\s*(.+)", user_prompt)
+    if not m:
+        return []
+    return [t.strip() for t in m.group(1).split(",") if t.strip()]
+
+
+def _quote_tickers(user_prompt: str) -> List[str]:
+    return re.findall(r'"ticker":\s*"([^"]+)"', user_prompt)
+
+
+def _news_indices(user_prompt: str) -> List[int]:
+    return [int(i) for i in re.findall(r'"index":\s*(\d+)', user_prompt)]
+
+
+def _relevance(rng: random.Random, user_prompt: str) -> str:
+    indices = _news_indices(user_prompt)
+    picked = [i for i in indices if rng.random() < 0.6]
+    return _fenced({"relevant_indices": picked})
+
+
+def _news(rng: random.Random, user_prompt: str) -> str:
+    tickers = _holding_tickers(user_prompt)
+    titles = re.findall(r'"title":\s*"([^"]*)"', user_prompt)
+    headlines = [
+        {"title": title, "summary": f"{title} 관련 소식입니다.", "news_index": i}
+        for i, title in enumerate(titles[:3])
+    ]
+    sentiment = rng.choice(["긍정", "부정", "중립"])
+    return _fenced({
+        "market_sentiment": f"{sentiment}: 제공된 뉴스 기준 시장 분위기는 {sentiment}입니다.",
+        "key_headlines": headlines,
+        "ticker_specific": {
+            t: {"summary": f"{t} 관련 뉴스 흐름을 확인했습니다.", "news_indices": [rng.randrange(max(len(titles), 1))]}
+            for t in tickers
+        },
+        "risk_alerts": [{"text": "단기 변동성 확대에 유의하세요.", "news_indices": [0]}] if titles else [],
+    })
+
+
+def _stock(rng: random.Random, user_prompt: str) -> str:
+    tickers = _quote_tickers(user_prompt) or ["N/A"]
+    up = rng.randint(0, len(tickers))
+    avg = round(rng.uniform(-3.0, 3.0), 2)
+    return _fenced({
+        "market_summary": f"{len(tickers)}개 종목 중 {up}개 상승, 평균 등락률 {avg:+.2f}%입니다.",
+        "portfolio_performance": f"포트폴리오 평균 수익률은 {avg:+.2f}% 수준입니다.",
+        "key_movers": [
+            f"가장 큰 상승 종목: {rng.choice(tickers)} {abs(avg) + 1:+.2f}%",
+            f"가장 큰 하락 종목: {rng.choice(tickers)} {-abs(avg) - 1:+.2f}%",
+        ],
+        "technical_insights": "등락폭 기준 변동성은 보통 수준입니다.",
+    })
+
+
+def _ticker_fragment(_rng: random.Random, user_prompt: str) -> str:
+    ticker = (_quote_tickers(user_prompt) or ["N/A"])[0]
+    m = re.search(r'"change_percent":\s*(-?[\d.]+)', user_prompt)
+    change = float(m.group(1)) if m else 0.0
+    return f"{ticker}는 전일 대비 {change:+.2f}% 움직였습니다."
+
+
+def _orchestrator(rng: random.Random, user_prompt: str) -> str:
+    greeting = "오늘 하루 수고하셨습니다." if "저녁" in user_prompt else "좋은 아침입니다."
+    visual = {
+        "advice": ["변동성 확대에 유의하세요.", "주요 뉴스를 확인하세요."],
+        "checklist": ["주요 뉴스 확인", "포트폴리오 점검", "리스크 모니터링"],
+        "stock_rationales": [f"등락률 {rng.uniform(-3, 3):+.1f}% 기준 점검이 필요합니다."],
+    }
+    return (
+        "**[Voice Script]**\n"
+        f"{greeting}\n시장은 혼조입니다.\n본 내용은 투자 조언이 아닙니다.\n\n"
+        "**[Visual Summary]**\n" + _fenced(visual)
+    )
+
+
+def _rebalancing(rng: random.Random, _user_prompt: str) -> str:
+    keys = ["risk_balance", "improve_return", "strengthen_dividend"]
+    return ", ".join(["risk_balance"] + [k for k in keys[1:] if rng.random() < 0.5])
+
+
+def _one_liner(_rng: random.Random, _user_prompt: str) -> str:
+    return "뚜렷한 전략으로 구성된 마을로, 꾸준한 점검이 어울립니다."
+
+
+def _summary(_rng: random.Random, _user_prompt: str) -> str:
+    return "오늘은 보유 종목 관련 뉴스가 혼재되어 있습니다. 변동성에 유의하며 주요 일정을 확인해 보세요."
+
+
+# (system prompt 식별 문구, 응답 생성기). 위에서부터 먼저 일치하는 항목 사용.
+_RESPONDERS: List[tuple[str, Callable[[random.Random, str], str]]] = [
+    ("뉴스 관련성 판별", _relevance),
+    ("뉴스 분석가", _news),
+    ("종목 코멘트 작성기", _ticker_fragment),
+    ("Portfolio Market Briefing Engine", _stock),
+    ("브리핑 에디터", _orchestrator),
+    ("리밸런싱", _rebalancing),
+    ("한줄평", _one_liner),
+    ("투자 포인트", _summary),
+]
+
+
+def _respond(rng: random.Random, system_prompt: str, user_prompt: str) -> str:
+    for marker, responder in _RESPONDERS:
+        if marker in system_prompt:
+            return responder(rng, user_prompt)
+    return _summary(rng, user_prompt)
+
+
+def call_fake(
+    system_prompt: str,
+    user_prompt: str,
+    temperature: Optional[float],
+    timeout: Optional[float] = None,
+) -> "LLMResponse":
+    from app.services.briefing.llm import LLMResponse
+
+    rng = _rng(system_prompt, user_prompt)
+    time.sleep(_sample_latency(rng))
+    if rng.random() < settings.FAKE_LLM_ERROR_RATE:
+        raise FakeLLMError("fake provider error (FAKE_LLM_ERROR_RATE)")
+    text = _respond(rng, system_prompt, user_prompt)
+    return LLMResponse(
+        text=text,
+        model=FAKE_MODEL,
+        prompt_tokens=(len(system_prompt) + len(user_prompt)) // 4,
+        completion_tokens=len(text) // 4,
+    )
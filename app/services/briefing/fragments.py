@@ -0,0 +1,234 @@
+"""
+(종목, 슬롯, 날짜)별 분석 조각(fragment) 저장소.
+
+- 종목당 짧은 노트 1개를 LLM(또는 템플릿)으로 만들고 (키에 반올림한 등락률 포함), 메모리 캐시 + ticker_analysis_fragments 테이블에 저장
+- 마을/사용자 브리핑은 이 조각들을 조합하므로, 슬롯당 LLM 호출 수는 사용자×마을이 아니라 고유 종목 수에 비례
+- LLM 조각만 DB에 저장 (템플릿 폴백은 메모리에만 두어, 이후 LLM 조각이 만들어질 수 있게 함)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.briefing.analysis_cache import SharedAnalysisCache, trading_date
+from app.services.briefing.llm import call_llm
+from app.services.briefing.prompt_registry import TICKER_FRAGMENT_PROMPT_KEY, prompt_registry
+from app.services.market_data import TickerQuote
+
+logger = logging.getLogger(__name__)
+
+TICKER_FRAGMENT_SYSTEM_PROMPT = """# Role: 종목 코멘트 작성기
+
+한 종목의 시세 데이터를 받아 브리핑에 들어갈 짧은 코멘트 1문장을 작성합니다.
+
+## 규칙
+- 한국어 1문장, 60자 이내
+- 반드시 등락률 수치를 포함
+- 제공된 데이터 외의 원인 추측 금지, 매수/매도 등 투자 조언 금지
+- 코멘트 문장만 출력 (JSON/마크다운 금지)
+"""
+
+_MAX_NOTE_LENGTH = 512
+_VOLATILE_CHANGE = 3.0
+
+
+@dataclass
+class TickerFragment:
+    ticker: str
+    time_slot: str
+    trade_date: str
+    price: Optional[float]
+    change_percent: Optional[float]
+    note: str
+    source: str  # "llm" | "template"
+
+
+def template_note(quote: TickerQuote) -> str:
+    """LLM 없이 시세만으로 만드는 기본 노트."""
+    change = quote.change_percent
+    if change is None:
+        return f"{quote.ticker}: 시세 데이터 부족"
+    if abs(change) < 0.05:
+        direction = "보합"
+    else:
+        direction = "상승" if change > 0 else "하락"
+    note = f"{quote.ticker} 전일 대비 {change:+.2f}% {direction}"
+    if abs(change) >= _VOLATILE_CHANGE:
+        note += " (변동폭 큼)"
+    return note
+
+
+def _build_fragment_prompt(quote: TickerQuote, time_slot: str) -> str:
+    time_desc = "오전 8시 출근길" if time_slot == "morning" else "오후 4시 퇴근길"
+    quote_json = json.dumps(
+        {
+            "ticker": quote.ticker,
+            "price": quote.price,
+            "change_percent": quote.change_percent,
+            "previous_close": quote.previous_close,
+            "currency": quote.currency,
+        },
+        ensure_ascii=False,
+    )
+    return f"현재 시각: {time_desc}\n\n### 시세\n{quote_json}\n\n위 종목의 코멘트 1문장을 작성해 주세요."
+
+
+def _change_key(change_percent: Optional[float]) -> str:
+    return "na" if change_percent is None else f"{float(change_percent):.2f}"
+
+
+def _fragment_key(ticker: str, time_slot: str, trade_date_: str, change_percent: Optional[float]) -> str:
+    """노트가 등락률을 서술하므로 반올림한 등락률까지 키에 포함 (시세가 바뀌면 새 조각)."""
+    return f"{ticker}|{time_slot}|{trade_date_}|{_change_key(change_percent)}"
+
+
+class FragmentStore:
+    def __init__(self) -> None:
+        self._cache = SharedAnalysisCache(
+            "ticker_fragment",
+            ttl_seconds=settings.TICKER_FRAGMENT_CACHE_TTL_SECONDS,
+            max_entries=settings.TICKER_FRAGMENT_CACHE_MAX_ENTRIES,
+        )
+
+    @property
+    def cache(self) -> SharedAnalysisCache:
+        return self._cache
+
+    def _build(self, quote: TickerQuote, time_slot: str, trade_date_: str) -> TickerFragment:
+        note: Optional[str] = None
+        if settings.TICKER_FRAGMENT_MODE == "llm" and quote.change_percent is not None:
+            try:
+                raw = call_llm(
+                    prompt_registry.get(TICKER_FRAGMENT_PROMPT_KEY, TICKER_FRAGMENT_SYSTEM_PROMPT),
+                    _build_fragment_prompt(quote, time_slot),
+                    agent="ticker_fragment",
+                )
+            except Exception:
+                logger.exception("Ticker fragment LLM call failed: ticker=%s", quote.ticker)
+                raw = None
+            note = (raw or "").strip().strip('"')[:_MAX_NOTE_LENGTH] or None
+        return TickerFragment(
+            ticker=quote.ticker,
+            time_slot=time_slot,
+            trade_date=trade_date_,
+            price=quote.price,
+            change_percent=quote.change_percent,
+            note=note or template_note(quote),
+            source="llm" if note else "template",
+        )
+
+    def _load(self, db: Session, tickers: List[str], time_slot: str, trade_date_: str) -> List[TickerFragment]:
+        from app.domain.briefing.model import TickerAnalysisFragment
+
+        rows = (
+            db.query(TickerAnalysisFragment)
+            .filter(
+                TickerAnalysisFragment.ticker.in_(tickers),
+                TickerAnalysisFragment.time_slot == time_slot,
+                TickerAnalysisFragment.trade_date == trade_date_,
+            )
+            .all()
+        )
+        return [
+            TickerFragment(
+                ticker=row.ticker,
+                time_slot=row.time_slot,
+                trade_date=row.trade_date,
+                price=row.price,
+                change_percent=row.change_percent,
+                note=row.note,
+                source=row.source,
+            )
+            for row in rows
+        ]
+
+    def _save(self, db: Session, fragments: Iterable[TickerFragment]) -> None:
+        from app.domain.briefing.model import TickerAnalysisFragment
+
+        rows = [
+            {
+                "ticker": f.ticker,
+                "time_slot": f.time_slot,
+                "trade_date": f.trade_date,
+                "price": f.price,
+                "change_percent": f.change_percent,
+                "note": f.note,
+                "source": f.source,
+                "created_at": datetime.now(timezone.utc),
+            }
+            for f in fragments
+            if f.source == "llm"
+        ]
+        if not rows:
+            return
+        stmt = mysql_insert(TickerAnalysisFragment).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            price=stmt.inserted.price,
+            change_percent=stmt.inserted.change_percent,
+            note=stmt.inserted.note,
+            source=stmt.inserted.source,
+            created_at=stmt.inserted.created_at,
+        )
+        db.execute(stmt)
+        db.commit()
+
+    def get_fragments(
+        self,
+        quotes: List[TickerQuote],
+        time_slot: str,
+        db: Optional[Session] = None,
+    ) -> Dict[str, TickerFragment]:
+        """quotes의 종목별 조각. 메모리 → DB → 생성 순으로 채운다."""
+        trade_date_ = trading_date()
+        unique: Dict[str, TickerQuote] = {}
+        for q in quotes:
+            if q and q.ticker and q.ticker not in unique:
+                unique[q.ticker] = q
+
+        result: Dict[str, TickerFragment] = {}
+        for ticker, quote in unique.items():
+            cached = self._cache.get(_fragment_key(ticker, time_slot, trade_date_, quote.change_percent))
+            if cached is not None:
+                result[ticker] = cached
+
+        missing = [t for t in unique if t not in result]
+        if missing and db is not None and settings.DB_ENABLED:
+            try:
+                for fragment in self._load(db, missing, time_slot, trade_date_):
+                    change = unique[fragment.ticker].change_percent
+                    if _change_key(fragment.change_percent) != _change_key(change):
+                        continue  # 이전 시세로 만든 조각
+                    self._cache.put(_fragment_key(fragment.ticker, time_slot, trade_date_, change), fragment)
+                    result[fragment.ticker] = fragment
+            except Exception as e:
+                db.rollback()
+                logger.warning("Ticker fragment load failed: %s", e)
+
+        created: List[TickerFragment] = []
+        for ticker in [t for t in unique if t not in result]:
+            quote = unique[ticker]
+            fragment = self._cache.get_or_compute(
+                _fragment_key(ticker, time_slot, trade_date_, quote.change_percent),
+                lambda q=quote: self._build(q, time_slot, trade_date_),
+            )
+            result[ticker] = fragment
+            created.append(fragment)
+
+        if created and db is not None and settings.DB_ENABLED:
+            try:
+                self._save(db, created)
+            except Exception as e:
+                db.rollback()
+                logger.warning("Ticker fragment save failed: %s", e)
+        return result
+
+
+fragment_store = FragmentStore()
@@ -8,7 +8,6 @@ from typing import Dict, List, Optional, Tuple, Any
 from uuid import uuid5, NAMESPACE_URL
 
 from sqlalchemy.orm import Session
-from sqlalchemy.dialects.mysql import insert as mysql_insert
 
 from app.domain.asset.model import Asset, AssetPrice
 from app.domain.briefing.model import BriefingSnapshot
@@ -30,15 +29,48 @@ from app.domain.briefing.schema.response import BriefingGenerateResponse
 from app.domain.portfolio.model import UserPortfolio
 from app.domain.village.model import Village, VillageAsset
 from app.services.briefing.agents.news_agent import (
+    NEWS_RELEVANCE_SYSTEM_PROMPT,
+    NEWS_SYSTEM_PROMPT,
     analyze_news_data,
     filter_relevant_news_with_llm,
 )
-from app.services.briefing.agents.orchestrator import orchestrate_briefing
-from app.services.briefing.agents.stock_agent import analyze_stock_data
-from app.services.market_data import MarketContext, TickerQuote, get_market_context, get_usdkrw_rate
+from app.services.briefing.agents.orchestrator import (
+    ORCHESTRATOR_SYSTEM_PROMPT,
+    is_fallback_briefing,
+    orchestrate_briefing,
+)
+from app.services.briefing.agents.stock_agent import (
+    STOCK_SYSTEM_PROMPT,
+    analyze_stock_data,
+    assemble_stock_analysis,
+)
+from app.services.briefing.analysis_cache import fingerprint
+from app.services.briefing.fragments import fragment_store
+from app.services.briefing.incremental import load_stage_cache, news_fingerprint, quotes_fingerprint
+from app.services.briefing.llm_metrics import llm_call_collector, persist_llm_calls
+from app.services.briefing.prompt_registry import (
+    NEWS_PROMPT_KEY,
+    NEWS_RELEVANCE_PROMPT_KEY,
+    ORCHESTRATOR_PROMPT_KEY,
+    STOCK_PROMPT_KEY,
+    VillagePrompts,
+    prompt_registry,
+)
+from app.services.briefing.snapshot_cache import latest_snapshot_cache
+from app.services.market_data import (
+    MarketContext,
+    MarketSnapshot,
+    TickerQuote,
+    get_market_context,
+    get_usdkrw_rate,
+)
+from app.services.portfolio.analytics import HoldingsFrame
+from app.services.portfolio.valuation import ingest_asset_prices
 
 logger = logging.getLogger(__name__)
 
+BRIEFING_NEWS_PER_TICKER = 3
+
 
 def _format_percent(value: float) -> str:
     return f"{value:+.2f}%"
@@ -70,34 +102,21 @@ def _make_news_id(url: str, title: str) -> str:
     return str(uuid5(NAMESPACE_URL, seed))
 
 
-def _compute_weighted_daily_change(
-    items: List[Tuple[float, float]],
-) -> float:
-    """items: (daily_change_rate, current_value)."""
-    total_value = sum(v for _r, v in items if v > 0)
-    if total_value > 0:
-        return sum(r * v for r, v in items if v > 0) / total_value
-    rates = [r for r, _v in items]
-    return sum(rates) / len(rates) if rates else 0.0
-
-
 def _extract_quotes_map(quotes: List[TickerQuote]) -> Dict[str, TickerQuote]:
     return {q.ticker: q for q in quotes if q and q.ticker}
 
 
 def _upsert_asset_prices(db: Session, price_map: Dict[int, float]) -> None:
-    """asset_price에 현재가 upsert."""
-    if not price_map:
-        return
-    now = datetime.now(timezone.utc)
-    rows = [{"asset_id": asset_id, "price": price, "as_of": now} for asset_id, price in price_map.items()]
-    stmt = mysql_insert(AssetPrice).values(rows)
-    stmt = stmt.on_duplicate_key_update(
-        price=stmt.inserted.price,
-        as_of=stmt.inserted.as_of,
-    )
-    db.execute(stmt)
-    db.commit()
+    """asset_price에 현재가 upsert (가격이 바뀐 종목의 평가 테이블도 함께 갱신)."""
+    ingest_asset_prices(db, price_map)
+
+
+def price_symbol(asset: Asset) -> str:
+    """시세 조회용 심볼 (국내 6자리 종목코드는 yfinance .KS 접미사)."""
+    symbol = asset.symbol
+    if asset.country_code == "KR" and symbol.isdigit() and len(symbol) == 6:
+        return f"{symbol}.KS"
+    return symbol
 
 
 def _load_asset_prices(db: Session, asset_ids: List[int]) -> Dict[int, float]:
@@ -110,8 +129,39 @@ def _load_asset_prices(db: Session, asset_ids: List[int]) -> Dict[int, float]:
 async def generate_briefing(
     req: BriefingGenerateRequest,
     db: Session,
+    village_prompts: Optional[VillagePrompts] = None,
+    market: Optional[MarketSnapshot] = None,
+    idempotency_key: Optional[str] = None,
 ) -> BriefingGenerateResponse:
+    """
+    브리핑 생성 + 스냅샷 저장. 생성 중 발생한 LLM 호출은 브리핑 단위로 기록.
+    배치 실행 시 market(미리 수집한 시세·뉴스)을 넘기면 외부 조회를 생략한다.
+    idempotency_key는 스냅샷에 함께 저장되어 같은 키의 재요청이 이 스냅샷을 재사용한다.
+    """
+    with llm_call_collector() as llm_calls:
+        response, snapshot_id = await _generate_briefing(
+            req, db, village_prompts=village_prompts, market=market, idempotency_key=idempotency_key
+        )
+    persist_llm_calls(
+        db,
+        llm_calls,
+        user_id=int(req.user_id),
+        village_id=req.village_id,
+        briefing_id=snapshot_id,
+    )
+    return response
+
+
+async def _generate_briefing(
+    req: BriefingGenerateRequest,
+    db: Session,
+    village_prompts: Optional[VillagePrompts] = None,
+    market: Optional[MarketSnapshot] = None,
+    idempotency_key: Optional[str] = None,
+) -> Tuple[BriefingGenerateResponse, int]:
     user_id = int(req.user_id)
+    # 배치 실행 시에는 호출자가 미리 resolve한 마을 프롬프트를 넘김
+    prompts = village_prompts or prompt_registry.for_village(req.village_id)
 
     # 기본 마을 정보 (없으면 폴백)
     village_row = (
@@ -159,21 +209,20 @@ async def generate_briefing(
     price_tickers = []
     asset_price_symbol_map: Dict[int, str] = {}
     for _p, asset in portfolio_rows:
-        symbol = asset.symbol
-        if asset.country_code == "KR" and symbol.isdigit() and len(symbol) == 6:
-            yf_symbol = f"{symbol}.KS"
-        else:
-            yf_symbol = symbol
+        yf_symbol = price_symbol(asset)
         price_tickers.append(yf_symbol)
         asset_price_symbol_map[asset.asset_id] = yf_symbol
 
     name_map = {asset.symbol: asset.name for _p, asset in portfolio_rows if asset.symbol and asset.name}
-    market_ctx: MarketContext = await get_market_context(
-        tickers,
-        news_per_ticker=3,
-        name_map=name_map,
-        price_tickers=price_tickers,
-    )
+    if market is not None:
+        market_ctx: MarketContext = market.context_for(tickers, price_tickers=price_tickers)
+    else:
+        market_ctx = await get_market_context(
+            tickers,
+            news_per_ticker=BRIEFING_NEWS_PER_TICKER,
+            name_map=name_map,
+            price_tickers=price_tickers,
+        )
     usdkrw_rate = get_usdkrw_rate()
     quotes_map = _extract_quotes_map(market_ctx.ticker_quotes or [])
     price_updates: Dict[int, float] = {}
@@ -190,56 +239,40 @@ async def generate_briefing(
 
     asset_price_map = _load_asset_prices(db, [asset.asset_id for _p, asset in portfolio_rows])
 
+    daily_changes: Dict[int, float] = {}
+    for _portfolio, asset in portfolio_rows:
+        quote = quotes_map.get(asset_price_symbol_map.get(asset.asset_id, asset.symbol))
+        if quote and quote.change_percent is not None:
+            daily_changes[asset.asset_id] = float(quote.change_percent)
+    frame = HoldingsFrame.from_rows(portfolio_rows, asset_price_map, daily_changes)
+    return_rates = frame.asset_return_rates()
+
     asset_total_return_items: List[AssetTotalReturnItem] = []
     asset_daily_change_items: List[AssetDailyChangeItem] = []
-    weighted_daily_items: List[Tuple[float, float]] = []
-
-    total_assets_value = 0.0
-    total_cost_value = 0.0
-
-    for portfolio, asset in portfolio_rows:
-        ticker = asset.symbol
-        name = asset.name
-        quantity = float(portfolio.quantity or 0)
-        avg_buy_price = float(portfolio.avg_buy_price or 0)
-        quote_symbol = asset_price_symbol_map.get(asset.asset_id, ticker)
-        quote = quotes_map.get(quote_symbol)
-        current_price = asset_price_map.get(asset.asset_id, 0.0)
-        daily_change_rate = float(quote.change_percent) if quote and quote.change_percent is not None else 0.0
-
-        current_value = quantity * current_price
-        cost_value = quantity * avg_buy_price
-        total_assets_value += current_value
-        total_cost_value += cost_value
-
-        total_return_rate = 0.0
-        if avg_buy_price > 0:
-            total_return_rate = ((current_price - avg_buy_price) / avg_buy_price) * 100.0
-
+    for i, (_portfolio, asset) in enumerate(portfolio_rows):
+        total_return_rate = float(return_rates[i])
+        daily_change_rate = float(frame.daily_change[i])
         asset_total_return_items.append(
             AssetTotalReturnItem(
-                ticker=ticker,
-                name=name,
+                ticker=asset.symbol,
+                name=asset.name,
                 total_return_rate=round(total_return_rate, 2),
                 display=_format_percent(total_return_rate),
             )
         )
-
         asset_daily_change_items.append(
             AssetDailyChangeItem(
-                ticker=ticker,
-                name=name,
+                ticker=asset.symbol,
+                name=asset.name,
                 daily_change_rate=round(daily_change_rate, 2),
                 display=_format_percent(daily_change_rate),
             )
         )
 
-        weighted_daily_items.append((daily_change_rate, current_value))
-
-    total_profit_value = total_assets_value - total_cost_value
-    total_return_rate = (
-        (total_profit_value / total_cost_value * 100.0) if total_cost_value > 0 else 0.0
-    )
+    totals = frame.totals()
+    total_assets_value = totals.value
+    total_profit_value = totals.profit
+    total_return_rate = totals.return_rate
 
     portfolio_summary = PortfolioSummary(
         total_return_rate=round(total_return_rate, 2),
@@ -252,20 +285,34 @@ async def generate_briefing(
         ),
     )
 
-    village_daily_change_rate = _compute_weighted_daily_change(weighted_daily_items)
+    village_daily_change_rate = frame.weighted_daily_change()
     village_daily_change = VillageDailyChange(
         daily_change_rate=round(village_daily_change_rate, 2),
         display=_format_percent(village_daily_change_rate),
     )
 
     # 뉴스 필터링 (LLM 관련성 판단)
+    stages = load_stage_cache(db, user_id, req.village_id)
     news_items = market_ctx.news_items or []
+    news_fp = news_fingerprint(news_items)
     news_by_ticker: Dict[str, List[Dict[str, Any]]] = {}
     for item in news_items:
         for t in item.get("tickers") or []:
             news_by_ticker.setdefault(t, []).append(item)
     if news_items and asset_names:
-        filtered = filter_relevant_news_with_llm(news_items, asset_names)
+        relevance_prompt = prompts.system(NEWS_RELEVANCE_PROMPT_KEY, NEWS_RELEVANCE_SYSTEM_PROMPT)
+        # 필터 결과는 제목 목록으로 저장하고 이번 뉴스 목록에서 다시 찾는다
+        relevant_titles = await stages.arun(
+            "news_filter",
+            fingerprint(news_fp, asset_names, relevance_prompt),
+            lambda: [
+                item.get("title") or ""
+                for item in filter_relevant_news_with_llm(news_items, asset_names, system_prompt=relevance_prompt)
+            ],
+            cacheable=bool,
+        )
+        by_title = {item.get("title") or "": item for item in news_items}
+        filtered = [by_title[t] for t in relevant_titles or [] if t in by_title]
         if filtered:
             news_items = filtered
 
@@ -304,31 +351,72 @@ async def generate_briefing(
 
     latest_news = LatestNews(title="마을 최신 뉴스", items=latest_news_items)
 
-    # AI 분석: 주식/뉴스 → 통합 조언
-    stock_analysis = analyze_stock_data(
-        market_ctx.ticker_quotes or [],
-        [{
-            "name": village.name,
-            "profile": village_profile,
-            "assets": [{"ticker": t, "name": n} for t, n in zip(tickers, asset_names)],
-        }],
-        user_name="김직장님",
-        time_slot=req.time_slot,
-    )
-    news_analysis = analyze_news_data(
-        news_items,
-        tickers,
-        user_name="김직장님",
-        time_slot=req.time_slot,
+    # AI 분석: 주식/뉴스 → 통합 조언 (입력 fingerprint가 직전 스냅샷과 같은 단계는 재사용)
+    quotes = market_ctx.ticker_quotes or []
+    village_fp = fingerprint(village.name, village_profile)
+    holdings_fp = fingerprint(list(zip(tickers, asset_names)))
+    if STOCK_PROMPT_KEY in prompts.overrides:
+        # 마을 전용 주식 분석 지침이 있으면 공유 조각 대신 마을 단위로 분석
+        stock_prompt = prompts.system(STOCK_PROMPT_KEY, STOCK_SYSTEM_PROMPT)
+        stock_analysis = await stages.arun(
+            "stock",
+            fingerprint("village", quotes_fingerprint(quotes), holdings_fp, village_fp, req.time_slot, stock_prompt),
+            lambda: analyze_stock_data(
+                quotes,
+                [{
+                    "name": village.name,
+                    "profile": village_profile,
+                    "assets": [{"ticker": t, "name": n} for t, n in zip(tickers, asset_names)],
+                }],
+                user_name="김직장님",
+                time_slot=req.time_slot,
+                system_prompt=stock_prompt,
+            ),
+        )
+    else:
+        stock_analysis = await stages.arun(
+            "stock",
+            fingerprint("fragments", quotes_fingerprint(quotes), req.time_slot),
+            lambda: assemble_stock_analysis(
+                quotes, fragment_store.get_fragments(quotes, req.time_slot, db=db)
+            ),
+        )
+    news_prompt = prompts.system(NEWS_PROMPT_KEY, NEWS_SYSTEM_PROMPT)
+    news_analysis = await stages.arun(
+        "news",
+        fingerprint(news_fingerprint(news_items), tickers, req.time_slot, news_prompt),
+        lambda: analyze_news_data(
+            news_items,
+            tickers,
+            user_name="김직장님",
+            time_slot=req.time_slot,
+            system_prompt=news_prompt,
+        ),
     )
 
-    _voice_script, visual_summary = orchestrate_briefing(
-        stock_analysis,
-        news_analysis,
-        [{"name": village.name, "profile": village_profile}],
-        user_name="김직장님",
-        time_slot=req.time_slot,
+    orchestrator_prompt = prompts.system(ORCHESTRATOR_PROMPT_KEY, ORCHESTRATOR_SYSTEM_PROMPT)
+    _voice_script, visual_summary = await stages.arun(
+        "orchestrator",
+        fingerprint(stock_analysis, news_analysis, village_fp, req.time_slot, orchestrator_prompt),
+        lambda: list(
+            orchestrate_briefing(
+                stock_analysis,
+                news_analysis,
+                [{"name": village.name, "profile": village_profile}],
+                user_name="김직장님",
+                time_slot=req.time_slot,
+                system_prompt=orchestrator_prompt,
+            )
+        ),
+        # 폴백 브리핑(LLM 실패)은 다음 생성에서 다시 시도
+        cacheable=lambda result: not is_fallback_briefing(
+            result, stock_analysis, news_analysis, "김직장님", req.time_slot
+        ),
     )
+    if stages.reused:
+        logger.info(
+            "Briefing stages reused: user_id=%s village_id=%s stages=%s", user_id, req.village_id, stages.reused
+        )
 
     bullets = visual_summary.get("advice") if isinstance(visual_summary, dict) else None
     stock_rationales = visual_summary.get("stock_rationales") if isinstance(visual_summary, dict) else None
@@ -363,8 +451,11 @@ async def generate_briefing(
         user_id=user_id,
         village_id=req.village_id,
         time_slot=req.time_slot,
-        payload_json=response.model_dump(),
+        idempotency_key=idempotency_key,
+        payload=response.model_dump(mode="json"),
+        stage_state_zlib=stages.encode(),
     )
     db.add(snapshot)
     db.commit()
-    return response
+    latest_snapshot_cache.put(user_id, req.village_id, response.model_dump_json().encode("utf-8"))
+    return response, snapshot.id
@@ -0,0 +1,97 @@
+"""
+POST /briefing/generate 멱등 처리.
+
+- 키: 클라이언트 Idempotency-Key가 있으면 (user, village, 슬롯, 키), 없으면 (user, village, 슬롯, 거래일)의 해시.
+  같은 클라이언트 키라도 요청 본문이 다르면 다른 키 → 다른 마을/슬롯의 브리핑을 재사용하지 않음
+- 윈도우(BRIEFING_IDEMPOTENCY_WINDOW_SECONDS) 안에 같은 키로 저장된 스냅샷이 있으면 그대로 반환
+- 같은 프로세스에서 같은 키가 생성 중이면 새로 만들지 않고 그 결과를 함께 기다림
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import desc
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.domain.briefing.model import BriefingSnapshot
+from app.domain.briefing.schema.request import BriefingGenerateRequest
+from app.domain.briefing.schema.response import BriefingGenerateResponse
+from app.services.briefing.analysis_cache import fingerprint, trading_date
+from app.services.briefing.generator import generate_briefing
+
+logger = logging.getLogger(__name__)
+
+# 같은 이벤트 루프(API 프로세스) 안의 생성 중 작업
+_inflight: Dict[str, "asyncio.Task[BriefingGenerateResponse]"] = {}
+
+
+def idempotency_key(req: BriefingGenerateRequest, client_key: Optional[str] = None) -> str:
+    """요청의 멱등 키 (64자 hex). 클라이언트 키도 요청 본문(user, village, 슬롯)과 함께 해시한다."""
+    if client_key:
+        return fingerprint("client", int(req.user_id), int(req.village_id), req.time_slot, client_key.strip())
+    return fingerprint("briefing", int(req.user_id), int(req.village_id), req.time_slot, trading_date())
+
+
+def _recent_snapshot_query(db: Session, user_id: int, key: str, *entities, windowed: bool = True):
+    query = db.query(*entities).filter(BriefingSnapshot.user_id == user_id, BriefingSnapshot.idempotency_key == key)
+    if windowed:
+        window = settings.BRIEFING_IDEMPOTENCY_WINDOW_SECONDS
+        if window <= 0:
+            return None
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=window)
+        query = query.filter(BriefingSnapshot.created_at >= since)
+    return query.order_by(desc(BriefingSnapshot.created_at))
+
+
+def find_snapshot(db: Session, user_id: int, key: str) -> Optional[BriefingGenerateResponse]:
+    """윈도우 안에 같은 키로 저장된 최신 스냅샷."""
+    query = _recent_snapshot_query(db, user_id, key, BriefingSnapshot)
+    row = query.first() if query is not None else None
+    return BriefingGenerateResponse(**row.payload) if row else None
+
+
+def find_snapshot_id(db: Session, user_id: int, key: str, windowed: bool = True) -> Optional[int]:
+    """find_snapshot과 같은 조건의 스냅샷 id (payload는 읽지 않음). windowed=False면 시간 제한 없음."""
+    query = _recent_snapshot_query(db, user_id, key, BriefingSnapshot.id, windowed=windowed)
+    row = query.first() if query is not None else None
+    return int(row[0]) if row else None
+
+
+async def _generate_with_session(req: BriefingGenerateRequest, key: str) -> BriefingGenerateResponse:
+    # 먼저 들어온 요청이 끊겨도 생성은 끝까지 진행되도록 요청 세션과 분리
+    db = SessionLocal()
+    try:
+        return await generate_briefing(req, db=db, idempotency_key=key)
+    finally:
+        db.close()
+
+
+async def generate_briefing_idempotent(
+    req: BriefingGenerateRequest,
+    db: Session,
+    client_key: Optional[str] = None,
+) -> Tuple[BriefingGenerateResponse, bool]:
+    """
+    멱등 브리핑 생성. 반환값은 (응답, 재사용 여부).
+    재사용 여부는 기존 스냅샷을 돌려줬거나 진행 중인 생성에 합류한 경우 True.
+    """
+    key = idempotency_key(req, client_key)
+    task = _inflight.get(key)
+    if task is not None:
+        logger.info("Attaching to in-flight briefing: user_id=%s village_id=%s", req.user_id, req.village_id)
+        return await asyncio.shield(task), True
+
+    existing = find_snapshot(db, int(req.user_id), key)
+    if existing is not None:
+        return existing, True
+
+    task = asyncio.create_task(_generate_with_session(req, key))
+    _inflight[key] = task
+    task.add_done_callback(lambda _t: _inflight.pop(key, None))
+    return await asyncio.shield(task), False
@@ -0,0 +1,104 @@
+"""
+브리핑 단계별 증분 재계산.
+
+각 단계(뉴스 필터 / 주식 분석 / 뉴스 분석 / 통합 조언)의 입력(시세, 뉴스 세트, 보유 종목, 마을 프로필, 프롬프트)
+fingerprint와 출력을 스냅샷(stage_state_zlib)에 함께 저장하고, 다음 생성 때 fingerprint가 같은 단계는
+직전 스냅샷의 출력을 그대로 쓴다. 아무것도 바뀌지 않았으면 LLM 호출 없이 재생성된다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import desc
+from sqlalchemy.orm import Session
+
+from app.domain.briefing.model import BriefingSnapshot
+from app.domain.common.model import decode_payload, encode_payload
+from app.services.briefing.analysis_cache import fingerprint, normalize_news
+from app.services.market_data import TickerQuote
+
+logger = logging.getLogger(__name__)
+
+STAGE_STATE_VERSION = 1
+
+
+def quotes_fingerprint(quotes: List[TickerQuote]) -> str:
+    return fingerprint(sorted((q.ticker, q.price, q.change_percent) for q in quotes if q and q.ticker))
+
+
+def news_fingerprint(news_items: List[Dict[str, Any]]) -> str:
+    normalized, _index_map = normalize_news(news_items)
+    return fingerprint(normalized)
+
+
+@dataclass
+class StageCache:
+    """직전 스냅샷의 단계 상태(previous)와 이번 생성의 단계 상태(current)."""
+
+    previous: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    current: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    reused: List[str] = field(default_factory=list)
+
+    def run(
+        self,
+        stage: str,
+        fp: str,
+        compute: Callable[[], Any],
+        cacheable: Callable[[Any], bool] = lambda value: value is not None,
+    ) -> Any:
+        """fp가 직전과 같으면 저장된 출력, 아니면 compute(). cacheable이 False인 결과(실패·폴백)는 저장하지 않음."""
+        prev = self.previous.get(stage)
+        if prev is not None and prev.get("fp") == fp:
+            self.reused.append(stage)
+            output = prev.get("output")
+        else:
+            output = compute()
+            if not cacheable(output):
+                return output
+        self.current[stage] = {"fp": fp, "output": output}
+        return output
+
+    async def arun(
+        self,
+        stage: str,
+        fp: str,
+        compute: Callable[[], Any],
+        cacheable: Callable[[Any], bool] = lambda value: value is not None,
+    ) -> Any:
+        """
+        run()과 같되 compute()를 워커 스레드에서 실행 (이벤트 루프에서 호출할 때).
+        LLM 호출은 dispatcher 슬롯 대기(최대 LLM_QUEUE_TIMEOUT_SECONDS)로 블로킹되므로 루프를 멈추지 않게 한다.
+        contextvar(레인·LLM 수집기·tracing span)는 asyncio.to_thread가 복사해 넘긴다.
+        """
+        prev = self.previous.get(stage)
+        if prev is not None and prev.get("fp") == fp:
+            return self.run(stage, fp, compute, cacheable)
+        output = await asyncio.to_thread(compute)
+        return self.run(stage, fp, lambda: output, cacheable)
+
+    def encode(self) -> Optional[bytes]:
+        if not self.current:
+            return None
+        return encode_payload({"version": STAGE_STATE_VERSION, "stages": self.current})
+
+
+def load_stage_cache(db: Session, user_id: int, village_id: int) -> StageCache:
+    """(user, village)의 직전 스냅샷 단계 상태. 없거나 읽을 수 없으면 빈 캐시."""
+    try:
+        row = (
+            db.query(BriefingSnapshot.stage_state_zlib)
+            .filter(BriefingSnapshot.user_id == user_id, BriefingSnapshot.village_id == village_id)
+            .order_by(desc(BriefingSnapshot.created_at), desc(BriefingSnapshot.id))
+            .first()
+        )
+        state = decode_payload(row[0]) if row and row[0] else None
+    except Exception as e:
+        logger.warning("Failed to load briefing stage state (user_id=%s village_id=%s): %s", user_id, village_id, e)
+        return StageCache()
+    if not isinstance(state, dict) or state.get("version") != STAGE_STATE_VERSION:
+        return StageCache()
+    return StageCache(previous=dict(state.get("stages") or {}))
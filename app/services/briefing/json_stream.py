@@ -0,0 +1,179 @@
+"""
+LLM 출력에서 JSON 객체를 점진적으로 추출하는 공용 파서.
+
+- ```json 펜스 / 앞뒤 설명문이 섞인 bare JSON 모두 처리 (첫 '{'부터 해당 객체가 닫힐 때까지)
+- feed()로 토큰 스트림을 넣으면 최상위 필드가 닫히는 즉시 (key, value)를 돌려줌
+- 출력이 잘린 경우 finish()가 마지막으로 완결된 값까지 살려 객체를 복구 (재시도 없이)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_CLOSERS = {"{": "}", "[": "]"}
+_MAX_REPAIR_ATTEMPTS = 64
+
+
+class JSONStreamParser:
+    """첫 번째 최상위 JSON 객체를 점진적으로 파싱."""
+
+    def __init__(self) -> None:
+        self._buf: List[str] = []
+        self._pos = 0  # 원본 스트림 기준 다음에 볼 문자 위치
+        self._started = False
+        self.done = False
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        # 최상위 필드 추적
+        self._expect_key = False
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        # 잘린 출력 복구용: (잘라도 되는 위치, 그 시점의 스택)
+        self._safe_points: List[Tuple[int, Tuple[str, ...]]] = []
+        self.fields: Dict[str, Any] = {}
+        self._result: Optional[Dict[str, Any]] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._buf)
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """chunk를 추가하고, 이번에 새로 닫힌 최상위 필드 목록을 반환."""
+        closed: List[Tuple[str, Any]] = []
+        if self.done or not chunk:
+            return closed
+        for ch in chunk:
+            if self.done:
+                break
+            if not self._started:
+                if ch != "{":
+                    continue
+                self._started = True
+            idx = len(self._buf)
+            self._buf.append(ch)
+            self._step(ch, idx, closed)
+        return closed
+
+    def _mark_safe(self, pos: int) -> None:
+        self._safe_points.append((pos, tuple(self._stack)))
+
+    def _step(self, ch: str, idx: int, closed: List[Tuple[str, Any]]) -> None:
+        depth = len(self._stack)
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if depth == 1 and self._key_start is not None and self._expect_key:
+                    self._key = self._decode(self._key_start, idx + 1)
+                    self._key_start = None
+                    self._expect_key = False
+                else:
+                    self._mark_safe(idx + 1)
+            return
+
+        if ch == '"':
+            self._in_string = True
+            if depth == 1 and self._expect_key:
+                self._key_start = idx
+            return
+        if ch in _CLOSERS:
+            self._stack.append(ch)
+            if depth == 0:
+                self._expect_key = True
+            self._mark_safe(idx + 1)
+            return
+        if ch in "}]":
+            if not self._stack:
+                return
+            if depth == 1:
+                self._close_field(idx, closed)
+            self._stack.pop()
+            self._mark_safe(idx + 1)
+            if not self._stack:
+                self.done = True
+                self._result = self._load(self.text)
+            return
+        if ch == ",":
+            self._mark_safe(idx)
+            if depth == 1:
+                self._close_field(idx, closed)
+                self._expect_key = True
+            return
+        if ch == ":" and depth == 1 and self._key is not None and self._value_start is None:
+            self._value_start = idx + 1
+
+    def _decode(self, start: int, end: int) -> Optional[str]:
+        try:
+            return json.loads("".join(self._buf[start:end]))
+        except ValueError:
+            return None
+
+    def _close_field(self, end: int, closed: List[Tuple[str, Any]]) -> None:
+        key, start = self._key, self._value_start
+        self._key = None
+        self._value_start = None
+        if key is None or start is None:
+            return
+        raw = "".join(self._buf[start:end]).strip()
+        if not raw:
+            return
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return
+        self.fields[key] = value
+        closed.append((key, value))
+
+    @staticmethod
+    def _load(text: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = json.loads(text)
+        except ValueError:
+            return None
+        return value if isinstance(value, dict) else None
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """스트림 종료. 완결된 객체, 또는 잘린 출력에서 복구한 객체를 반환 (없으면 None)."""
+        if self._result is not None or not self._started:
+            return self._result
+        text = self.text
+        # 1) 현재 상태 그대로 닫아보기 (열린 문자열/괄호만 닫음)
+        tail = '"' if self._in_string else ""
+        candidate = text + tail + "".join(_CLOSERS[c] for c in reversed(self._stack))
+        result = self._load(candidate)
+        # 2) 마지막으로 완결된 값 위치까지 잘라서 닫아보기
+        attempts = 0
+        for pos, stack in reversed(self._safe_points):
+            if result is not None or attempts >= _MAX_REPAIR_ATTEMPTS:
+                break
+            attempts += 1
+            result = self._load(text[:pos].rstrip().rstrip(",") + "".join(_CLOSERS[c] for c in reversed(stack)))
+        if result is not None:
+            logger.warning("Recovered truncated JSON output (len=%d)", len(text))
+        self._result = result
+        return result
+
+
+def extract_json(raw: Optional[str]) -> Optional[Dict[str, Any]]:
+    """raw 텍스트에서 첫 JSON 객체 추출 (펜스/bare/잘린 출력 모두 허용). 실패 시 None."""
+    if not raw:
+        return None
+    start = raw.find("```json")
+    parser = JSONStreamParser()
+    parser.feed(raw[start:] if start >= 0 else raw)
+    result = parser.finish()
+    if result is None and start >= 0:
+        # 펜스 앞 본문에 JSON이 있었던 경우
+        parser = JSONStreamParser()
+        parser.feed(raw)
+        result = parser.finish()
+    return result
@@ -1,63 +1,520 @@
+import contextvars
 import logging
-from typing import Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, Literal, Optional, Tuple
 
 from app.core.config import settings
+from app.core.tracing import span
+from app.services.briefing.fake_llm import FAKE_MODEL, call_fake
+from app.services.briefing.llm_metrics import LLMCallRecord, estimate_cost, record_llm_call
+from app.services.briefing.provider_health import provider_health
 
 logger = logging.getLogger(__name__)
 
+LLMLane = Literal["interactive", "batch"]
+LANES = ("interactive", "batch")
 
-def call_llm(system_prompt: str, user_prompt: str) -> Optional[str]:
-    """Call configured LLM provider and return raw text, or None when disabled/unavailable."""
-    provider = settings.BRIEFING_LLM_PROVIDER
+# 현재 실행 흐름의 LLM 우선순위 레인 (스케줄/배치 작업은 "batch"로 설정)
+_current_lane: ContextVar[str] = ContextVar("llm_lane", default="interactive")
+
+
+class LLMQueueTimeout(Exception):
+    """LLM 슬롯 대기 시간이 초과된 경우."""
+
+
+@contextmanager
+def llm_lane(lane: LLMLane) -> Iterator[None]:
+    """with 블록 안의 call_llm 호출을 지정한 레인으로 보낸다."""
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+class LLMDispatcher:
+    """
+    전역 LLM 동시성 제한기.
+    - 전체 동시 호출 수를 max_concurrency로 제한
+    - 레인별 FIFO 대기열, interactive 대기자가 있으면 batch는 슬롯을 받지 못함
+    - batch는 batch_max_concurrency까지만 사용해 interactive 여유 슬롯을 남김
+    - 슬롯은 provider 요청 하나 단위: 헤징 요청과 deadline 이후에도 끝나지 않은 요청도 끝날 때까지 슬롯을 차지한다
+    """
+
+    def __init__(self, max_concurrency: int, batch_max_concurrency: int) -> None:
+        self._max = max(1, max_concurrency)
+        self._batch_max = max(1, min(batch_max_concurrency, self._max))
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._batch_in_flight = 0
+        self._queues: Dict[str, Deque[object]] = {lane: deque() for lane in LANES}
+        self._stats: Dict[str, Dict[str, float]] = {
+            lane: {"acquired": 0, "timeouts": 0, "wait_total": 0.0, "wait_max": 0.0} for lane in LANES
+        }
+
+    def _can_acquire(self, lane: str, ticket: object) -> bool:
+        if self._queues[lane][0] is not ticket:
+            return False
+        return self._has_capacity(lane)
+
+    def _has_capacity(self, lane: str) -> bool:
+        if self._in_flight >= self._max:
+            return False
+        if lane == "batch":
+            if self._queues["interactive"]:
+                return False
+            if self._batch_in_flight >= self._batch_max:
+                return False
+        return True
+
+    def acquire(self, lane: str, timeout: Optional[float] = None) -> float:
+        """슬롯을 얻을 때까지 대기. 대기 시간(초)을 반환. 초과 시 LLMQueueTimeout."""
+        lane = lane if lane in LANES else "interactive"
+        ticket = object()
+        start = time.monotonic()
+        deadline = start + timeout if timeout else None
+        with self._cond:
+            self._queues[lane].append(ticket)
+            try:
+                while not self._can_acquire(lane, ticket):
+                    remaining = deadline - time.monotonic() if deadline else None
+                    if remaining is not None and remaining <= 0:
+                        self._stats[lane]["timeouts"] += 1
+                        raise LLMQueueTimeout(f"LLM queue wait exceeded {timeout}s (lane={lane})")
+                    self._cond.wait(remaining)
+            finally:
+                self._queues[lane].remove(ticket)
+                # 대기열 선두가 바뀌었으므로 다음 대기자를 깨움
+                self._cond.notify_all()
+            self._in_flight += 1
+            if lane == "batch":
+                self._batch_in_flight += 1
+            waited = time.monotonic() - start
+            stats = self._stats[lane]
+            stats["acquired"] += 1
+            stats["wait_total"] += waited
+            stats["wait_max"] = max(stats["wait_max"], waited)
+            return waited
+
+    def try_acquire(self, lane: str) -> bool:
+        """대기 없이 슬롯을 얻으면 True (같은 레인 대기자가 있으면 양보). 헤징 요청용."""
+        lane = lane if lane in LANES else "interactive"
+        with self._cond:
+            if self._queues[lane] or not self._has_capacity(lane):
+                return False
+            self._in_flight += 1
+            if lane == "batch":
+                self._batch_in_flight += 1
+            self._stats[lane]["acquired"] += 1
+            return True
+
+    def release(self, lane: str) -> None:
+        lane = lane if lane in LANES else "interactive"
+        with self._cond:
+            self._in_flight -= 1
+            if lane == "batch":
+                self._batch_in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, lane: Optional[str] = None, timeout: Optional[float] = None) -> Iterator[float]:
+        lane = lane or _current_lane.get()
+        waited = self.acquire(lane, timeout=timeout)
+        try:
+            yield waited
+        finally:
+            self.release(lane)
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 깊이·대기 시간 스냅샷."""
+        with self._cond:
+            lanes: Dict[str, Any] = {}
+            for lane in LANES:
+                s = self._stats[lane]
+                acquired = int(s["acquired"])
+                lanes[lane] = {
+                    "queued": len(self._queues[lane]),
+                    "acquired": acquired,
+                    "timeouts": int(s["timeouts"]),
+                    "avg_wait_ms": round(s["wait_total"] / acquired * 1000.0, 1) if acquired else 0.0,
+                    "max_wait_ms": round(s["wait_max"] * 1000.0, 1),
+                }
+            return {
+                "max_concurrency": self._max,
+                "batch_max_concurrency": self._batch_max,
+                "in_flight": self._in_flight,
+                "batch_in_flight": self._batch_in_flight,
+                "lanes": lanes,
+            }
+
+
+dispatcher = LLMDispatcher(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    batch_max_concurrency=settings.LLM_BATCH_MAX_CONCURRENCY,
+)
+
+
+# provider 호출 전용 스레드 풀 (deadline/헤징을 위해 호출 스레드와 분리).
+# 실행 중인 요청은 모두 dispatcher 슬롯을 갖고 있으므로 동시 실행 수는 LLM_MAX_CONCURRENCY를 넘지 않는다
+_executor = ThreadPoolExecutor(
+    max_workers=settings.LLM_MAX_CONCURRENCY + 2,
+    thread_name_prefix="llm",
+)
+
+
+def get_dispatch_stats() -> Dict[str, Any]:
+    return dispatcher.stats()
+
+
+def get_provider_health() -> Dict[str, Any]:
+    return provider_health.snapshot()
+
+
+@dataclass
+class LLMResponse:
+    """provider 응답 텍스트와 usage."""
+
+    text: Optional[str]
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+def _call_openai(
+    system_prompt: str,
+    user_prompt: str,
+    temperature: Optional[float],
+    timeout: Optional[float] = None,
+) -> Optional[LLMResponse]:
+    if not settings.OPENAI_API_KEY:
+        logger.warning("OPENAI_API_KEY is not set; skipping LLM call.")
+        return None
+    try:
+        from openai import OpenAI
+    except Exception:  # pragma: no cover - import guard
+        logger.exception("OpenAI package not available.")
+        return None
+
+    client = OpenAI(api_key=settings.OPENAI_API_KEY, timeout=timeout, max_retries=0 if timeout else 2)
+    kwargs: Dict[str, Any] = {}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    resp = client.chat.completions.create(
+        model=settings.OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        **kwargs,
+    )
+    usage = getattr(resp, "usage", None)
+    text = getattr(resp.choices[0].message, "content", None) if resp.choices else None
+    return LLMResponse(
+        text=text,
+        model=getattr(resp, "model", None) or settings.OPENAI_MODEL,
+        prompt_tokens=int(getattr(usage, "prompt_tokens", 0) or 0),
+        completion_tokens=int(getattr(usage, "completion_tokens", 0) or 0),
+    )
+
+
+def _call_anthropic(
+    system_prompt: str,
+    user_prompt: str,
+    temperature: Optional[float],
+    timeout: Optional[float] = None,
+) -> Optional[LLMResponse]:
+    if not settings.ANTHROPIC_API_KEY:
+        logger.warning("ANTHROPIC_API_KEY is not set; skipping LLM call.")
+        return None
+    try:
+        import anthropic
+    except Exception:  # pragma: no cover - import guard
+        logger.exception("Anthropic package not available.")
+        return None
+
+    client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY, timeout=timeout, max_retries=0 if timeout else 2)
+    kwargs: Dict[str, Any] = {}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    resp = client.messages.create(
+        model=settings.ANTHROPIC_MODEL,
+        max_tokens=1200,
+        system=system_prompt,
+        messages=[{"role": "user", "content": user_prompt}],
+        **kwargs,
+    )
+    chunks = []
+    for block in getattr(resp, "content", []) or []:
+        text = getattr(block, "text", None)
+        if text:
+            chunks.append(text)
+    usage = getattr(resp, "usage", None)
+    return LLMResponse(
+        text="".join(chunks) if chunks else None,
+        model=getattr(resp, "model", None) or settings.ANTHROPIC_MODEL,
+        prompt_tokens=int(getattr(usage, "input_tokens", 0) or 0),
+        completion_tokens=int(getattr(usage, "output_tokens", 0) or 0),
+    )
+
+
+_PROVIDERS = {
+    "openai": _call_openai,
+    "anthropic": _call_anthropic,
+    "fake": call_fake,
+}
+
+
+def call_llm(
+    system_prompt: str,
+    user_prompt: str,
+    *,
+    agent: str = "unknown",
+    lane: Optional[LLMLane] = None,
+    provider: Optional[str] = None,
+    temperature: Optional[float] = None,
+    timeout: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Call configured LLM provider and return raw text, or None when disabled/unavailable.
+    모든 호출은 전역 dispatcher 슬롯을 거치며, agent 이름으로 토큰·지연·비용이 기록된다.
+    timeout(기본 LLM_CALL_TIMEOUT_SECONDS) 안에 응답이 없으면 None.
+    LLM_HEDGE_ENABLED면 primary가 p95 지연 내에 답하지 않을 때 secondary provider를 함께 호출한다
+    (남는 슬롯이 있을 때만).
+    provider로 고정한 호출도 BRIEFING_LLM_PROVIDER=fake(부하 테스트)면 fake로 보낸다.
+    """
+    if settings.BRIEFING_LLM_PROVIDER == "fake" and provider != "none":
+        provider = "fake"
+    provider = provider or settings.BRIEFING_LLM_PROVIDER
 
     if provider == "none":
         return None
 
-    if provider == "openai":
-        if not settings.OPENAI_API_KEY:
-            logger.warning("OPENAI_API_KEY is not set; skipping LLM call.")
-            return None
+    if provider not in _PROVIDERS:
+        logger.warning("Unknown BRIEFING_LLM_PROVIDER: %s", provider)
+        return None
+
+    lane = lane or _current_lane.get()
+    timeout = timeout if timeout is not None else settings.LLM_CALL_TIMEOUT_SECONDS
+    primary, secondary = _route(provider)
+    with span("llm.call", agent=agent, lane=lane, provider=primary, hedge_provider=secondary) as s:
         try:
-            from openai import OpenAI
-        except Exception:  # pragma: no cover - import guard
-            logger.exception("OpenAI package not available.")
+            # 슬롯은 primary 요청이 끝날 때 반환 (_call_with_deadline이 먼저 돌아와도 유지)
+            waited = dispatcher.acquire(lane, timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS)
+        except LLMQueueTimeout as e:
+            s.set_attribute("queue_timeout", True)
+            logger.warning("%s; skipping LLM call.", e)
             return None
-
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        resp = client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
+        s.set_attribute("queue_wait_ms", round(waited * 1000.0, 1))
+        if waited > 1.0:
+            logger.warning("LLM slot wait: lane=%s waited=%.2fs", lane, waited)
+        text = _call_with_deadline(
+            primary,
+            secondary,
+            agent=agent,
+            lane=lane,
+            waited=waited,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+            timeout=timeout,
         )
-        if not resp.choices:
-            return None
-        return getattr(resp.choices[0].message, "content", None)
+        s.set_attribute("ok", bool(text))
+        return text
 
-    if provider == "anthropic":
-        if not settings.ANTHROPIC_API_KEY:
-            logger.warning("ANTHROPIC_API_KEY is not set; skipping LLM call.")
-            return None
+
+def _hedge_partner(provider: str) -> Optional[str]:
+    partner = settings.LLM_HEDGE_PROVIDER or {"openai": "anthropic", "anthropic": "openai"}.get(provider)
+    if not partner or partner == provider or partner not in _PROVIDERS:
+        return None
+    return partner
+
+
+def _route(provider: str) -> Tuple[str, Optional[str]]:
+    """(primary, secondary). 헤징이 켜져 있고 primary 건강 점수가 낮으면 순서를 바꾼다."""
+    if not settings.LLM_HEDGE_ENABLED:
+        return provider, None
+    partner = _hedge_partner(provider)
+    if partner is None:
+        return provider, None
+    if provider_health.prefer(provider, partner):
+        logger.warning("LLM routing: %s unhealthy (score=%.2f); preferring %s", provider, provider_health.score(provider), partner)
+        return partner, provider
+    return provider, partner
+
+
+def _call_with_deadline(
+    primary: str,
+    secondary: Optional[str],
+    *,
+    agent: str,
+    lane: str,
+    waited: float,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: Optional[float],
+    timeout: float,
+) -> Optional[str]:
+    """
+    primary를 호출하고, 필요하면 hedge_delay 뒤 secondary를 추가 발사해 먼저 성공한 응답을 반환.
+    호출 측이 primary 슬롯을 이미 잡은 상태로 들어오며, 각 요청의 슬롯은 그 요청이 끝날 때 반환된다.
+    반환 시점에 아직 실행 중인 요청은 abandoned로 표시해 결과·건강 기록을 버린다.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    hedge_at = start + provider_health.hedge_delay(primary) if secondary else None
+    abandoned = threading.Event()
+
+    def submit(name: str) -> Future:
+        # executor 스레드에서도 lane/수집기 contextvar가 유지되도록 컨텍스트 복사
+        ctx = contextvars.copy_context()
         try:
-            import anthropic
-        except Exception:  # pragma: no cover - import guard
-            logger.exception("Anthropic package not available.")
-            return None
+            fut = _executor.submit(
+                ctx.run, _attempt, name, agent, lane, waited, system_prompt, user_prompt, temperature, timeout, abandoned
+            )
+        except BaseException:
+            dispatcher.release(lane)
+            raise
+        fut.add_done_callback(lambda _f: dispatcher.release(lane))
+        return fut
 
-        client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-        resp = client.messages.create(
-            model=settings.ANTHROPIC_MODEL,
-            max_tokens=1200,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_prompt}],
-        )
-        chunks = []
-        for block in getattr(resp, "content", []) or []:
-            text = getattr(block, "text", None)
+    pending: Dict[Future, str] = {submit(primary): primary}
+    try:
+        return _await_attempts(pending, submit, primary, secondary, agent, deadline, hedge_at, timeout, lane)
+    finally:
+        abandoned.set()
+
+
+def _await_attempts(
+    pending: Dict[Future, str],
+    submit: Any,
+    primary: str,
+    secondary: Optional[str],
+    agent: str,
+    deadline: float,
+    hedge_at: Optional[float],
+    timeout: float,
+    lane: str,
+) -> Optional[str]:
+    hedged = False
+    last_error: Optional[BaseException] = None
+    while True:
+        now = time.monotonic()
+        if now >= deadline:
+            for name in pending.values():
+                provider_health.record_timeout(name)
+            logger.warning("LLM call timed out: agent=%s providers=%s timeout=%.1fs", agent, list(pending.values()), timeout)
+            return None
+        wake_at = deadline if hedged or hedge_at is None else min(deadline, hedge_at)
+        done, _ = wait(list(pending), timeout=max(wake_at - now, 0), return_when=FIRST_COMPLETED)
+        for fut in done:
+            pending.pop(fut)
+            try:
+                text = fut.result()
+            except Exception as e:
+                last_error = e
+                logger.warning("LLM provider failed: agent=%s err=%s", agent, e)
+                continue
             if text:
-                chunks.append(text)
-        return "".join(chunks) if chunks else None
+                return text
+        should_hedge = secondary and not hedged and (time.monotonic() >= hedge_at or not pending)
+        if should_hedge:
+            hedged = True
+            # 헤징 요청도 슬롯 하나를 차지한다. primary가 실행 중인데 남는 슬롯이 없으면 헤징하지 않고,
+            # primary가 이미 실패했으면(failover) deadline까지 슬롯을 기다린다
+            if _acquire_for_secondary(lane, waiting=bool(pending), deadline=deadline):
+                logger.info("LLM hedge: agent=%s primary=%s secondary=%s", agent, primary, secondary)
+                pending[submit(secondary)] = secondary
+            else:
+                logger.info("LLM hedge skipped (no free slot): agent=%s primary=%s", agent, primary)
+        if not pending:
+            if last_error is not None:
+                raise last_error
+            return None
 
-    logger.warning("Unknown BRIEFING_LLM_PROVIDER: %s", provider)
-    return None
+
+def _acquire_for_secondary(lane: str, waiting: bool, deadline: float) -> bool:
+    if waiting:
+        return dispatcher.try_acquire(lane)
+    try:
+        dispatcher.acquire(lane, timeout=max(deadline - time.monotonic(), 0.001))
+    except LLMQueueTimeout:
+        return False
+    return True
+
+
+def _attempt(
+    provider: str,
+    agent: str,
+    lane: str,
+    waited: float,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: Optional[float],
+    timeout: float,
+    abandoned: Optional[threading.Event] = None,
+) -> Optional[str]:
+    start = time.monotonic()
+    try:
+        text = _timed_call(_PROVIDERS[provider], provider, agent, lane, waited, system_prompt, user_prompt, temperature, timeout)
+    except Exception:
+        if not (abandoned and abandoned.is_set()):
+            provider_health.record(provider, False, time.monotonic() - start)
+        raise
+    # 호출 측이 이미 포기한 요청(deadline 초과 → record_timeout, 또는 헤징 경쟁에서 짐)은 건강 점수에 다시 반영하지 않음
+    if not (abandoned and abandoned.is_set()):
+        provider_health.record(provider, bool(text), time.monotonic() - start)
+    return text
+
+
+def _default_model(provider: str) -> str:
+    return {
+        "openai": settings.OPENAI_MODEL,
+        "anthropic": settings.ANTHROPIC_MODEL,
+        "fake": FAKE_MODEL,
+    }.get(provider, provider)
+
+
+def _timed_call(
+    call: Any,
+    provider: str,
+    agent: str,
+    lane: str,
+    waited: float,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: Optional[float],
+    timeout: float,
+) -> Optional[str]:
+    """provider 호출을 계측해 record_llm_call로 남기고 텍스트만 반환."""
+    start = time.monotonic()
+    rec = LLMCallRecord(agent=agent, provider=provider, model=_default_model(provider), lane=lane)
+    rec.queue_wait_ms = waited * 1000.0
+    resp: Optional[LLMResponse] = None
+    with span("llm.provider", provider=provider, agent=agent, lane=lane) as s:
+        try:
+            resp = call(system_prompt, user_prompt, temperature, timeout)
+        except Exception:
+            rec.success = False
+            raise
+        finally:
+            rec.latency_ms = (time.monotonic() - start) * 1000.0
+            if resp is not None:
+                rec.model = resp.model
+                rec.prompt_tokens = resp.prompt_tokens
+                rec.completion_tokens = resp.completion_tokens
+                rec.cost_usd = estimate_cost(resp.model, resp.prompt_tokens, resp.completion_tokens)
+                s.set_attributes(
+                    model=resp.model,
+                    prompt_tokens=resp.prompt_tokens,
+                    completion_tokens=resp.completion_tokens,
+                    prompt_chars=len(system_prompt) + len(user_prompt),
+                )
+            if resp is not None or not rec.success:
+                record_llm_call(rec)
+    return resp.text if resp is not None else None
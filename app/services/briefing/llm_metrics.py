@@ -0,0 +1,180 @@
+"""LLM 호출 계측: agent/model별 토큰·지연·비용 집계 및 (옵션) DB 기록."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# USD / 1M tokens (input, output). 목록에 없는 모델은 비용 0으로 집계.
+MODEL_PRICING_PER_1M: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "claude-3-5-haiku-20241022": (0.80, 4.00),
+    "claude-3-5-sonnet-20241022": (3.00, 15.00),
+}
+
+_LATENCY_SAMPLES = 500
+
+
+@dataclass
+class LLMCallRecord:
+    """LLM 호출 1건의 계측 결과."""
+
+    agent: str
+    provider: str
+    model: str
+    lane: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    queue_wait_ms: float = 0.0
+    cost_usd: float = 0.0
+    success: bool = True
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    price_in, price_out = MODEL_PRICING_PER_1M.get(model, (0.0, 0.0))
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+class LLMMetrics:
+    """프로세스 내 (agent, model)별 누적 집계."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def record(self, rec: LLMCallRecord) -> None:
+        key = (rec.agent, rec.model)
+        with self._lock:
+            b = self._buckets.get(key)
+            if b is None:
+                b = {
+                    "calls": 0,
+                    "errors": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cost_usd": 0.0,
+                    "latency_total_ms": 0.0,
+                    "latencies": deque(maxlen=_LATENCY_SAMPLES),
+                }
+                self._buckets[key] = b
+            b["calls"] += 1
+            if not rec.success:
+                b["errors"] += 1
+            b["prompt_tokens"] += rec.prompt_tokens
+            b["completion_tokens"] += rec.completion_tokens
+            b["cost_usd"] += rec.cost_usd
+            b["latency_total_ms"] += rec.latency_ms
+            b["latencies"].append(rec.latency_ms)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            out = []
+            for (agent, model), b in sorted(self._buckets.items()):
+                samples: List[float] = list(b["latencies"])
+                out.append({
+                    "agent": agent,
+                    "model": model,
+                    "calls": b["calls"],
+                    "errors": b["errors"],
+                    "prompt_tokens": b["prompt_tokens"],
+                    "completion_tokens": b["completion_tokens"],
+                    "cost_usd": round(b["cost_usd"], 6),
+                    "avg_latency_ms": round(b["latency_total_ms"] / b["calls"], 1) if b["calls"] else 0.0,
+                    "p50_latency_ms": round(_percentile(samples, 50), 1),
+                    "p95_latency_ms": round(_percentile(samples, 95), 1),
+                })
+            return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+metrics = LLMMetrics()
+
+# 현재 요청(브리핑 생성 등)에서 발생한 호출을 모으는 수집기
+_collector: ContextVar[Optional[List[LLMCallRecord]]] = ContextVar("llm_call_collector", default=None)
+
+
+@contextmanager
+def llm_call_collector() -> Iterator[List[LLMCallRecord]]:
+    """with 블록 안에서 발생한 LLM 호출 기록을 리스트로 수집."""
+    records: List[LLMCallRecord] = []
+    token = _collector.set(records)
+    try:
+        yield records
+    finally:
+        _collector.reset(token)
+
+
+def record_llm_call(rec: LLMCallRecord) -> None:
+    metrics.record(rec)
+    records = _collector.get()
+    if records is not None:
+        records.append(rec)
+    logger.info(
+        "LLM call: agent=%s model=%s tokens=%d/%d latency=%.0fms cost=$%.6f ok=%s",
+        rec.agent,
+        rec.model,
+        rec.prompt_tokens,
+        rec.completion_tokens,
+        rec.latency_ms,
+        rec.cost_usd,
+        rec.success,
+    )
+
+
+def get_llm_metrics() -> List[Dict[str, Any]]:
+    return metrics.snapshot()
+
+
+def persist_llm_calls(
+    db: Session,
+    records: List[LLMCallRecord],
+    user_id: Optional[int] = None,
+    village_id: Optional[int] = None,
+    briefing_id: Optional[int] = None,
+) -> None:
+    """LLM_CALL_LOG_ENABLED일 때 수집된 호출을 llm_call_logs에 저장. 실패해도 예외를 올리지 않음."""
+    if not settings.LLM_CALL_LOG_ENABLED or not records:
+        return
+    from app.domain.briefing.model import LLMCallLog
+
+    try:
+        db.add_all([
+            LLMCallLog(
+                user_id=user_id,
+                village_id=village_id,
+                briefing_id=briefing_id,
+                **{k: v for k, v in asdict(rec).items() if k not in {"lane", "created_at"}},
+            )
+            for rec in records
+        ])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning("Failed to persist LLM call logs: %s", e)
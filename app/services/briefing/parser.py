@@ -1,10 +1,11 @@
 """LLM 출력에서 [Voice Script]와 [Visual Summary] JSON 추출."""
 
-import json
 import logging
 import re
 from typing import Any, Dict, Tuple
 
+from app.services.briefing.json_stream import extract_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,12 +32,13 @@ def _extract_voice_script(raw: str) -> str:
 
 
 def _extract_visual_summary(raw: str) -> Dict[str, Any]:
-    m = re.search(r"\*{0,2}\[Visual Summary\]\*{0,2}\s*(?:```json)?\s*(\{.+?\})\s*(?:```)?\s*$", raw, re.DOTALL | re.IGNORECASE)
+    m = re.search(r"\*{0,2}\[Visual Summary\]\*{0,2}", raw or "", re.IGNORECASE)
     if m:
-        try:
-            return json.loads(m.group(1).strip())
-        except json.JSONDecodeError:
-            logger.warning("Failed to parse [Visual Summary] JSON. raw=%s", raw)
+        # 섹션 이후 첫 JSON 객체 (펜스 유무·잘린 출력 모두 허용)
+        parsed = extract_json(raw[m.end():])
+        if parsed is not None:
+            return parsed
+        logger.warning("Failed to parse [Visual Summary] JSON. raw=%s", raw)
     if raw:
         logger.warning("No [Visual Summary] section found. raw=%s", raw)
     return {
@@ -0,0 +1,166 @@
+"""
+DB(prompts / village_prompts) 기반 시스템 프롬프트 레지스트리.
+
+- 활성 프롬프트를 프로세스 메모리에 캐시하고, PROMPT_CACHE_TTL_SECONDS마다
+  가벼운 버전 쿼리로만 변경 여부를 확인한다. 버전의 기준은 prompt_registry_version 카운터로,
+  모든 쓰기(bump_version)가 같은 트랜잭션에서 올린다 (내용·sort_order·재연결처럼 건수가 그대로인 변경 포함).
+  COUNT/MAX(updated_at)도 함께 비교해 API를 거치지 않은 추가·삭제도 잡는다.
+- 마을별 오버라이드: village_prompts에 연결된 프롬프트 중 key가 "<기본 key>:<접미사>"인 것을
+  sort_order 순으로 기본 프롬프트 뒤에 덧붙인다. resolve_villages()로 배치 단위 1회 조회.
+- DB에 key가 없거나 DB를 쓸 수 없으면 코드의 기본 상수를 그대로 사용.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STOCK_PROMPT_KEY = "briefing.stock"
+NEWS_PROMPT_KEY = "briefing.news"
+NEWS_RELEVANCE_PROMPT_KEY = "briefing.news_relevance"
+ORCHESTRATOR_PROMPT_KEY = "briefing.orchestrator"
+TICKER_FRAGMENT_PROMPT_KEY = "briefing.ticker_fragment"
+
+
+def _base_key(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+def bump_version(db) -> None:
+    """레지스트리 버전 +1 (커밋은 호출자 트랜잭션에서). 행이 없으면 만든다."""
+    from app.domain.prompt.model import PromptRegistryVersion
+
+    res = db.execute(
+        update(PromptRegistryVersion)
+        .where(PromptRegistryVersion.id == 1)
+        .values(version=PromptRegistryVersion.version + 1)
+    )
+    if not res.rowcount:
+        db.add(PromptRegistryVersion(id=1, version=1))
+
+
+@dataclass
+class VillagePrompts:
+    """한 마을의 프롬프트 오버라이드 (기본 key → 덧붙일 지침 목록)."""
+
+    village_id: int
+    overrides: Dict[str, List[str]] = field(default_factory=dict)
+
+    def system(self, key: str, default: str) -> str:
+        base = prompt_registry.get(key, default)
+        extra = self.overrides.get(key)
+        if not extra:
+            return base
+        return base.rstrip() + "\n\n## 마을 추가 지침\n" + "\n\n".join(extra)
+
+
+class PromptRegistry:
+    def __init__(self, ttl_seconds: float) -> None:
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._prompts: Dict[str, str] = {}
+        self._villages: Dict[int, VillagePrompts] = {}
+
+    @property
+    def version(self) -> Optional[int]:
+        """마지막으로 적재한 버전 카운터 (prompt_registry_version.version). 적재 전이면 None."""
+        return self._version[0] if self._version is not None else None
+
+    def _read_version(self, db) -> Tuple:
+        from app.domain.prompt.model import Prompt, PromptRegistryVersion, VillagePrompt
+
+        counter = db.execute(select(PromptRegistryVersion.version).where(PromptRegistryVersion.id == 1)).scalar()
+        p = db.execute(select(func.count(), func.max(Prompt.updated_at))).one()
+        vp = db.execute(
+            select(func.count(), func.sum(VillagePrompt.is_enabled), func.max(VillagePrompt.created_at))
+        ).one()
+        return (int(counter or 0), p[0], str(p[1]), vp[0], int(vp[1] or 0), str(vp[2]))
+
+    def _load(self, db) -> None:
+        from app.domain.prompt.model import Prompt
+
+        rows = db.execute(
+            select(Prompt.prompt_key, Prompt.content).where(Prompt.is_active.is_(True))
+        ).all()
+        self._prompts = {key: content for key, content in rows}
+        self._villages = {}
+
+    def refresh(self, force: bool = False) -> None:
+        """TTL이 지났으면 버전을 확인하고, 바뀌었으면 전체 재적재."""
+        if not settings.DB_ENABLED:
+            return
+        now = time.monotonic()
+        if not force and now - self._checked_at < self._ttl:
+            return
+        with self._lock:
+            if not force and now - self._checked_at < self._ttl:
+                return
+            self._checked_at = now
+            from app.core.database import SessionLocal
+
+            db = SessionLocal()
+            try:
+                version = self._read_version(db)
+                if force or version != self._version:
+                    self._load(db)
+                    logger.info("Prompt registry reloaded: version=%s prompts=%d", version, len(self._prompts))
+                    self._version = version
+            except Exception as e:
+                logger.warning("Prompt registry refresh failed; keeping cached prompts: %s", e)
+            finally:
+                db.close()
+
+    def get(self, key: str, default: str) -> str:
+        self.refresh()
+        return self._prompts.get(key) or default
+
+    def resolve_villages(self, village_ids: Iterable[int]) -> Dict[int, VillagePrompts]:
+        """마을별 오버라이드를 한 번의 쿼리로 조회해 캐시 (배치 시작 시 호출)."""
+        self.refresh()
+        ids = {int(v) for v in village_ids}
+        missing = [v for v in ids if v not in self._villages]
+        if missing and settings.DB_ENABLED:
+            from app.core.database import SessionLocal
+            from app.domain.prompt.model import Prompt, VillagePrompt
+
+            db = SessionLocal()
+            try:
+                rows = db.execute(
+                    select(VillagePrompt.village_id, Prompt.prompt_key, Prompt.content)
+                    .join(Prompt, Prompt.prompt_id == VillagePrompt.prompt_id)
+                    .where(
+                        VillagePrompt.village_id.in_(missing),
+                        VillagePrompt.is_enabled.is_(True),
+                        Prompt.is_active.is_(True),
+                    )
+                    .order_by(VillagePrompt.village_id, VillagePrompt.sort_order)
+                ).all()
+                resolved = {v: VillagePrompts(village_id=v) for v in missing}
+                for village_id, key, content in rows:
+                    if ":" not in key:
+                        continue
+                    resolved[village_id].overrides.setdefault(_base_key(key), []).append(content)
+                with self._lock:
+                    self._villages.update(resolved)
+            except Exception as e:
+                logger.warning("Village prompt resolve failed; using base prompts: %s", e)
+            finally:
+                db.close()
+        return {v: self._villages.get(v) or VillagePrompts(village_id=v) for v in ids}
+
+    def for_village(self, village_id: int) -> VillagePrompts:
+        return self.resolve_villages([village_id])[int(village_id)]
+
+
+prompt_registry = PromptRegistry(ttl_seconds=settings.PROMPT_CACHE_TTL_SECONDS)
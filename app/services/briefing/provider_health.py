@@ -0,0 +1,108 @@
+"""LLM provider 상태 추적: 성공률(EWMA)·지연 분포로 헤징 지연과 라우팅을 결정."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from app.core.config import settings
+
+_ALPHA = 0.2
+_SAMPLES = 200
+_MIN_SAMPLES_FOR_P95 = 20
+# 호출이 없는 동안 점수가 1.0 쪽으로 회복되는 반감기 (밀려난 provider도 다시 primary가 될 수 있게)
+_RECOVERY_HALF_LIFE_S = 60.0
+
+
+class _ProviderState:
+    def __init__(self) -> None:
+        self.success_ewma = 1.0
+        self.updated_at = time.monotonic()
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.latencies: Deque[float] = deque(maxlen=_SAMPLES)
+
+
+class ProviderHealth:
+    """provider별 건강 점수(0~1). 점수가 낮은 provider는 헤징 상대에게 우선순위를 넘긴다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._states: Dict[str, _ProviderState] = {}
+
+    @staticmethod
+    def _effective(state: _ProviderState) -> float:
+        elapsed = time.monotonic() - state.updated_at
+        return 1.0 - (1.0 - state.success_ewma) * 0.5 ** (elapsed / _RECOVERY_HALF_LIFE_S)
+
+    def _update(self, state: _ProviderState, outcome: float) -> None:
+        state.success_ewma = (1 - _ALPHA) * self._effective(state) + _ALPHA * outcome
+        state.updated_at = time.monotonic()
+
+    def _state(self, provider: str) -> _ProviderState:
+        state = self._states.get(provider)
+        if state is None:
+            state = _ProviderState()
+            self._states[provider] = state
+        return state
+
+    def record(self, provider: str, success: bool, latency_s: float) -> None:
+        with self._lock:
+            state = self._state(provider)
+            state.calls += 1
+            if not success:
+                state.failures += 1
+            self._update(state, 1.0 if success else 0.0)
+            if success:
+                state.latencies.append(latency_s)
+
+    def record_timeout(self, provider: str) -> None:
+        with self._lock:
+            state = self._state(provider)
+            state.timeouts += 1
+            self._update(state, 0.0)
+
+    def score(self, provider: str) -> float:
+        with self._lock:
+            return self._effective(self._state(provider))
+
+    def p95_latency(self, provider: str) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._state(provider).latencies)
+        if len(samples) < _MIN_SAMPLES_FOR_P95:
+            return None
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    def hedge_delay(self, provider: str) -> float:
+        """primary p95 지연(표본 부족 시 LLM_HEDGE_DELAY_SECONDS) 이후 secondary를 발사."""
+        p95 = self.p95_latency(provider)
+        return p95 if p95 is not None else settings.LLM_HEDGE_DELAY_SECONDS
+
+    def prefer(self, primary: str, secondary: str) -> bool:
+        """secondary를 primary 대신 먼저 호출해야 하면 True."""
+        primary_score = self.score(primary)
+        return (
+            primary_score < settings.LLM_HEALTH_FAILOVER_THRESHOLD
+            and self.score(secondary) > primary_score
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = {}
+            for provider, state in sorted(self._states.items()):
+                samples = sorted(state.latencies)
+                p95 = samples[int(0.95 * (len(samples) - 1))] if samples else None
+                out[provider] = {
+                    "score": round(self._effective(state), 3),
+                    "calls": state.calls,
+                    "failures": state.failures,
+                    "timeouts": state.timeouts,
+                    "p95_latency_ms": round(p95 * 1000.0, 1) if p95 is not None else None,
+                }
+            return out
+
+
+provider_health = ProviderHealth()
@@ -1,14 +1,23 @@
 """
 스케줄용 브리핑: yfinance 뉴스 수집 → OpenAI(gpt-4o-mini)로 '오늘의 투자 포인트' 한국어 요약 → 저장.
-APScheduler에서 9시/17시에 호출.
+APScheduler에서 9시/17시에 호출. 결과는 briefing_store(scheduled_summaries)에 (user, 슬롯)별로 저장.
 """
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
-from app.core.briefing_store import set_latest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.briefing_store import GLOBAL_USER_ID, briefing_store
 from app.core.config import settings
+from app.core.database import SessionLocal
+from app.domain.asset.model import Asset
+from app.domain.portfolio.model import UserPortfolio
+from app.services.briefing.llm import call_llm, llm_lane
+from app.services.market_data import MarketSnapshot, prefetch_market_snapshot
 from app.utils.fixtures import FixtureInvalid, FixtureNotFound, load_fixture
 
 logger = logging.getLogger(__name__)
@@ -42,61 +51,113 @@ def _summarize_news_with_openai(news_titles: List[str]) -> Optional[str]:
     """뉴스 제목 리스트를 OpenAI gpt-4o-mini로 한국어 요약. 실패 시 None."""
     if not news_titles:
         return None
-    if not getattr(settings, "OPENAI_API_KEY", None) or not settings.OPENAI_API_KEY:
-        logger.warning("OPENAI_API_KEY not set; skipping AI summary.")
-        return None
     try:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
         user_content = "다음 뉴스 제목들을 '오늘의 투자 포인트'로 요약해 주세요.\n\n" + "\n".join(
             f"- {t}" for t in news_titles[:50]
         )
-        resp = client.chat.completions.create(
-            model=getattr(settings, "OPENAI_MODEL", "gpt-4o-mini") or "gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT_KO},
-                {"role": "user", "content": user_content},
-            ],
+        raw = call_llm(
+            SYSTEM_PROMPT_KO,
+            user_content,
+            agent="scheduled_summary",
+            lane="batch",
+            provider=settings.SCHEDULED_SUMMARY_LLM_PROVIDER,
             temperature=0.3,
         )
-        if resp.choices and resp.choices[0].message.content:
-            return resp.choices[0].message.content.strip()
+        if raw and raw.strip():
+            return raw.strip()
     except Exception as e:
         logger.exception("OpenAI summary failed: %s", e)
     return None
 
 
-def _run_scheduled_briefing_sync() -> None:
-    """동기: 뉴스 수집 → OpenAI 요약 → 저장. 스케줄러 스레드에서 호출."""
-    from app.services.market_data import _get_market_context_sync
+NO_NEWS_SUMMARY = "오늘 수집된 보유 종목 관련 뉴스가 없습니다. 시장 상황을 직접 확인해 보시기 바랍니다."
+FAILED_SUMMARY = "오늘의 뉴스 요약 생성에 실패했습니다. 잠시 후 다시 시도해 주세요."
+SCHEDULED_NEWS_PER_TICKER = 5
+
+
+def current_time_slot() -> str:
+    """BRIEFING_SCHEDULE_TIMEZONE 기준 오전이면 morning, 오후면 evening."""
+    return "morning" if datetime.now(ZoneInfo(settings.BRIEFING_SCHEDULE_TIMEZONE)).hour < 12 else "evening"
 
-    tickers = _get_tickers_from_fixture()
-    if not tickers:
-        logger.warning("No tickers; skipping scheduled briefing.")
-        return
 
-    ctx = _get_market_context_sync(tickers, news_per_ticker=5)
+def _get_user_tickers(db: Session) -> Dict[int, List[str]]:
+    """보유 수량이 있는 사용자별 종목 목록."""
+    rows = db.execute(
+        select(UserPortfolio.user_id, Asset.symbol)
+        .join(Asset, Asset.asset_id == UserPortfolio.asset_id)
+        .where(UserPortfolio.quantity > 0, Asset.symbol.isnot(None))
+        .order_by(UserPortfolio.user_id, Asset.symbol)
+    ).all()
+    out: Dict[int, List[str]] = {}
+    for user_id, symbol in rows:
+        out.setdefault(int(user_id), []).append(symbol)
+    return out
+
+
+def _summarize(market: MarketSnapshot, tickers: List[str]) -> Tuple[str, int]:
+    """종목 묶음의 뉴스 제목 → 요약. (요약, 뉴스 수)"""
+    ctx = market.context_for(tickers)
     news_titles = [item.get("title") or item.get("summary") or "" for item in ctx.news_items if item.get("title") or item.get("summary")]
     if not news_titles:
-        summary = "오늘 수집된 보유 종목 관련 뉴스가 없습니다. 시장 상황을 직접 확인해 보시기 바랍니다."
-        set_latest(summary=summary, news_count=0, tickers=tickers, generated_at=datetime.utcnow())
-        logger.info("Scheduled briefing saved (no news).")
-        return
+        return NO_NEWS_SUMMARY, 0
+    return _summarize_news_with_openai(news_titles) or FAILED_SUMMARY, len(news_titles)
 
-    summary = _summarize_news_with_openai(news_titles)
-    if not summary:
-        summary = "오늘의 뉴스 요약 생성에 실패했습니다. 잠시 후 다시 시도해 주세요."
-    set_latest(summary=summary, news_count=len(news_titles), tickers=tickers, generated_at=datetime.utcnow())
-    logger.info("Scheduled briefing saved. news_count=%d", len(news_titles))
 
+def _run_scheduled_briefing_sync(time_slot: str) -> None:
+    """
+    동기: 뉴스 수집 → OpenAI 요약 → 저장. 스케줄러 스레드에서 호출.
+    전체 공용 요약(fixture 종목) + 사용자별 요약. 보유 종목 구성이 같은 사용자끼리는 요약을 한 번만 만든다.
+    """
+    trade_date = datetime.now(ZoneInfo(settings.BRIEFING_SCHEDULE_TIMEZONE)).date().isoformat()
+    global_tickers = _get_tickers_from_fixture()
+    user_tickers: Dict[int, List[str]] = {}
+    if settings.DB_ENABLED:
+        db = SessionLocal()
+        try:
+            user_tickers = _get_user_tickers(db)
+        finally:
+            db.close()
+    if not global_tickers and not user_tickers:
+        logger.warning("No tickers; skipping scheduled briefing.")
+        return
 
-def run_scheduled_briefing() -> None:
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    if global_tickers:
+        groups[tuple(global_tickers)] = [GLOBAL_USER_ID]
+    for user_id, tickers in user_tickers.items():
+        groups.setdefault(tuple(tickers), []).append(user_id)
+
+    all_tickers = list(dict.fromkeys(t for key in groups for t in key))
+    market = prefetch_market_snapshot(all_tickers, news_per_ticker=SCHEDULED_NEWS_PER_TICKER)
+    for tickers_key, user_ids in groups.items():
+        tickers = list(tickers_key)
+        summary, news_count = _summarize(market, tickers)
+        generated_at = datetime.utcnow()
+        for user_id in user_ids:
+            briefing_store.set(
+                summary,
+                news_count=news_count,
+                tickers=tickers,
+                generated_at=generated_at,
+                user_id=user_id,
+                time_slot=time_slot,
+                trade_date=trade_date,
+            )
+    logger.info(
+        "Scheduled briefing saved. slot=%s users=%d summaries=%d",
+        time_slot,
+        len(user_tickers),
+        len(groups),
+    )
+
+
+def run_scheduled_briefing(time_slot: Optional[str] = None) -> None:
     """
     스케줄 job 엔트리: 뉴스 수집 및 AI 요약 후 저장.
     APScheduler에서 9시/17시에 호출. 블로킹이므로 스레드에서 실행됨.
     """
     try:
-        _run_scheduled_briefing_sync()
+        with llm_lane("batch"):
+            _run_scheduled_briefing_sync(time_slot or current_time_slot())
     except Exception as e:
         logger.exception("Scheduled briefing failed: %s", e)
@@ -0,0 +1,68 @@
+"""
+/briefing/latest용 직렬화 완료 스냅샷 캐시.
+
+(user_id, village_id) → 응답 JSON bytes. 새 스냅샷을 저장할 때 갱신되므로 조회는 dict lookup + 전송만 남는다.
+다른 프로세스가 쓴 스냅샷은 TTL(LATEST_BRIEFING_CACHE_TTL_SECONDS)이 지나면 DB에서 다시 읽는다.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+_Key = Tuple[int, int]
+
+
+class LatestSnapshotCache:
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[_Key, Tuple[float, bytes]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, user_id: int, village_id: int) -> Optional[bytes]:
+        key = (int(user_id), int(village_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self._ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, user_id: int, village_id: int, body: bytes) -> None:
+        if self._ttl <= 0:
+            return
+        key = (int(user_id), int(village_id))
+        with self._lock:
+            self._entries[key] = (time.monotonic(), body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int, village_id: int) -> None:
+        with self._lock:
+            self._entries.pop((int(user_id), int(village_id)), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+
+latest_snapshot_cache = LatestSnapshotCache(
+    ttl_seconds=settings.LATEST_BRIEFING_CACHE_TTL_SECONDS,
+    max_entries=settings.LATEST_BRIEFING_CACHE_MAX_ENTRIES,
+)
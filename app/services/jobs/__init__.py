@@ -0,0 +1,17 @@
+from app.services.jobs.queue import (
+    JOB_KIND_BRIEFING,
+    JOB_KIND_REBALANCING,
+    JOB_KIND_VILLAGE_ONE_LINER,
+    count_active,
+    enqueue,
+    get_job,
+)
+
+__all__ = [
+    "JOB_KIND_BRIEFING",
+    "JOB_KIND_REBALANCING",
+    "JOB_KIND_VILLAGE_ONE_LINER",
+    "count_active",
+    "enqueue",
+    "get_job",
+]
@@ -0,0 +1,69 @@
+"""작업 kind별 실행 함수. handler(db, payload) -> 결과 dict(또는 None)."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.services.jobs.queue import JOB_KIND_BRIEFING, JOB_KIND_REBALANCING, JOB_KIND_VILLAGE_ONE_LINER
+
+JobHandler = Callable[[Session, Dict[str, Any]], Optional[Dict[str, Any]]]
+
+HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def register(fn: JobHandler) -> JobHandler:
+        HANDLERS[kind] = fn
+        return fn
+
+    return register
+
+
+@job_handler(JOB_KIND_BRIEFING)
+def run_briefing_job(db: Session, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    from app.domain.briefing.schema.request import BriefingGenerateRequest
+    from app.services.briefing import generate_briefing
+    from app.services.briefing.idempotency import find_snapshot_id
+    from app.services.briefing.llm import llm_lane
+
+    req = BriefingGenerateRequest(
+        user_id=payload["user_id"],
+        village_id=payload["village_id"],
+        time_slot=payload.get("time_slot") or "morning",
+    )
+    key = payload.get("idempotency_key")
+    # 재시도(워커 유실 등)인데 이미 스냅샷이 저장됐으면 다시 만들지 않음
+    snapshot_id = find_snapshot_id(db, req.user_id, key) if key else None
+    if snapshot_id is None:
+        with llm_lane(payload.get("lane") or "batch"):
+            asyncio.run(generate_briefing(req, db=db, idempotency_key=key))
+        snapshot_id = find_snapshot_id(db, req.user_id, key, windowed=False) if key else None
+    return {
+        "user_id": req.user_id,
+        "village_id": req.village_id,
+        "time_slot": req.time_slot,
+        "snapshot_id": snapshot_id,
+    }
+
+
+@job_handler(JOB_KIND_REBALANCING)
+def run_rebalancing_job(db: Session, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    from app.services.briefing.llm import llm_lane
+    from app.services.portfolio.rebalancing import refresh_rebalancing_snapshot
+
+    with llm_lane("batch"):
+        recos = refresh_rebalancing_snapshot(db, int(payload["user_id"]))
+    return {"user_id": int(payload["user_id"]), "recommendations": len(recos)}
+
+
+@job_handler(JOB_KIND_VILLAGE_ONE_LINER)
+def run_village_one_liner_job(_db: Session, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    from app.services.briefing.llm import llm_lane
+    from app.services.village.ai import generate_village_one_liner
+
+    with llm_lane("batch"):
+        generate_village_one_liner(int(payload["village_id"]))
+    return {"village_id": int(payload["village_id"])}
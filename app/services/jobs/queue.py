@@ -0,0 +1,217 @@
+"""
+jobs 테이블 기반 작업 큐.
+
+- enqueue: dedup_key가 같은 활성(queued/running) 작업이 있으면 새로 만들지 않고 그 작업을 반환
+- claim: SELECT ... FOR UPDATE SKIP LOCKED로 여러 워커 프로세스가 겹치지 않게 가져감.
+  kind별 동시 실행 상한(JOB_KIND_CONCURRENCY)은 claim 시점의 running 수로 판단 (경합 시 근사치)
+- fail: max_attempts까지 지수 백오프(+지터)로 재시도, 이후 failed
+- requeue_stale: 워커가 죽어 lock이 만료된 running 작업을 다시 queued로
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.domain.job.model import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND_BRIEFING = "briefing.generate"
+JOB_KIND_REBALANCING = "rebalancing.snapshot"
+JOB_KIND_VILLAGE_ONE_LINER = "village.one_liner"
+
+ACTIVE_STATUSES = ("queued", "running")
+_MAX_ERROR_LENGTH = 4000
+
+
+def _now() -> datetime:
+    """TIMESTAMP 컬럼과 비교할 UTC naive 시각 (DB 세션 time_zone = UTC)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def get_job(db: Session, job_id: int) -> Optional[Job]:
+    return db.get(Job, job_id)
+
+
+def find_active(db: Session, dedup_key: str) -> Optional[Job]:
+    return db.execute(select(Job).where(Job.active_dedup_key == dedup_key)).scalars().first()
+
+
+def count_active(db: Session, kind: str) -> int:
+    """kind의 queued + running 작업 수."""
+    return int(
+        db.execute(select(func.count()).select_from(Job).where(Job.kind == kind, Job.status.in_(ACTIVE_STATUSES))).scalar()
+        or 0
+    )
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: Dict[str, Any],
+    *,
+    dedup_key: Optional[str] = None,
+    priority: int = 0,
+    max_attempts: Optional[int] = None,
+    delay_seconds: float = 0.0,
+) -> Job:
+    """작업 등록. 같은 dedup_key의 활성 작업이 있으면 그 작업을 그대로 반환."""
+    if dedup_key:
+        existing = find_active(db, dedup_key)
+        if existing is not None:
+            return existing
+    job = Job(
+        kind=kind,
+        payload=payload,
+        dedup_key=dedup_key,
+        active_dedup_key=dedup_key,
+        priority=priority,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_after=_now() + timedelta(seconds=delay_seconds),
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # 다른 요청이 같은 dedup_key로 먼저 등록
+        db.rollback()
+        existing = find_active(db, dedup_key) if dedup_key else None
+        if existing is None:
+            raise
+        return existing
+    db.refresh(job)
+    logger.info("Job enqueued: id=%s kind=%s dedup_key=%s", job.id, kind, dedup_key)
+    return job
+
+
+def _claimable_kinds(db: Session, kinds: Iterable[str]) -> list[str]:
+    kinds = list(kinds)
+    running = dict(
+        db.execute(
+            select(Job.kind, func.count())
+            .where(Job.status == "running", Job.kind.in_(kinds))
+            .group_by(Job.kind)
+        ).all()
+    )
+    limits = settings.JOB_KIND_CONCURRENCY
+    return [k for k in kinds if k not in limits or running.get(k, 0) < limits[k]]
+
+
+def claim(db: Session, worker_id: str, kinds: Iterable[str]) -> Optional[Job]:
+    """실행 가능한 작업 1개를 가져와 running으로 표시. 없으면 None."""
+    eligible = _claimable_kinds(db, kinds)
+    if not eligible:
+        db.rollback()
+        return None
+    job = (
+        db.execute(
+            select(Job)
+            .where(Job.status == "queued", Job.kind.in_(eligible), Job.run_after <= _now())
+            .order_by(Job.priority.desc(), Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .first()
+    )
+    if job is None:
+        db.rollback()
+        return None
+    job.status = "running"
+    job.locked_by = worker_id
+    job.locked_at = _now()
+    job.attempts = (job.attempts or 0) + 1
+    db.commit()
+    return job
+
+
+def complete(db: Session, job: Job, result: Optional[Dict[str, Any]] = None) -> None:
+    job.status = "succeeded"
+    job.result = result
+    job.finished_at = _now()
+    job.active_dedup_key = None
+    job.locked_by = None
+    db.commit()
+
+
+def _backoff_seconds(attempts: int) -> float:
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), settings.JOB_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def fail(db: Session, job: Job, error: str) -> None:
+    """재시도 가능하면 백오프 후 queued, 아니면 failed."""
+    job.last_error = (error or "")[:_MAX_ERROR_LENGTH]
+    job.locked_by = None
+    if (job.attempts or 0) < (job.max_attempts or 1):
+        delay = _backoff_seconds(job.attempts or 1)
+        job.status = "queued"
+        job.run_after = _now() + timedelta(seconds=delay)
+        logger.warning("Job %s (%s) failed; retry %d/%d in %.0fs", job.id, job.kind, job.attempts, job.max_attempts, delay)
+    else:
+        job.status = "failed"
+        job.finished_at = _now()
+        job.active_dedup_key = None
+        logger.error("Job %s (%s) failed permanently after %d attempts", job.id, job.kind, job.attempts)
+    db.commit()
+
+
+def cancel(db: Session, job: Job) -> bool:
+    """queued 작업만 취소 가능."""
+    if job.status != "queued":
+        return False
+    job.status = "cancelled"
+    job.finished_at = _now()
+    job.active_dedup_key = None
+    db.commit()
+    return True
+
+
+def requeue_stale(db: Session) -> int:
+    """
+    lock이 JOB_LOCK_TIMEOUT_SECONDS보다 오래된 running 작업(워커 유실)을 queued로 되돌림.
+    이미 max_attempts만큼 시도한 작업은 failed 처리 (워커를 계속 죽이는 작업의 무한 재시도 방지).
+    """
+    now = _now()
+    stale = (Job.status == "running") & (Job.locked_at < now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT_SECONDS))
+    exhausted = db.execute(
+        update(Job)
+        .where(stale, Job.attempts >= Job.max_attempts)
+        .values(
+            status="failed",
+            locked_by=None,
+            finished_at=now,
+            active_dedup_key=None,
+            last_error="lock expired (worker lost)",
+        )
+    )
+    requeued = db.execute(
+        update(Job)
+        .where(stale)
+        .values(status="queued", locked_by=None, run_after=now, last_error="lock expired (worker lost)")
+    )
+    db.commit()
+    total = int(exhausted.rowcount or 0) + int(requeued.rowcount or 0)
+    if total:
+        logger.warning("Stale jobs: requeued=%d failed=%d", requeued.rowcount, exhausted.rowcount)
+    return total
+
+
+def queue_stats(db: Session) -> Dict[str, Dict[str, int]]:
+    rows = db.execute(
+        select(Job.kind, Job.status, func.count())
+        .where(Job.status.in_(ACTIVE_STATUSES))
+        .group_by(Job.kind, Job.status)
+    ).all()
+    out: Dict[str, Dict[str, int]] = {}
+    for kind, status, count in rows:
+        out.setdefault(kind, {})[status] = int(count)
+    return out
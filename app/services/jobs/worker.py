@@ -0,0 +1,106 @@
+"""
+작업 큐 워커. 웹 프로세스와 분리된 프로세스에서 실행 (python -m app.tasks.job_worker).
+
+스레드마다 claim → handler 실행 → complete/fail 을 반복하고,
+첫 번째 스레드가 주기적으로 lock이 만료된 작업을 되돌린다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from typing import Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.jobs import queue
+from app.services.jobs.handlers import HANDLERS
+
+logger = logging.getLogger(__name__)
+
+_STALE_CHECK_INTERVAL_SECONDS = 60.0
+
+
+class JobWorker:
+    def __init__(
+        self,
+        kinds: Optional[Iterable[str]] = None,
+        concurrency: int = 1,
+        poll_interval: Optional[float] = None,
+    ) -> None:
+        self.kinds: List[str] = [k for k in (kinds or HANDLERS.keys()) if k in HANDLERS]
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval if poll_interval is not None else settings.JOB_POLL_INTERVAL_SECONDS
+        self._stop = threading.Event()
+        self._id_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run_once(self, worker_id: str) -> bool:
+        """작업 1개 처리. 처리할 작업이 없었으면 False."""
+        db = SessionLocal()
+        try:
+            job = queue.claim(db, worker_id, self.kinds)
+            if job is None:
+                return False
+            started = time.monotonic()
+            logger.info("Job %s (%s) started by %s attempt=%d", job.id, job.kind, worker_id, job.attempts)
+            handler = HANDLERS[job.kind]
+            work_db = SessionLocal()
+            try:
+                result = handler(work_db, dict(job.payload or {}))
+            except Exception:
+                work_db.rollback()
+                logger.exception("Job %s (%s) raised", job.id, job.kind)
+                queue.fail(db, job, traceback.format_exc(limit=5))
+                return True
+            finally:
+                work_db.close()
+            queue.complete(db, job, result)
+            logger.info("Job %s (%s) succeeded in %.2fs", job.id, job.kind, time.monotonic() - started)
+            return True
+        finally:
+            db.close()
+
+    def _loop(self, index: int) -> None:
+        worker_id = f"{self._id_prefix}:{index}"
+        last_stale_check = 0.0
+        while not self._stop.is_set():
+            if index == 0 and time.monotonic() - last_stale_check > _STALE_CHECK_INTERVAL_SECONDS:
+                last_stale_check = time.monotonic()
+                db = SessionLocal()
+                try:
+                    queue.requeue_stale(db)
+                except Exception:
+                    logger.exception("Stale job check failed")
+                finally:
+                    db.close()
+            try:
+                processed = self.run_once(worker_id)
+            except Exception:
+                logger.exception("Job worker loop error (%s)", worker_id)
+                processed = False
+            if not processed:
+                self._stop.wait(self.poll_interval)
+
+    def run(self) -> None:
+        """stop()이 호출될 때까지 블로킹."""
+        logger.info("Job worker started: kinds=%s concurrency=%d", self.kinds, self.concurrency)
+        threads = [
+            threading.Thread(target=self._loop, args=(i,), name=f"job-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for t in threads:
+            t.start()
+        try:
+            while any(t.is_alive() for t in threads):
+                for t in threads:
+                    t.join(timeout=1.0)
+        finally:
+            self._stop.set()
+            logger.info("Job worker stopped")
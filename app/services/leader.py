@@ -0,0 +1,159 @@
+"""
+lease row 기반 리더 선출. 여러 워커/레플리카 중 한 프로세스만 스케줄 job을 실행하게 한다.
+
+- renew 주기마다 "내가 holder이거나 lease가 만료됐으면 내 것으로" UPDATE → 성공하면 리더
+- 리더 프로세스가 죽으면 TTL 후 다른 프로세스가 가져감 (failover)
+- 갱신에 실패한 채 TTL이 지나면 스스로 리더를 내려놓음 (DB 단절 시 이중 실행 방지)
+- 만료 시각 계산·비교는 DB 시각으로 (호스트 간 시계 차이가 lease 판정에 영향을 주지 않게)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+
+from sqlalchemy import TIMESTAMP, literal, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.domain.job.model import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+
+class db_now_plus(FunctionElement):
+    """DB 현재 시각 + seconds. TIMESTAMP 컬럼과 같은 세션 time_zone(UTC) 기준."""
+
+    type = TIMESTAMP()
+    inherit_cache = True
+
+    def __init__(self, seconds: float = 0.0) -> None:
+        super().__init__(literal(int(seconds * 1_000_000)))
+
+
+@compiles(db_now_plus)
+def _db_now_plus_mysql(element, compiler, **kw):
+    return f"DATE_ADD(NOW(6), INTERVAL {compiler.process(element.clauses, **kw)} MICROSECOND)"
+
+
+@compiles(db_now_plus, "sqlite")
+def _db_now_plus_sqlite(element, compiler, **kw):
+    # 테스트용 sqlite: 'now'는 UTC
+    offset = compiler.process(element.clauses, **kw)
+    return f"strftime('%Y-%m-%d %H:%M:%f', 'now', '+' || ({offset} / 1000000.0) || ' seconds')"
+
+
+class LeaderElector:
+    def __init__(
+        self,
+        name: str,
+        on_elected: Callable[[], None],
+        on_revoked: Callable[[], None],
+        ttl_seconds: Optional[float] = None,
+        renew_seconds: Optional[float] = None,
+    ) -> None:
+        self.name = name
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._on_elected = on_elected
+        self._on_revoked = on_revoked
+        self._ttl = ttl_seconds or settings.SCHEDULER_LEASE_TTL_SECONDS
+        self._renew = renew_seconds or settings.SCHEDULER_LEASE_RENEW_SECONDS
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.is_leader = False
+        self._valid_until = 0.0  # 마지막 갱신 성공 기준 lease 유효 시각 (monotonic)
+
+    def try_acquire(self) -> bool:
+        """lease 획득/갱신 시도. 이 프로세스가 holder면 True."""
+        db = SessionLocal()
+        try:
+            res = db.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == self.name,
+                    or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < db_now_plus()),
+                )
+                .values(holder=self.holder, expires_at=db_now_plus(self._ttl))
+            )
+            if res.rowcount:
+                db.commit()
+                return True
+            if db.get(SchedulerLease, self.name) is None:
+                db.add(
+                    SchedulerLease(
+                        name=self.name, holder=self.holder, expires_at=db_now_plus(self._ttl), acquired_at=db_now_plus()
+                    )
+                )
+                try:
+                    db.commit()
+                    return True
+                except IntegrityError:
+                    db.rollback()
+            db.commit()
+            return False
+        finally:
+            db.close()
+
+    def release(self) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name, SchedulerLease.holder == self.holder)
+                .values(expires_at=db_now_plus())
+            )
+            db.commit()
+        except Exception as e:
+            logger.warning("Leader lease release failed: %s", e)
+        finally:
+            db.close()
+
+    def _set_leader(self, leader: bool) -> None:
+        if leader == self.is_leader:
+            return
+        self.is_leader = leader
+        if leader:
+            logger.info("Became scheduler leader: lease=%s holder=%s", self.name, self.holder)
+            self._on_elected()
+        else:
+            logger.warning("Lost scheduler leadership: lease=%s holder=%s", self.name, self.holder)
+            self._on_revoked()
+
+    def tick(self) -> None:
+        started = time.monotonic()
+        try:
+            acquired = self.try_acquire()
+        except Exception as e:
+            logger.warning("Leader lease renew failed: %s", e)
+            # 갱신 실패: 마지막으로 확보한 lease가 유효한 동안만 리더 유지
+            if self.is_leader and time.monotonic() >= self._valid_until:
+                self._set_leader(False)
+            return
+        if acquired:
+            self._valid_until = started + self._ttl
+        self._set_leader(acquired)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(self._renew)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self._renew + 1)
+        if self.is_leader:
+            self._set_leader(False)
+            self.release()
@@ -8,6 +8,8 @@ import urllib.parse
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+from app.core.tracing import propagate_context, span
+
 logger = logging.getLogger(__name__)
 
 _USDKRW_CACHE: Dict[str, Any] = {"rate": None, "ts": 0.0}
@@ -60,6 +62,13 @@ class MarketContext:
 
 def _fetch_ticker_quote(ticker: str) -> TickerQuote:
     """동기: yfinance로 한 종목 시세 조회. 실패 시 빈 TickerQuote."""
+    with span("market.quote", ticker=ticker) as s:
+        quote = _fetch_yfinance_quote(ticker)
+        s.set_attribute("ok", quote.price is not None)
+        return quote
+
+
+def _fetch_yfinance_quote(ticker: str) -> TickerQuote:
     try:
         import yfinance as yf
 
@@ -131,6 +140,13 @@ def _fetch_rss_feed(url: str, limit: int = 10) -> List[Dict[str, Any]]:
 
 def _fetch_ticker_news(ticker: str, query: Optional[str] = None, limit: int = 3) -> List[Dict[str, Any]]:
     """동기: RSS 기반으로 종목 관련 뉴스 수집 (Google News)."""
+    with span("market.news", ticker=ticker, limit=limit) as s:
+        items = _fetch_google_news(ticker, query, limit)
+        s.set_attribute("news_count", len(items))
+        return items
+
+
+def _fetch_google_news(ticker: str, query: Optional[str], limit: int) -> List[Dict[str, Any]]:
     try:
         search_term = (query or "").strip() or TICKER_KR_NAME.get(ticker, ticker)
         rss_url = RSS_FEEDS["google_news_kr"].format(query=urllib.parse.quote(search_term))
@@ -146,6 +162,69 @@ def _fetch_ticker_news(ticker: str, query: Optional[str] = None, limit: int = 3)
         logger.warning("RSS news failed for %s: %s", ticker, e)
         return []
 
+@dataclass
+class MarketSnapshot:
+    """여러 사용자/마을이 공유하는 시세·뉴스 묶음 (배치에서 종목 합집합을 한 번만 조회)."""
+
+    quotes: Dict[str, TickerQuote] = field(default_factory=dict)
+    news_by_ticker: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    def context_for(
+        self,
+        tickers: List[str],
+        price_tickers: Optional[List[str]] = None,
+    ) -> MarketContext:
+        """get_market_context와 같은 형태로 일부 종목만 잘라서 반환."""
+        tickers = [t for t in tickers if t]
+        price_tickers = [t for t in (price_tickers or []) if t]
+        quotes = [self.quotes.get(t) or TickerQuote(ticker=t) for t in (price_tickers or tickers)]
+        news_by_key: Dict[str, Dict[str, Any]] = {}  # title -> item (중복 제거)
+        for ticker in tickers:
+            for item in self.news_by_ticker.get(ticker) or []:
+                key = item.get("title") or ""
+                if key and key not in news_by_key:
+                    news_by_key[key] = item
+        return MarketContext(ticker_quotes=quotes, news_items=list(news_by_key.values()))
+
+
+_PREFETCH_WORKERS = 8
+
+
+def prefetch_market_snapshot(
+    tickers: List[str],
+    news_per_ticker: int = 3,
+    name_map: Optional[Dict[str, str]] = None,
+    price_tickers: Optional[List[str]] = None,
+) -> MarketSnapshot:
+    """동기: 고유 종목별로 시세·뉴스를 한 번씩만 수집."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    tickers = list(dict.fromkeys(t for t in tickers if t))
+    quote_tickers = list(dict.fromkeys(t for t in (price_tickers or tickers) if t))
+    snapshot = MarketSnapshot()
+    if not tickers and not quote_tickers:
+        return snapshot
+
+    with span(
+        "market.prefetch",
+        ticker_count=len(tickers),
+        quote_ticker_count=len(quote_tickers),
+    ), ThreadPoolExecutor(max_workers=_PREFETCH_WORKERS) as pool:
+        for q in pool.map(propagate_context(_fetch_ticker_quote), quote_tickers):
+            snapshot.quotes[q.ticker] = q
+        if news_per_ticker > 0:
+            fetched = pool.map(
+                propagate_context(
+                    lambda t: _fetch_ticker_news(t, query=name_map.get(t) if name_map else None, limit=news_per_ticker)
+                ),
+                tickers,
+            )
+            for ticker, items in zip(tickers, fetched):
+                snapshot.news_by_ticker[ticker] = items
+    logger.info("Market snapshot prefetched: quotes=%d news_tickers=%d", len(quote_tickers), len(tickers))
+    return snapshot
+
+
 def _get_market_context_sync(
     tickers: List[str],
     news_per_ticker: int = 3,
@@ -162,16 +241,18 @@ def _get_market_context_sync(
     news_by_key: Dict[str, Dict[str, Any]] = {}  # title -> item (중복 제거)
 
     quote_tickers = price_tickers or tickers
-    for ticker in quote_tickers:
-        q = _fetch_ticker_quote(ticker)
-        quotes.append(q)
-    for ticker in tickers:
-        query = name_map.get(ticker) if name_map else None
-        for item in _fetch_ticker_news(ticker, query=query, limit=news_per_ticker):
-            key = item.get("title") or ""
-            if key and key not in news_by_key:
-                news_by_key[key] = item
-        logger.warning("RSS aggregate: ticker=%s query=%s news_count=%d", ticker, query, len(news_by_key))
+    with span("market.context", ticker_count=len(tickers), quote_ticker_count=len(quote_tickers)) as s:
+        for ticker in quote_tickers:
+            q = _fetch_ticker_quote(ticker)
+            quotes.append(q)
+        for ticker in tickers:
+            query = name_map.get(ticker) if name_map else None
+            for item in _fetch_ticker_news(ticker, query=query, limit=news_per_ticker):
+                key = item.get("title") or ""
+                if key and key not in news_by_key:
+                    news_by_key[key] = item
+            logger.warning("RSS aggregate: ticker=%s query=%s news_count=%d", ticker, query, len(news_by_key))
+        s.set_attribute("news_count", len(news_by_key))
 
     return MarketContext(
         ticker_quotes=quotes,
@@ -194,7 +275,7 @@ async def get_market_context(
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             None,
-            lambda: _get_market_context_sync(tickers, news_per_ticker, name_map, price_tickers),
+            propagate_context(lambda: _get_market_context_sync(tickers, news_per_ticker, name_map, price_tickers)),
         )
     except Exception as e:
         logger.warning("get_market_context failed: %s", e)
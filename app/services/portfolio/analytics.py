@@ -0,0 +1,240 @@
+"""
+보유 종목 분석 엔진 (NumPy 벡터 연산).
+
+보유 행을 열 배열(user_id, asset_id, 수량, 평균 매수가, 현재가, 환율, 일간 등락률)로 한 번 적재하고
+평가액·원가·수익률·가중 일간 등락·비중·순위와 마을/버킷/사용자별 합계를 배열 연산으로 계산한다.
+포트폴리오 요약, 브리핑 생성, 마을 화면이 같은 계산을 공유하고, 배치에서는 여러 사용자를 한 프레임에 담아
+사용자별 합계를 한 번에 구한다.
+
+- 현재가가 없는 종목은 0원으로 평가 (기존 화면과 동일)
+- 평균 매수가가 0이면 종목 수익률 0
+- 그룹 소속(마을·버킷)은 (행 번호, 그룹 키) 쌍으로 표현 → 한 종목이 여러 마을에 속할 수 있다
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domain.asset.model import Asset, AssetPrice
+from app.domain.portfolio.model import UserPortfolio
+
+
+@dataclass(frozen=True)
+class Totals:
+    value: float
+    cost: float
+
+    @property
+    def profit(self) -> float:
+        return self.value - self.cost
+
+    @property
+    def return_rate(self) -> float:
+        """원가 대비 수익률(%). 원가가 0이면 0."""
+        return self.profit / self.cost * 100.0 if self.cost > 0 else 0.0
+
+
+_EMPTY_TOTALS = Totals(0.0, 0.0)
+
+
+class Membership:
+    """행 → 그룹 키 소속 (한 행이 여러 그룹에 속할 수 있음). 키는 정수 코드로 바꿔 bincount에 쓴다."""
+
+    def __init__(self, rows: np.ndarray, codes: np.ndarray, keys: List[Hashable]) -> None:
+        self.rows = rows
+        self.codes = codes
+        self.keys = keys
+
+    @classmethod
+    def from_lists(cls, groups_per_row: Sequence[Iterable[Hashable]]) -> "Membership":
+        key_index: Dict[Hashable, int] = {}
+        rows: List[int] = []
+        codes: List[int] = []
+        for i, groups in enumerate(groups_per_row):
+            for key in groups:
+                rows.append(i)
+                codes.append(key_index.setdefault(key, len(key_index)))
+        return cls(np.asarray(rows, dtype=np.int64), np.asarray(codes, dtype=np.int64), list(key_index))
+
+    @classmethod
+    def from_keys(cls, keys_per_row: np.ndarray) -> "Membership":
+        """행마다 그룹이 정확히 하나 (예: user_id)."""
+        keys, codes = np.unique(keys_per_row, return_inverse=True)
+        return cls(np.arange(len(keys_per_row), dtype=np.int64), codes.astype(np.int64), keys.tolist())
+
+    def sums(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.codes, weights=values[self.rows], minlength=len(self.keys))
+
+
+class HoldingsFrame:
+    """보유 행의 열 배열. 금액은 모두 price × fx 기준 통화(원화)."""
+
+    def __init__(
+        self,
+        user_ids: np.ndarray,
+        asset_ids: np.ndarray,
+        quantity: np.ndarray,
+        avg_buy: np.ndarray,
+        price: np.ndarray,
+        fx: Optional[np.ndarray] = None,
+        daily_change: Optional[np.ndarray] = None,
+    ) -> None:
+        n = len(asset_ids)
+        self.user_ids = user_ids
+        self.asset_ids = asset_ids
+        self.quantity = quantity
+        self.avg_buy = avg_buy
+        self.price = price
+        self.fx = fx if fx is not None else np.ones(n)
+        self.daily_change = daily_change if daily_change is not None else np.zeros(n)
+        self.value = quantity * price * self.fx
+        self.cost = quantity * avg_buy
+        self._row_of: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.asset_ids)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Tuple[UserPortfolio, Asset]],
+        prices: Mapping[int, float],
+        daily_changes: Optional[Mapping[int, float]] = None,
+    ) -> "HoldingsFrame":
+        """(UserPortfolio, Asset) 행과 asset_id → 현재가(원화), asset_id → 일간 등락률(%)."""
+        daily_changes = daily_changes or {}
+        n = len(rows)
+        user_ids = np.fromiter((int(p.user_id) for p, _a in rows), dtype=np.int64, count=n)
+        asset_ids = np.fromiter((int(a.asset_id) for _p, a in rows), dtype=np.int64, count=n)
+        quantity = np.fromiter((float(p.quantity or 0) for p, _a in rows), dtype=np.float64, count=n)
+        avg_buy = np.fromiter((float(p.avg_buy_price or 0) for p, _a in rows), dtype=np.float64, count=n)
+        price = np.fromiter((prices.get(a.asset_id, 0.0) for _p, a in rows), dtype=np.float64, count=n)
+        daily = np.fromiter((daily_changes.get(a.asset_id, 0.0) for _p, a in rows), dtype=np.float64, count=n)
+        return cls(user_ids, asset_ids, quantity, avg_buy, price, daily_change=daily)
+
+    def row_of(self, asset_id: int) -> Optional[int]:
+        """asset_id의 행 번호 (단일 사용자 프레임용)."""
+        if self._row_of is None:
+            self._row_of = {int(a): i for i, a in enumerate(self.asset_ids.tolist())}
+        return self._row_of.get(int(asset_id))
+
+    # --- 전체 ---
+
+    def totals(self, mask: Optional[np.ndarray] = None) -> Totals:
+        """전체(또는 mask 행) 평가액·원가 합계."""
+        if not len(self):
+            return _EMPTY_TOTALS
+        if mask is None:
+            return Totals(float(self.value.sum()), float(self.cost.sum()))
+        return Totals(float(self.value[mask].sum()), float(self.cost[mask].sum()))
+
+    def asset_mask(self, asset_ids: Iterable[int]) -> np.ndarray:
+        """asset_ids에 포함된 행."""
+        return np.isin(self.asset_ids, np.fromiter((int(a) for a in asset_ids), dtype=np.int64))
+
+    def asset_return_rates(self) -> np.ndarray:
+        """종목별 평균 매수가 대비 수익률(%)."""
+        out = np.zeros(len(self))
+        np.divide(self.price * self.fx - self.avg_buy, self.avg_buy, out=out, where=self.avg_buy > 0)
+        return out * 100.0
+
+    def weighted_daily_change(self, mask: Optional[np.ndarray] = None) -> float:
+        """평가액 가중 일간 등락률. 평가액이 모두 0이면 단순 평균."""
+        value = self.value if mask is None else self.value[mask]
+        change = self.daily_change if mask is None else self.daily_change[mask]
+        if not len(change):
+            return 0.0
+        positive = value > 0
+        total = value[positive].sum()
+        if total > 0:
+            return float((change[positive] * value[positive]).sum() / total)
+        return float(change.mean())
+
+    def weights(self) -> np.ndarray:
+        """종목별 평가액 비중(%)."""
+        total = self.value.sum()
+        return self.value / total * 100.0 if total > 0 else np.zeros(len(self))
+
+    def ranked(self, n: int) -> Tuple[List[int], List[int]]:
+        """수익률 상위 n개, 하위 n개의 행 번호 (하위는 낮은 순). 동률은 원래 순서 유지."""
+        if n <= 0:
+            return [], []
+        order = np.argsort(-self.asset_return_rates(), kind="stable")
+        return order[:n].tolist(), order[-n:][::-1].tolist()
+
+    # --- 그룹 ---
+
+    def group_totals(self, membership: Membership) -> Dict[Hashable, Totals]:
+        """그룹 키 → 합계. 소속 행이 하나도 없는 그룹은 포함되지 않는다."""
+        if not len(membership.keys):
+            return {}
+        values = membership.sums(self.value)
+        costs = membership.sums(self.cost)
+        return {key: Totals(float(v), float(c)) for key, v, c in zip(membership.keys, values, costs)}
+
+    def by_user(self) -> Dict[int, Totals]:
+        return {int(k): t for k, t in self.group_totals(Membership.from_keys(self.user_ids)).items()}
+
+    def memberships(self, groups_of_asset: Mapping[int, Iterable[Hashable]]) -> Membership:
+        """asset_id → 그룹 키 목록(예: 소속 마을)으로 행 소속 생성."""
+        return Membership.from_lists([groups_of_asset.get(int(a), ()) for a in self.asset_ids.tolist()])
+
+
+def weighted_period_returns(quantity: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    """
+    기간별 평가액 가중 수익률(%). closes는 (종목 × 기간) 종가 행렬(없으면 nan).
+    기간 t 수익률 = Σ r(i,t)·v(i,t) / Σ v(i,t), v = 수량 × t 종가. 수량이 없거나 전후 종가가 없는 종목은 제외.
+    반환 길이는 기간 수 - 1 (첫 기간 제외).
+    """
+    if closes.ndim != 2 or closes.shape[1] < 2:
+        return np.zeros(0)
+    cur = closes[:, 1:]
+    prev = closes[:, :-1]
+    valid = (quantity[:, None] > 0) & ~np.isnan(cur) & ~np.isnan(prev) & (prev != 0)
+    value = np.where(valid, quantity[:, None] * np.nan_to_num(cur), 0.0)
+    rate = np.zeros(cur.shape)
+    np.divide(cur - prev, prev, out=rate, where=valid)
+    total = value.sum(axis=0)
+    out = np.zeros(total.shape)
+    np.divide((rate * 100.0 * value).sum(axis=0), total, out=out, where=total > 0)
+    return out
+
+
+def totals_for(totals: Mapping[Hashable, Totals], key: Hashable) -> Totals:
+    return totals.get(key, _EMPTY_TOTALS)
+
+
+def load_holdings_frame(
+    db: Session,
+    user_ids: Sequence[int],
+    only_positive: bool = True,
+) -> HoldingsFrame:
+    """여러 사용자의 보유 행과 저장된 현재가를 쿼리 한 번으로 열 배열에 적재 (배치 분석용)."""
+    query = (
+        select(
+            UserPortfolio.user_id,
+            UserPortfolio.asset_id,
+            UserPortfolio.quantity,
+            UserPortfolio.avg_buy_price,
+            AssetPrice.price,
+        )
+        .outerjoin(AssetPrice, AssetPrice.asset_id == UserPortfolio.asset_id)
+        .where(UserPortfolio.user_id.in_(list(user_ids)))
+        .order_by(UserPortfolio.user_id, UserPortfolio.asset_id)
+    )
+    if only_positive:
+        query = query.where(UserPortfolio.quantity > 0)
+    rows = db.execute(query).all() if user_ids else []
+    n = len(rows)
+    return HoldingsFrame(
+        user_ids=np.fromiter((int(r[0]) for r in rows), dtype=np.int64, count=n),
+        asset_ids=np.fromiter((int(r[1]) for r in rows), dtype=np.int64, count=n),
+        quantity=np.fromiter((float(r[2] or 0) for r in rows), dtype=np.float64, count=n),
+        avg_buy=np.fromiter((float(r[3] or 0) for r in rows), dtype=np.float64, count=n),
+        price=np.fromiter((float(r[4] or 0) for r in rows), dtype=np.float64, count=n),
+    )
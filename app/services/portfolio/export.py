@@ -0,0 +1,243 @@
+"""
+포트폴리오 내보내기 (GET /api/portfolio/export) 스트리밍 writer.
+
+- 행은 서버 측 커서(stream_results + yield_per)로 읽어 바로 writer에 넘긴다 → 이력이 길어도 메모리 사용량 일정
+- CSV: 한 시트(sheet=holdings|history), Excel 한글 호환을 위해 UTF-8 BOM
+- XLSX: 표준 라이브러리 zipfile로 시트 XML을 행 단위로 써 내려가며 압축 청크를 그대로 전송
+  (통합 문서 전체를 메모리/임시 파일에 만든 뒤 저장하는 방식이 아님)
+- holdings: portfolio_asset_valuations 기준 현재 보유, history: 현재 보유 수량 × 월말 종가(asset_price_monthly)
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.domain.asset.model import Asset, AssetPriceMonthly
+from app.domain.portfolio.model import PortfolioAssetValuation, UserPortfolio
+from app.services.portfolio.valuation import ensure_user_valuations
+
+EXPORT_FORMATS = ("csv", "xlsx")
+EXPORT_SHEETS = ("holdings", "history")
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+_YIELD_PER = 500
+_CHUNK_BYTES = 64 * 1024
+
+HOLDINGS_HEADER = [
+    "symbol", "name", "country_code", "asset_type",
+    "quantity", "avg_buy_price", "price", "market_value", "cost_value", "return_rate",
+]
+HISTORY_HEADER = ["month", "symbol", "name", "quantity", "close_price", "market_value"]
+
+Row = Sequence[Any]
+
+
+def _stream(db: Session, stmt: Any) -> Iterator[Any]:
+    """서버 측 커서로 _YIELD_PER 행씩 가져온다 (MySQL: SSCursor)."""
+    return iter(db.execute(stmt.execution_options(stream_results=True, yield_per=_YIELD_PER)))
+
+
+def iter_holdings(db: Session, user_id: int) -> Iterator[Row]:
+    ensure_user_valuations(db, user_id)
+    stmt = (
+        select(
+            Asset.symbol,
+            Asset.name,
+            Asset.country_code,
+            Asset.asset_type,
+            PortfolioAssetValuation.quantity,
+            PortfolioAssetValuation.avg_buy_price,
+            PortfolioAssetValuation.price,
+            PortfolioAssetValuation.market_value,
+            PortfolioAssetValuation.cost_value,
+        )
+        .join(Asset, Asset.asset_id == PortfolioAssetValuation.asset_id)
+        .where(PortfolioAssetValuation.user_id == user_id)
+        .order_by(PortfolioAssetValuation.market_value.desc(), PortfolioAssetValuation.asset_id)
+    )
+    for symbol, name, country, asset_type, qty, avg_buy, price, value, cost in _stream(db, stmt):
+        cost = float(cost or 0)
+        rate = (float(value or 0) - cost) / cost * 100.0 if cost > 0 else 0.0
+        yield (symbol, name, country, asset_type, qty, avg_buy, price, value, cost, round(rate, 2))
+
+
+def iter_history(db: Session, user_id: int) -> Iterator[Row]:
+    stmt = (
+        select(
+            AssetPriceMonthly.month,
+            Asset.symbol,
+            Asset.name,
+            UserPortfolio.quantity,
+            AssetPriceMonthly.close_price,
+        )
+        .join(UserPortfolio, UserPortfolio.asset_id == AssetPriceMonthly.asset_id)
+        .join(Asset, Asset.asset_id == AssetPriceMonthly.asset_id)
+        .where(UserPortfolio.user_id == user_id)
+        .order_by(AssetPriceMonthly.month, AssetPriceMonthly.asset_id)
+    )
+    for month, symbol, name, qty, close in _stream(db, stmt):
+        yield (month, symbol, name, qty, close, float(qty or 0) * float(close or 0))
+
+
+SHEETS: Dict[str, Tuple[List[str], Callable[[Session, int], Iterator[Row]]]] = {
+    "holdings": (HOLDINGS_HEADER, iter_holdings),
+    "history": (HISTORY_HEADER, iter_history),
+}
+
+
+def _cell_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+# --- CSV ---
+
+
+def iter_csv(header: Sequence[str], rows: Iterable[Row]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")  # BOM
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(["" if v is None else _cell_value(v) for v in row])
+        if buffer.tell() >= _CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+# --- XLSX ---
+
+
+class _ChunkSink:
+    """zipfile이 쓰는 출력. tell/seek이 없으므로 zipfile은 data descriptor 방식으로 순차 기록한다."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        self.size = 0
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    "{sheets}</Types>"
+)
+_SHEET_CONTENT_TYPE = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    "<sheets>{sheets}</sheets></workbook>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    "{sheets}</Relationships>"
+)
+_SHEET_REL = (
+    '<Relationship Id="rId{n}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{n}.xml"/>'
+)
+_SHEET_HEAD = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = b"</sheetData></worksheet>"
+
+
+def _xlsx_row(values: Row) -> bytes:
+    cells: List[str] = []
+    for value in values:
+        value = _cell_value(value)
+        if value is None:
+            cells.append("<c/>")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            cells.append(f'<c t="inlineStr"><is><t>{escape(str(value))}</t></is></c>')
+        else:
+            cells.append(f"<c><v>{value!r}</v></c>")
+    return ("<row>" + "".join(cells) + "</row>").encode("utf-8")
+
+
+def iter_xlsx(sheets: Sequence[Tuple[str, Sequence[str], Iterable[Row]]]) -> Iterator[bytes]:
+    """(시트 이름, 헤더, 행) 목록을 XLSX 바이트 청크로. 행 iterable은 순서대로 한 번씩 소비된다."""
+    sink = _ChunkSink()
+    numbers = range(1, len(sheets) + 1)
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "[Content_Types].xml", _CONTENT_TYPES.format(sheets="".join(_SHEET_CONTENT_TYPE.format(n=n) for n in numbers))
+        )
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr(
+            "xl/workbook.xml",
+            _WORKBOOK.format(
+                sheets="".join(
+                    f'<sheet name="{escape(name)}" sheetId="{n}" r:id="rId{n}"/>' for n, (name, _h, _r) in zip(numbers, sheets)
+                )
+            ),
+        )
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS.format(sheets="".join(_SHEET_REL.format(n=n) for n in numbers)))
+        for n, (_name, header, rows) in zip(numbers, sheets):
+            with archive.open(f"xl/worksheets/sheet{n}.xml", "w", force_zip64=True) as part:
+                part.write(_SHEET_HEAD)
+                part.write(_xlsx_row(header))
+                for row in rows:
+                    part.write(_xlsx_row(row))
+                    if sink.size >= _CHUNK_BYTES:
+                        yield sink.drain()
+                part.write(_SHEET_TAIL)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_export(db: Session, user_id: int, export_format: str, sheet: str = "holdings") -> Iterator[bytes]:
+    """format=xlsx는 모든 시트, csv는 sheet 하나."""
+    if export_format == "xlsx":
+        yield from iter_xlsx([(name, header, rows(db, user_id)) for name, (header, rows) in SHEETS.items()])
+    else:
+        header, rows = SHEETS[sheet]
+        yield from iter_csv(header, rows(db, user_id))
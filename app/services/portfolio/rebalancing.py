@@ -0,0 +1,287 @@
+"""
+리밸런싱 추천 (스냅샷 캐시 + staleness 판단).
+
+- 결정 규칙(RebalancingInputs.keys)은 요약에서 이미 계산한 합계만으로 즉시 계산 (추가 쿼리·LLM 없음)
+- LLM 보정은 스냅샷 갱신(refresh_rebalancing_snapshot)에서만 호출. 입력은 저장된 현재가로 다시 적재하며
+  시세 조회나 요약 재생성은 하지 않는다
+- 읽기(resolve_recommendations): 최신 스냅샷이 신선하면 그대로 반환.
+  오래됐으면(REBALANCING_SNAPSHOT_MAX_AGE_SECONDS) 그 스냅샷을 반환하면서 갱신을 예약하고,
+  입력 키(결정 키·마을 구성)가 바뀌었으면 결정 규칙 결과를 반환하면서 갱신을 예약한다
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+
+from fastapi import BackgroundTasks
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.domain.asset.model import Asset
+from app.domain.portfolio.model import RebalancingSnapshot
+from app.domain.portfolio.schema.response import RebalancingRecommendation
+from app.domain.village.model import Village, VillageAsset
+from app.services.briefing.analysis_cache import fingerprint
+from app.services.briefing.llm import call_llm, llm_lane
+from app.services.jobs import JOB_KIND_REBALANCING, enqueue
+from app.services.portfolio.analytics import Membership, load_holdings_frame, totals_for
+
+logger = logging.getLogger(__name__)
+
+REBALANCING_KEYS = ("risk_balance", "improve_return", "strengthen_dividend")
+
+# JOB_QUEUE_ENABLED=False일 때 이 프로세스에서 갱신 중인 사용자 (같은 사용자 중복 LLM 호출 방지)
+_refreshing: Set[int] = set()
+_refreshing_lock = threading.Lock()
+
+
+def classify_bucket(asset: Asset) -> List[str]:
+    keys: List[str] = []
+    name = (asset.name or "").lower()
+    symbol = (asset.symbol or "").upper()
+    if asset.asset_type == "ETF":
+        if "lever" in name or symbol in {"TQQQ", "UPRO", "SOXL"}:
+            keys.append("leveraged_etf")
+        elif "배당" in asset.name or symbol in {"SCHD", "VYM", "HDV"}:
+            keys.append("dividend_etf")
+        elif "나스닥" in asset.name or "nasdaq" in name:
+            keys.append("growth_etf")
+        else:
+            keys.append("etf")
+    if asset.asset_type == "STOCK":
+        if asset.country_code == "US":
+            keys.append("us_stocks")
+        if asset.country_code == "KR":
+            keys.append("kr_stocks")
+    if any(k in name for k in ["테크", "반도체", "tech", "ai"]):
+        keys.append("tech")
+    if "성장" in asset.name or "growth" in name:
+        keys.append("growth")
+    return keys or ["other"]
+
+
+@dataclass
+class RebalancingInputs:
+    total_assets_value: float
+    total_return_rate: float
+    bucket_values: Dict[str, float]
+    village_map: Dict[int, str]
+    village_allocations: Dict[int, float]
+    village_returns: Dict[int, float]
+
+    def keys(self) -> List[str]:
+        """결정 규칙 리밸런싱 키."""
+        keys: List[str] = []
+        if self.bucket_values.get("leveraged_etf", 0.0) > 0:
+            keys.append("risk_balance")
+        if self.total_return_rate < 0:
+            keys.append("improve_return")
+        if self.bucket_values.get("dividend_etf", 0.0) == 0:
+            keys.append("strengthen_dividend")
+        return keys or ["risk_balance"]
+
+    def input_key(self) -> str:
+        """스냅샷 재사용 여부를 가르는 입력 키. 가격 변동만으로는 바뀌지 않는다."""
+        return fingerprint("rebalancing", self.keys(), sorted(self.village_map))
+
+
+def build_recommendations(keys: List[str], inputs: RebalancingInputs) -> List[RebalancingRecommendation]:
+    recos: List[RebalancingRecommendation] = []
+    total_assets_value = inputs.total_assets_value
+
+    # 가장 비중 큰 마을
+    top_village_id = None
+    top_alloc = 0.0
+    for vid, val in inputs.village_allocations.items():
+        if val > top_alloc:
+            top_alloc = val
+            top_village_id = vid
+
+    # 가장 성과 낮은 마을
+    worst_village_id = None
+    worst_rate = 0.0
+    for vid, rate in inputs.village_returns.items():
+        if worst_village_id is None or rate < worst_rate:
+            worst_rate = rate
+            worst_village_id = vid
+
+    for key in keys:
+        if key == "risk_balance":
+            name = inputs.village_map.get(top_village_id, "특정 마을")
+            pct = (top_alloc / total_assets_value * 100.0) if total_assets_value > 0 else 0.0
+            recos.append(
+                RebalancingRecommendation(
+                    id="risk_balance",
+                    title="포트폴리오 균형 조정",
+                    description=f"{name}의 비중이 {pct:.1f}%로 높습니다. 다른 마을로 일부 분산하여 리스크를 줄이는 것을 추천합니다.",
+                    solution="분산 투자 고려",
+                )
+            )
+        elif key == "improve_return":
+            name = inputs.village_map.get(worst_village_id, "특정 마을")
+            recos.append(
+                RebalancingRecommendation(
+                    id="improve_return",
+                    title="수익률 개선 기회",
+                    description=f"{name}이(가) {worst_rate:.1f}% 수준입니다. 시장 상황을 고려해 비중 조정이 필요할 수 있습니다.",
+                    solution="비중 조정 점검",
+                )
+            )
+        elif key == "strengthen_dividend":
+            dividend_value = inputs.bucket_values.get("dividend_etf", 0.0)
+            dividend_pct = (dividend_value / total_assets_value * 100.0) if total_assets_value > 0 else 0.0
+            recos.append(
+                RebalancingRecommendation(
+                    id="strengthen_dividend",
+                    title="배당 수익 강화",
+                    description=f"배당/방어 비중이 {dividend_pct:.1f}%로 낮습니다. 안정적인 현금 흐름을 위해 배당 비중을 늘리는 것을 고려해보세요.",
+                    solution="배당마을 확대",
+                )
+            )
+        else:
+            recos.append(
+                RebalancingRecommendation(
+                    id=key,
+                    title="리밸런싱 점검",
+                    description="포트폴리오 구성을 점검해 리스크를 관리하세요.",
+                    solution="구성 점검",
+                )
+            )
+    return recos
+
+
+def load_rebalancing_inputs(db: Session, user_id: int) -> RebalancingInputs:
+    """저장된 현재가(asset_price) 기준 입력 적재. 시세 조회 없음."""
+    frame = load_holdings_frame(db, [user_id], only_positive=False)
+    asset_ids = frame.asset_ids.tolist()
+    assets = {a.asset_id: a for a in db.query(Asset).filter(Asset.asset_id.in_(asset_ids)).all()} if asset_ids else {}
+    bucket_values = {
+        key: t.value
+        for key, t in frame.group_totals(
+            Membership.from_lists([classify_bucket(assets[a]) if a in assets else ["other"] for a in asset_ids])
+        ).items()
+    }
+
+    village_map = {
+        int(vid): name for vid, name in db.execute(select(Village.village_id, Village.name).where(Village.user_id == user_id))
+    }
+    asset_villages: Dict[int, List[int]] = defaultdict(list)
+    if village_map:
+        for village_id, asset_id in db.execute(
+            select(VillageAsset.village_id, VillageAsset.asset_id).where(VillageAsset.village_id.in_(list(village_map)))
+        ):
+            asset_villages[int(asset_id)].append(int(village_id))
+    village_totals = frame.group_totals(frame.memberships(asset_villages))
+
+    totals = frame.totals()
+    return RebalancingInputs(
+        total_assets_value=totals.value,
+        total_return_rate=totals.return_rate,
+        bucket_values=bucket_values,
+        village_map=village_map,
+        village_allocations={vid: totals_for(village_totals, vid).value for vid in village_map},
+        village_returns={vid: totals_for(village_totals, vid).return_rate for vid in village_map},
+    )
+
+
+def _refine_keys_with_llm(inputs: RebalancingInputs) -> Optional[List[str]]:
+    prompt = f"""다음 포트폴리오 요약을 보고 리밸런싱 키를 3개까지 추천해 주세요.
+키 후보: {", ".join(REBALANCING_KEYS)}
+요약: total_return_rate={inputs.total_return_rate:.2f}, buckets={dict(inputs.bucket_values)}"""
+    raw = call_llm("리밸런싱 추천 전문가", prompt, agent="rebalancing")
+    if raw and "risk_balance" in raw:
+        return [k for k in REBALANCING_KEYS if k in raw]
+    return None
+
+
+# --- 스냅샷 ---
+
+
+def _now() -> datetime:
+    """TIMESTAMP 컬럼과 비교할 UTC naive 시각 (DB 세션 time_zone = UTC)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def get_latest_snapshot(db: Session, user_id: int) -> Optional[RebalancingSnapshot]:
+    return (
+        db.query(RebalancingSnapshot)
+        .filter(RebalancingSnapshot.user_id == user_id)
+        .order_by(RebalancingSnapshot.created_at.desc())
+        .first()
+    )
+
+
+def get_latest_rebalancing(user_id: int, db: Session) -> List[RebalancingRecommendation] | None:
+    latest = get_latest_snapshot(db, user_id)
+    if not latest:
+        return None
+    return [RebalancingRecommendation(**item) for item in latest.payload]
+
+
+def is_expired(snapshot: RebalancingSnapshot, now: Optional[datetime] = None) -> bool:
+    created_at = snapshot.created_at
+    if not isinstance(created_at, datetime):
+        return True
+    max_age = timedelta(seconds=settings.REBALANCING_SNAPSHOT_MAX_AGE_SECONDS)
+    return (now or _now()) - created_at.replace(tzinfo=None) > max_age
+
+
+def refresh_rebalancing_snapshot(db: Session, user_id: int) -> List[RebalancingRecommendation]:
+    """입력 적재 → (LLM 보정) → 추천 생성 → 스냅샷 저장."""
+    inputs = load_rebalancing_inputs(db, user_id)
+    keys = _refine_keys_with_llm(inputs) or inputs.keys()
+    recos = build_recommendations(keys, inputs)
+    snapshot = RebalancingSnapshot(user_id=user_id, input_key=inputs.input_key())
+    snapshot.payload = [r.model_dump(mode="json") for r in recos]
+    db.add(snapshot)
+    db.commit()
+    logger.info("Rebalancing snapshot refreshed: user_id=%s keys=%s", user_id, keys)
+    return recos
+
+
+def _refresh_in_background(user_id: int) -> None:
+    with _refreshing_lock:
+        if user_id in _refreshing:
+            return
+        _refreshing.add(user_id)
+    db = SessionLocal()
+    try:
+        with llm_lane("batch"):
+            refresh_rebalancing_snapshot(db, user_id)
+    except Exception as exc:
+        logger.warning("Rebalancing refresh failed: user_id=%s error=%s", user_id, exc)
+    finally:
+        db.close()
+        with _refreshing_lock:
+            _refreshing.discard(user_id)
+
+
+def schedule_refresh(db: Session, user_id: int, background_tasks: Optional[BackgroundTasks] = None) -> None:
+    """스냅샷 갱신 예약. 작업 큐가 켜져 있으면 큐로, 아니면 응답 후 BackgroundTasks로."""
+    if settings.JOB_QUEUE_ENABLED:
+        enqueue(db, JOB_KIND_REBALANCING, {"user_id": user_id}, dedup_key=f"{JOB_KIND_REBALANCING}:{user_id}")
+    elif background_tasks is not None:
+        background_tasks.add_task(_refresh_in_background, user_id)
+
+
+def resolve_recommendations(
+    db: Session,
+    user_id: int,
+    inputs: RebalancingInputs,
+    background_tasks: Optional[BackgroundTasks] = None,
+) -> List[RebalancingRecommendation]:
+    """요약 화면용 추천. LLM 호출이나 요약 재생성 없이 스냅샷 조회 한 번."""
+    snapshot = get_latest_snapshot(db, user_id)
+    if snapshot is not None and snapshot.input_key == inputs.input_key():
+        if is_expired(snapshot):
+            schedule_refresh(db, user_id, background_tasks)
+        return [RebalancingRecommendation(**item) for item in snapshot.payload]
+    schedule_refresh(db, user_id, background_tasks)
+    return build_recommendations(inputs.keys(), inputs)
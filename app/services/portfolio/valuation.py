@@ -0,0 +1,279 @@
+"""
+포트폴리오 평가 구체화(materialized) 테이블 유지.
+
+- portfolio_asset_valuations: (user, asset)별 수량·평균 매수가·현재가·평가액·원가
+- portfolio_village_valuations: (user, village)별 평가액·원가 합계
+- 가격 수집(ingest_asset_prices): asset_price upsert 후 가격이 실제로 바뀐 종목의 평가 행만 다시 계산하고,
+  해당 종목이 속한 마을 합계만 평가 행 합으로 다시 계산한다
+- 보유 변경(refresh_user_valuations): 사용자 한 명의 평가 행을 원천(user_portfolio, village_assets)에서 다시 계산
+- 읽기(get_*): (user_id, ...) PK 범위 조회 한 번. 아직 구체화되지 않은 사용자는 첫 조회 때 한 번 채운다
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import bindparam, delete, func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.domain.asset.model import AssetPrice
+from app.domain.portfolio.model import PortfolioAssetValuation, PortfolioVillageValuation, UserPortfolio
+from app.domain.village.model import Village, VillageAsset
+from app.services.portfolio.analytics import Totals
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 1000
+_PRICE_SCALE = 8  # asset_price.price DECIMAL(24, 8)
+
+_asset_table = PortfolioAssetValuation.__table__
+_village_table = PortfolioVillageValuation.__table__
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _chunks(items: Sequence[Any], size: int = _CHUNK) -> Iterable[Sequence[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _upsert(db: Session, table: Any, rows: List[Dict[str, Any]], update_columns: Sequence[str]) -> None:
+    """PK 충돌 시 update_columns만 갱신. 운영은 MySQL, 테스트·로컬은 SQLite."""
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    for chunk in _chunks(rows):
+        if dialect == "sqlite":
+            stmt = sqlite_insert(table).values(list(chunk))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[c.name for c in table.primary_key.columns],
+                set_={c: stmt.excluded[c] for c in update_columns},
+            )
+        else:
+            stmt = mysql_insert(table).values(list(chunk))
+            stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_columns})
+        db.execute(stmt)
+
+
+# --- 가격 수집 ---
+
+
+def ingest_asset_prices(db: Session, price_map: Dict[int, float], commit: bool = True) -> Set[int]:
+    """asset_price upsert + 가격이 바뀐 종목의 평가 갱신. 반환값은 가격이 바뀐 asset_id."""
+    if not price_map:
+        return set()
+    asset_ids = list(price_map)
+    previous: Dict[int, float] = {}
+    for chunk in _chunks(asset_ids):
+        for asset_id, price in db.execute(
+            select(AssetPrice.asset_id, AssetPrice.price).where(AssetPrice.asset_id.in_(chunk))
+        ):
+            previous[int(asset_id)] = float(price)
+    changed = {
+        asset_id: price
+        for asset_id, price in price_map.items()
+        if asset_id not in previous or round(price, _PRICE_SCALE) != round(previous[asset_id], _PRICE_SCALE)
+    }
+
+    now = _now()
+    _upsert(
+        db,
+        AssetPrice.__table__,
+        [{"asset_id": asset_id, "price": price, "as_of": now} for asset_id, price in price_map.items()],
+        ["price", "as_of"],
+    )
+    if changed:
+        apply_price_changes(db, changed, now=now)
+    if commit:
+        db.commit()
+    return set(changed)
+
+
+def apply_price_changes(db: Session, prices: Dict[int, float], now: Optional[datetime] = None) -> int:
+    """
+    가격이 바뀐 종목의 (user, asset) 평가 행만 갱신하고, 그 종목이 속한 (user, village) 합계를 다시 계산한다.
+    마을 합계는 변화분을 더하지 않고 평가 행 합으로 덮어쓰므로, 같은 종목을 동시에 수집해도 중복 반영되지 않는다.
+    구체화되지 않은 사용자(평가 행 없음)는 건드리지 않는다. 반환값은 갱신한 (user, asset) 행 수.
+    """
+    now = now or _now()
+    asset_updates: List[Dict[str, Any]] = []
+    for chunk in _chunks(list(prices)):
+        rows = db.execute(
+            select(
+                PortfolioAssetValuation.user_id,
+                PortfolioAssetValuation.asset_id,
+                PortfolioAssetValuation.quantity,
+            ).where(PortfolioAssetValuation.asset_id.in_(chunk))
+        ).all()
+        for user_id, asset_id, quantity in rows:
+            price = prices[int(asset_id)]
+            asset_updates.append(
+                {"b_user_id": user_id, "b_asset_id": asset_id, "b_price": price, "b_quantity": quantity}
+            )
+    if not asset_updates:
+        return 0
+
+    # 평가액은 행 자신의 수량으로 계산 (읽은 값이 오래됐어도 결과가 같다)
+    db.execute(
+        _asset_table.update()
+        .where(_asset_table.c.user_id == bindparam("b_user_id"), _asset_table.c.asset_id == bindparam("b_asset_id"))
+        .values(price=bindparam("b_price"), market_value=_asset_table.c.quantity * bindparam("b_price"), updated_at=now),
+        asset_updates,
+    )
+
+    user_ids = sorted({int(row["b_user_id"]) for row in asset_updates})
+    village_ids: Set[int] = set()
+    for chunk in _chunks(list(prices)):
+        village_ids.update(
+            int(v)
+            for v in db.execute(
+                select(VillageAsset.village_id)
+                .join(Village, Village.village_id == VillageAsset.village_id)
+                .where(VillageAsset.asset_id.in_(chunk), Village.user_id.in_(user_ids))
+            ).scalars()
+        )
+    if village_ids:
+        member_value = (
+            select(func.coalesce(func.sum(_asset_table.c.market_value), 0))
+            .select_from(_asset_table.join(VillageAsset.__table__, VillageAsset.asset_id == _asset_table.c.asset_id))
+            .where(
+                VillageAsset.village_id == _village_table.c.village_id,
+                _asset_table.c.user_id == _village_table.c.user_id,
+            )
+            .scalar_subquery()
+        )
+        for chunk in _chunks(sorted(village_ids)):
+            db.execute(
+                _village_table.update()
+                .where(_village_table.c.village_id.in_(chunk), _village_table.c.user_id.in_(user_ids))
+                .values(market_value=member_value, updated_at=now)
+            )
+    logger.info(
+        "Valuations updated for price changes: assets=%d holdings=%d villages=%d",
+        len(prices),
+        len(asset_updates),
+        len(village_ids),
+    )
+    return len(asset_updates)
+
+
+# --- 보유 변경 ---
+
+
+def refresh_user_valuations(db: Session, user_id: int, commit: bool = True) -> None:
+    """보유·마을 구성이 바뀐 사용자의 평가 행을 원천에서 다시 계산 (사용자 단위로 교체)."""
+    now = _now()
+    holdings = db.execute(
+        select(UserPortfolio.asset_id, UserPortfolio.quantity, UserPortfolio.avg_buy_price, AssetPrice.price)
+        .outerjoin(AssetPrice, AssetPrice.asset_id == UserPortfolio.asset_id)
+        .where(UserPortfolio.user_id == user_id)
+    ).all()
+    asset_rows: Dict[int, Dict[str, Any]] = {}
+    for asset_id, quantity, avg_buy_price, price in holdings:
+        qty = float(quantity or 0)
+        asset_rows[int(asset_id)] = {
+            "user_id": user_id,
+            "asset_id": int(asset_id),
+            "quantity": qty,
+            "avg_buy_price": float(avg_buy_price or 0),
+            "price": float(price) if price is not None else None,
+            "market_value": qty * float(price or 0),
+            "cost_value": qty * float(avg_buy_price or 0),
+            "updated_at": now,
+        }
+
+    village_rows: Dict[int, Dict[str, Any]] = {
+        int(village_id): {
+            "user_id": user_id,
+            "village_id": int(village_id),
+            "market_value": 0.0,
+            "cost_value": 0.0,
+            "holding_count": 0,
+            "updated_at": now,
+        }
+        for village_id in db.execute(select(Village.village_id).where(Village.user_id == user_id)).scalars()
+    }
+    if village_rows:
+        for village_id, asset_id in db.execute(
+            select(VillageAsset.village_id, VillageAsset.asset_id).where(VillageAsset.village_id.in_(list(village_rows)))
+        ):
+            holding = asset_rows.get(int(asset_id))
+            if holding is None:
+                continue
+            row = village_rows[int(village_id)]
+            row["market_value"] += holding["market_value"]
+            row["cost_value"] += holding["cost_value"]
+            row["holding_count"] += 1
+
+    db.execute(delete(PortfolioAssetValuation).where(PortfolioAssetValuation.user_id == user_id))
+    db.execute(delete(PortfolioVillageValuation).where(PortfolioVillageValuation.user_id == user_id))
+    for chunk in _chunks(list(asset_rows.values())):
+        db.execute(_asset_table.insert(), list(chunk))
+    if village_rows:
+        db.execute(_village_table.insert(), list(village_rows.values()))
+    if commit:
+        db.commit()
+
+
+def rebuild_valuations(db: Session, user_ids: Optional[Sequence[int]] = None) -> int:
+    """전체(또는 지정 사용자) 평가 테이블 재구성. 초기 적재·불일치 복구용. 반환값은 처리한 사용자 수."""
+    if user_ids is None:
+        users = set(db.execute(select(UserPortfolio.user_id).distinct()).scalars())
+        users |= set(db.execute(select(Village.user_id).distinct()).scalars())
+        user_ids = sorted(int(u) for u in users)
+    for user_id in user_ids:
+        refresh_user_valuations(db, int(user_id))
+    return len(user_ids)
+
+
+# --- 읽기 ---
+
+
+def ensure_user_valuations(db: Session, user_id: int) -> bool:
+    """평가 행이 하나도 없는 사용자면 채운다. 새로 채웠으면 True."""
+    exists = db.execute(
+        select(PortfolioAssetValuation.user_id).where(PortfolioAssetValuation.user_id == user_id).limit(1)
+    ).first() or db.execute(
+        select(PortfolioVillageValuation.user_id).where(PortfolioVillageValuation.user_id == user_id).limit(1)
+    ).first()
+    if exists:
+        return False
+    refresh_user_valuations(db, user_id)
+    return True
+
+
+def get_asset_valuations(db: Session, user_id: int) -> List[PortfolioAssetValuation]:
+    rows = db.query(PortfolioAssetValuation).filter(PortfolioAssetValuation.user_id == user_id).all()
+    if not rows and ensure_user_valuations(db, user_id):
+        rows = db.query(PortfolioAssetValuation).filter(PortfolioAssetValuation.user_id == user_id).all()
+    return rows
+
+
+def get_village_valuations(db: Session, user_id: int) -> Dict[int, PortfolioVillageValuation]:
+    rows = db.query(PortfolioVillageValuation).filter(PortfolioVillageValuation.user_id == user_id).all()
+    if not rows and ensure_user_valuations(db, user_id):
+        rows = db.query(PortfolioVillageValuation).filter(PortfolioVillageValuation.user_id == user_id).all()
+    return {int(row.village_id): row for row in rows}
+
+
+def get_user_totals(db: Session, user_id: int) -> Totals:
+    """사용자 전체 평가액·원가 (평가 테이블의 사용자 범위 합계)."""
+    value, cost = db.execute(
+        select(
+            func.coalesce(func.sum(PortfolioAssetValuation.market_value), 0),
+            func.coalesce(func.sum(PortfolioAssetValuation.cost_value), 0),
+        ).where(PortfolioAssetValuation.user_id == user_id)
+    ).one()
+    return Totals(float(value), float(cost))
+
+
+def village_totals(row: Optional[PortfolioVillageValuation]) -> Totals:
+    if row is None:
+        return Totals(0.0, 0.0)
+    return Totals(float(row.market_value or 0), float(row.cost_value or 0))
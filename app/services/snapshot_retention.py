@@ -0,0 +1,205 @@
+"""
+스냅샷 retention / compaction job (briefing_snapshots, rebalancing_snapshots).
+
+1. 압축 도입 전 행(payload_json)을 payload_zlib로 압축
+2. (user, village)별 최신 N개만 hot 테이블에 남기고 나머지는 *_archive 테이블로 이동
+3. (MySQL) 월별 RANGE 파티션을 미리 만들고, 보관 기간이 지난 빈 파티션은 삭제
+
+읽기 경로는 hot 테이블의 payload 속성만 사용하므로 변경 없음.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Sequence, Type
+
+from sqlalchemy import and_, delete, func, insert, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.domain.briefing.model import BriefingSnapshot, BriefingSnapshotArchive
+from app.domain.common.model import encode_payload
+from app.domain.portfolio.model import RebalancingSnapshot, RebalancingSnapshotArchive
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_NAME = re.compile(r"^p(\d{4})(\d{2})$")
+
+
+def compact_legacy_payloads(db: Session, model: Type[Any], batch_size: int) -> int:
+    """payload_json만 있는 행을 압축 형식으로 변환. 변환한 행 수 반환."""
+    total = 0
+    while True:
+        rows = (
+            db.query(model)
+            .filter(model.payload_zlib.is_(None), model.payload_json.isnot(None))
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        for row in rows:
+            row.payload = row.payload_json
+        db.commit()
+        total += len(rows)
+    return total
+
+
+def _move_to_archive(db: Session, model: Type[Any], archive_model: Type[Any], ids: List[int]) -> int:
+    """ids 행을 압축 payload로 archive 테이블에 복사하고 hot 테이블에서 삭제 (같은 트랜잭션)."""
+    columns = [c.name for c in archive_model.__table__.columns if c.name != "archived_at"]
+    rows = db.query(model).filter(model.id.in_(ids)).all()
+    values: List[Dict[str, Any]] = []
+    for row in rows:
+        item = {c: getattr(row, c) for c in columns}
+        if item.get("payload_zlib") is None:
+            item["payload_zlib"] = encode_payload(row.payload_json)
+        item["payload_json"] = None
+        values.append(item)
+    db.execute(insert(archive_model), values)
+    db.execute(delete(model).where(model.id.in_(ids)))
+    db.commit()
+    return len(ids)
+
+
+def archive_old_snapshots(
+    db: Session,
+    model: Type[Any],
+    archive_model: Type[Any],
+    group_by: Sequence[str],
+    keep: int,
+    batch_size: int,
+) -> int:
+    """
+    group_by 키별 최신 keep개를 제외한 행을 archive 테이블로 이동. 이동한 행 수 반환.
+    순위 계산(row_number)은 한 번만: 그룹별 (keep+1)번째 행을 기준점으로 잡고,
+    그 이하 (created_at, id) 행을 그룹 인덱스로 batch_size씩 옮긴다. 실행 중 새로 들어온 행은 기준점보다 최신이라 영향 없음.
+    """
+    keys = [getattr(model, c) for c in group_by]
+    ranked = select(
+        *keys,
+        model.created_at,
+        model.id,
+        func.row_number()
+        .over(partition_by=keys, order_by=(model.created_at.desc(), model.id.desc()))
+        .label("rn"),
+    ).subquery()
+    cutoffs = db.execute(
+        select(*[ranked.c[c] for c in group_by], ranked.c.created_at, ranked.c.id).where(ranked.c.rn == keep + 1)
+    ).all()
+
+    total = 0
+    for row in cutoffs:
+        *group, created_at, cutoff_id = row
+        older = and_(
+            *(key == value for key, value in zip(keys, group)),
+            or_(model.created_at < created_at, and_(model.created_at == created_at, model.id <= cutoff_id)),
+        )
+        while True:
+            ids = list(db.execute(select(model.id).where(older).order_by(model.id).limit(batch_size)).scalars())
+            if not ids:
+                break
+            total += _move_to_archive(db, model, archive_model, ids)
+    return total
+
+
+def _month_start(year: int, month: int) -> date:
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return date(year, month, 1)
+
+
+def _partition_names(db: Session, table: str) -> List[str]:
+    rows = db.execute(
+        text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"table": table},
+    ).scalars()
+    return list(rows)
+
+
+def maintain_partitions(db: Session, table: str, months_ahead: int, keep_months: int) -> Dict[str, List[str]]:
+    """MySQL 월별 파티션 유지: 앞으로 months_ahead개월치 생성, keep_months 이전의 빈 파티션 삭제."""
+    result: Dict[str, List[str]] = {"added": [], "dropped": []}
+    if db.get_bind().dialect.name != "mysql":
+        return result
+    names = _partition_names(db, table)
+    if "pmax" not in names:
+        logger.warning("Table %s is not partitioned; skipping partition maintenance.", table)
+        return result
+
+    today = datetime.now(timezone.utc).date()
+    for offset in range(months_ahead + 1):
+        start = _month_start(today.year, today.month + offset)
+        name = f"p{start.year:04d}{start.month:02d}"
+        if name in names:
+            continue
+        end = _month_start(start.year, start.month + 1)
+        db.execute(
+            text(
+                f"ALTER TABLE {table} REORGANIZE PARTITION pmax INTO ("
+                f"PARTITION {name} VALUES LESS THAN (UNIX_TIMESTAMP('{end.isoformat()} 00:00:00')), "
+                "PARTITION pmax VALUES LESS THAN MAXVALUE)"
+            )
+        )
+        result["added"].append(name)
+
+    cutoff = _month_start(today.year, today.month - keep_months)
+    for name in names:
+        m = _PARTITION_NAME.match(name)
+        if not m or date(int(m.group(1)), int(m.group(2)), 1) >= cutoff:
+            continue
+        if db.execute(text(f"SELECT 1 FROM {table} PARTITION ({name}) LIMIT 1")).first():
+            continue
+        db.execute(text(f"ALTER TABLE {table} DROP PARTITION {name}"))
+        result["dropped"].append(name)
+    return result
+
+
+def run_snapshot_retention() -> Dict[str, Any]:
+    """retention job 엔트리 (블로킹)."""
+    if not settings.DB_ENABLED:
+        logger.warning("DB disabled; skipping snapshot retention.")
+        return {}
+    batch = settings.SNAPSHOT_RETENTION_BATCH_SIZE
+    targets = [
+        (BriefingSnapshot, BriefingSnapshotArchive, ("user_id", "village_id"), settings.BRIEFING_SNAPSHOT_KEEP_PER_VILLAGE),
+        (RebalancingSnapshot, RebalancingSnapshotArchive, ("user_id",), settings.REBALANCING_SNAPSHOT_KEEP_PER_USER),
+    ]
+    report: Dict[str, Any] = {}
+    db = SessionLocal()
+    try:
+        for model, archive_model, group_by, keep in targets:
+            table = model.__tablename__
+            try:
+                report[table] = {
+                    "compacted": compact_legacy_payloads(db, model, batch),
+                    "archived": archive_old_snapshots(db, model, archive_model, group_by, keep, batch),
+                    "partitions": maintain_partitions(
+                        db,
+                        table,
+                        months_ahead=settings.SNAPSHOT_PARTITION_MONTHS_AHEAD,
+                        keep_months=settings.SNAPSHOT_PARTITION_KEEP_MONTHS,
+                    ),
+                }
+            except Exception:
+                db.rollback()
+                logger.exception("Snapshot retention failed for %s", table)
+        logger.info("Snapshot retention finished: %s", report)
+        return report
+    finally:
+        db.close()
+
+
+def run_scheduled_snapshot_retention() -> None:
+    """APScheduler job 엔트리."""
+    try:
+        run_snapshot_retention()
+    except Exception as e:
+        logger.exception("Scheduled snapshot retention failed: %s", e)
@@ -65,7 +65,7 @@ def generate_village_one_liner(village_id: int) -> None:
             village.village_profile,
             assets,
         )
-        raw = call_llm("마을 한줄평 생성기", prompt)
+        raw = call_llm("마을 한줄평 생성기", prompt, agent="village_one_liner")
         text = (raw or "").strip()
         if not text:
             text = FALLBACK_ONE_LINER
@@ -1,19 +1,32 @@
 """
 매일 아침 8시 브리핑 생성 백그라운드 작업 엔트리 포인트.
 
-- CLI: python -m app.tasks.briefing_task
+- CLI: python -m app.tasks.briefing_task (기본: 활성 (user, village) 쌍 전체, 현재 슬롯)
+- 선택: --users 1,5-9 --villages 101 / --pairs-file pairs.txt (한 줄에 "user_id,village_id", "-"는 stdin)
+- 동시성: --concurrency 16, 이번 슬롯 스냅샷이 이미 있는 쌍은 건너뜀 (--no-resume이면 전부 재생성)
 - Celery: app.tasks.briefing_task.run_morning_briefing.delay()
-- Cron: 0 8 * * * cd /path && python -m app.tasks.briefing_task
+- Cron: 0 8 * * * cd /path && python -m app.tasks.briefing_task --time-slot morning
 """
 
+import argparse
 import asyncio
+import json
 import logging
-from typing import Any, Dict, Optional
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
 from app.core.database import SessionLocal
 from app.domain.briefing.schema.request import BriefingGenerateRequest
 from app.domain.briefing.schema.response import BriefingGenerateResponse
+from app.domain.village.model import Village
 from app.services.briefing import generate_briefing
+from app.services.briefing.batch import Pair, list_active_pairs, run_batch_briefing
+from app.services.briefing.llm import llm_lane
+from app.services.briefing.scheduled_briefing import current_time_slot
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +42,8 @@ async def _generate_briefing_async(
     req = BriefingGenerateRequest(user_id=user_id, village_id=village_id, time_slot=time_slot)
     db = SessionLocal()
     try:
-        return await generate_briefing(req, db=db)
+        with llm_lane("batch"):
+            return await generate_briefing(req, db=db)
     except Exception as e:
         logger.exception("Briefing generation failed: %s", e)
         return None
@@ -66,15 +80,97 @@ def run_morning_briefing(
     return result.model_dump()
 
 
-def main() -> None:
+def parse_ids(spec: str) -> List[int]:
+    """"1,5-9" → [1, 5, 6, 7, 8, 9]"""
+    ids: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = (int(x) for x in part.split("-", 1))
+            ids.extend(range(lo, hi + 1))
+        else:
+            ids.append(int(part))
+    return list(dict.fromkeys(ids))
+
+
+def parse_pairs(lines: Iterable[str]) -> List[Pair]:
+    """한 줄에 "user_id,village_id" (공백·탭 구분도 허용). 빈 줄과 #주석은 무시."""
+    pairs: List[Pair] = []
+    for lineno, line in enumerate(lines, start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        fields = line.replace(",", " ").split()
+        if len(fields) != 2:
+            raise ValueError(f"line {lineno}: expected 'user_id,village_id', got {line!r}")
+        pairs.append((int(fields[0]), int(fields[1])))
+    return list(dict.fromkeys(pairs))
+
+
+def select_pairs(
+    db: Session,
+    user_ids: Optional[Sequence[int]] = None,
+    village_ids: Optional[Sequence[int]] = None,
+) -> List[Pair]:
+    """선택자가 없으면 활성 쌍 전체, 있으면 해당 사용자/마을의 (user_id, village_id) 전체."""
+    if not user_ids and not village_ids:
+        return list_active_pairs(db)
+    query = select(Village.user_id, Village.village_id)
+    if user_ids:
+        query = query.where(Village.user_id.in_(list(user_ids)))
+    if village_ids:
+        query = query.where(Village.village_id.in_(list(village_ids)))
+    rows = db.execute(query.order_by(Village.user_id, Village.village_id)).all()
+    return [(int(u), int(v)) for u, v in rows]
+
+
+def _load_pairs(args: argparse.Namespace) -> List[Pair]:
+    if args.pairs_file:
+        if args.pairs_file == "-":
+            return parse_pairs(sys.stdin)
+        with open(args.pairs_file, encoding="utf-8") as f:
+            return parse_pairs(f)
+    db = SessionLocal()
+    try:
+        return select_pairs(db, parse_ids(args.users), parse_ids(args.villages))
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """CLI: python -m app.tasks.briefing_task"""
+    parser = argparse.ArgumentParser(description="Bulk briefing generation")
+    parser.add_argument("--users", default="", help="사용자 id (쉼표·범위, 예: 1,5-9)")
+    parser.add_argument("--villages", default="", help="마을 id (쉼표·범위)")
+    parser.add_argument("--pairs-file", default="", help='"user_id,village_id" 줄 목록 파일 ("-"는 stdin)')
+    parser.add_argument("--time-slot", choices=["morning", "evening"], default=None, help="기본: 현재 시각 기준")
+    parser.add_argument("--concurrency", type=int, default=settings.BRIEFING_BATCH_CONCURRENCY)
+    parser.add_argument("--no-resume", action="store_true", help="이번 슬롯 스냅샷이 있어도 다시 생성")
+    args = parser.parse_args(argv)
+    if args.pairs_file and (args.users or args.villages):
+        parser.error("--pairs-file cannot be combined with --users/--villages")
+
     logging.basicConfig(level=logging.INFO)
-    out = run_morning_briefing(user_id=1, village_id=101, time_slot="morning")
-    if out:
-        logger.info("Briefing generated. keys=%s", list(out.keys()))
-    else:
-        logger.warning("Briefing generation returned nothing.")
+    time_slot = args.time_slot or current_time_slot()
+    try:
+        pairs = _load_pairs(args)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    stats = run_batch_briefing(
+        time_slot,
+        pairs=pairs,
+        max_workers=args.concurrency,
+        skip_existing=not args.no_resume,
+    )
+    if stats is None:
+        logger.warning("Bulk briefing did not run.")
+        return 1
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+    return 1 if stats["failed"] else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
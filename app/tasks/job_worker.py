@@ -0,0 +1,41 @@
+"""
+작업 큐(jobs 테이블) 워커 프로세스 엔트리 포인트.
+
+- CLI: python -m app.tasks.job_worker --concurrency 4
+- 특정 작업만: python -m app.tasks.job_worker --kinds briefing.generate,village.one_liner
+"""
+
+import argparse
+import logging
+import signal
+
+from app.core.config import settings
+from app.services.jobs.handlers import HANDLERS
+from app.services.jobs.worker import JobWorker
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    """CLI: python -m app.tasks.job_worker"""
+    parser = argparse.ArgumentParser(description="DB job queue worker")
+    parser.add_argument("--kinds", default="", help=f"쉼표로 구분 (기본: 전체 {', '.join(HANDLERS)})")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY)
+    parser.add_argument("--poll-interval", type=float, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()] or None
+    worker = JobWorker(kinds=kinds, concurrency=args.concurrency, poll_interval=args.poll_interval)
+
+    def _shutdown(signum, _frame) -> None:
+        logger.info("Signal %s received; finishing in-flight jobs.", signum)
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
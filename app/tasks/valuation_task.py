@@ -0,0 +1,38 @@
+"""
+포트폴리오 평가 테이블(portfolio_asset_valuations, portfolio_village_valuations) 재구성.
+
+- CLI: python -m app.tasks.valuation_task            (전체 사용자)
+- 일부: python -m app.tasks.valuation_task --users 1,5-9
+평소에는 가격 수집·보유 변경 시 증분 갱신되므로, 초기 적재나 불일치 복구 때만 실행.
+"""
+
+import argparse
+import logging
+import time
+from typing import List, Optional
+
+from app.core.database import SessionLocal
+from app.services.portfolio.valuation import rebuild_valuations
+from app.tasks.briefing_task import parse_ids
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI: python -m app.tasks.valuation_task"""
+    parser = argparse.ArgumentParser(description="Rebuild materialized portfolio valuations")
+    parser.add_argument("--users", default="", help="사용자 id (쉼표·범위, 기본: 전체)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        count = rebuild_valuations(db, parse_ids(args.users) or None)
+    finally:
+        db.close()
+    logger.info("Valuations rebuilt: users=%d elapsed=%.1fs", count, time.monotonic() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import BigInteger, create_engine, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import Pool, StaticPool
+
+from app.core import database
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(_type, _compiler, **_kw):
+    # sqlite는 INTEGER PRIMARY KEY만 자동 증가
+    return "INTEGER"
+
+
+@pytest.fixture
+def sqlite_sessions():
+    """
+    sqlite 메모리 DB 생성기. sqlite_sessions(Model, ...) → 해당 테이블만 만든 sessionmaker.
+    엔진은 factory.kw["bind"]. MySQL 전용 connect 훅(SET time_zone)은 테스트 동안 해제.
+    """
+    engines = []
+    event.remove(Pool, "connect", database.set_mysql_pragma)
+
+    def make(*models):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        for model in models:
+            model.__table__.create(engine)
+        engines.append(engine)
+        return sessionmaker(bind=engine)
+
+    try:
+        yield make
+    finally:
+        for engine in engines:
+            engine.dispose()
+        event.listen(Pool, "connect", database.set_mysql_pragma)
+
+
+class NullSession:
+    """DB를 쓰지 않는 테스트용 SessionLocal 대체 (close만 지원)."""
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def session_local(sqlite_sessions, monkeypatch):
+    """
+    session_local(module, Model, ...) → module.SessionLocal을 해당 테이블의 sqlite sessionmaker로 바꾸고 반환.
+    모델 없이 부르면 NullSession으로 바꾼다.
+    """
+
+    def patch(module, *models):
+        factory = sqlite_sessions(*models) if models else NullSession
+        monkeypatch.setattr(module, "SessionLocal", factory)
+        return factory
+
+    return patch
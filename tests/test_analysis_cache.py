@@ -0,0 +1,36 @@
+from app.services.briefing.agents import news_agent
+from app.services.briefing.analysis_cache import news_analysis_cache
+
+
+def test_news_analysis_shared_across_input_order(monkeypatch):
+    calls = []
+
+    def fake_call_llm(system_prompt, user_prompt, **kwargs):
+        calls.append(user_prompt)
+        return '{"market_sentiment": "중립", "key_headlines": [{"title": "B", "news_index": 1}]}'
+
+    monkeypatch.setattr(news_agent, "call_llm", fake_call_llm)
+    news_analysis_cache.clear()
+    a = {"title": "A", "summary": "a", "link": "https://x/a"}
+    b = {"title": "B", "summary": "b", "link": "https://x/b"}
+
+    first = news_agent.analyze_news_data([a, b], ["NVDA", "AAPL"], user_name="u1")
+    second = news_agent.analyze_news_data([b, a, b], ["aapl", "NVDA"], user_name="u2")
+
+    assert len(calls) == 1
+    # news_index는 각 호출자의 뉴스 목록 기준으로 돌려준다
+    assert first["key_headlines"][0]["news_index"] == 1
+    assert second["key_headlines"][0]["news_index"] == 0
+
+
+def test_normalized_news_keeps_ticker_attribution():
+    from app.services.briefing.analysis_cache import fingerprint, normalize_news
+
+    a = {"title": "A", "link": "https://x/a", "tickers": ["NVDA"], "published": 1}
+    other_ticker = {**a, "tickers": ["AMD"]}
+    assert fingerprint(normalize_news([a])[0]) != fingerprint(normalize_news([other_ticker])[0])
+
+    # 같은 기사가 종목별로 두 번 수집되면 귀속 종목을 합친다
+    normalized, index_map = normalize_news([other_ticker, a])
+    assert normalized[0]["tickers"] == ["AMD", "NVDA"] and index_map == [0]
+    assert normalized == normalize_news([a, other_ticker])[0]
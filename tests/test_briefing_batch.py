@@ -0,0 +1,63 @@
+import pytest
+
+from app.domain.briefing.model import BriefingSnapshot
+from app.domain.briefing.schema.request import BriefingGenerateRequest
+from app.services.briefing import batch
+from app.services.briefing.idempotency import idempotency_key
+from app.services.market_data import MarketSnapshot
+
+
+@pytest.fixture
+def generated(monkeypatch, session_local):
+    """DB·시세 준비 단계를 대체하고 생성한 쌍을 기록. user_id 99는 실패."""
+    pairs = []
+
+    async def fake_generate(req, db, village_prompts=None, market=None, idempotency_key=None):
+        if req.user_id == 99:
+            raise RuntimeError("boom")
+        pairs.append((req.user_id, req.village_id))
+
+    monkeypatch.setattr(batch.settings, "DB_ENABLED", True)
+    session_local(batch, BriefingSnapshot)
+    monkeypatch.setattr(batch, "prefetch_market_for_villages", lambda db, ids: MarketSnapshot())
+    monkeypatch.setattr(batch.prompt_registry, "resolve_villages", lambda ids: {v: None for v in ids})
+    monkeypatch.setattr(batch.fragment_store, "get_fragments", lambda quotes, slot, db=None: None)
+    monkeypatch.setattr(batch, "generate_briefing", fake_generate)
+    return pairs
+
+
+def _assert_finished(stats):
+    assert (stats["running"], stats["stage"]) == (False, "finished")
+    assert stats["finished_at"] is not None
+    assert stats == batch.get_batch_progress()
+
+
+def test_skip_existing_uses_slot_idempotency_keys(generated):
+    db = batch.SessionLocal()
+    req = BriefingGenerateRequest(user_id=1, village_id=101, time_slot="morning")
+    db.add(BriefingSnapshot(user_id=1, village_id=101, time_slot="morning", idempotency_key=idempotency_key(req), payload={}))
+    db.commit()
+    db.close()
+
+    stats = batch.run_batch_briefing("morning", pairs=[(1, 101), (2, 102), (1, 101)], skip_existing=True)
+    assert generated == [(2, 102)]
+    assert (stats["total"], stats["done"], stats["skipped"]) == (1, 1, 1)
+    _assert_finished(stats)
+
+    # 다른 슬롯 스냅샷은 건너뛰지 않음
+    batch.run_batch_briefing("evening", pairs=[(1, 101)], skip_existing=True)
+    assert generated[-1] == (1, 101)
+
+
+def test_empty_pairs_finish_without_prefetch(generated, monkeypatch):
+    monkeypatch.setattr(batch, "prefetch_market_for_villages", lambda db, ids: pytest.fail("prefetch"))
+    stats = batch.run_batch_briefing("morning", pairs=[])
+    assert (stats["total"], stats["done"], stats["pairs_per_second"]) == (0, 0, 0.0)
+    _assert_finished(stats)
+
+
+def test_failed_pairs_are_recorded(generated):
+    stats = batch.run_batch_briefing("morning", pairs=[(1, 101), (99, 199)], max_workers=2)
+    assert generated == [(1, 101)]
+    assert (stats["done"], stats["failed"], stats["failed_pairs"]) == (2, 1, [(99, 199)])
+    _assert_finished(stats)
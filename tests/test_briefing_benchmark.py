@@ -0,0 +1,36 @@
+import pytest
+
+from app.core.config import settings
+from app.tasks.briefing_benchmark import (
+    BenchmarkDatabaseError,
+    LatencyProfile,
+    StageTimer,
+    bench_user_ids,
+    check_benchmark_url,
+    percentiles,
+)
+
+
+def test_percentiles_and_recorded_latencies():
+    summary = percentiles([i / 1000.0 for i in range(1, 101)])
+    assert (summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]) == (50.0, 95.0, 99.0)
+
+    profile = LatencyProfile({"llm": [5, 7]}, seed=1)
+    assert {profile.sample_ms("llm") for _ in range(20)} <= {5.0, 7.0}
+
+
+def test_stage_timer_wraps_calls():
+    timer = StageTimer()
+    double = timer.wrap("double", lambda x: x * 2)
+    assert double(2) == 4 and double(3) == 6
+    assert timer.summary()["double"]["count"] == 2
+
+
+def test_benchmark_refuses_non_bench_databases(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", "mysql+pymysql://u:p@db:3306/kami_bench")
+    with pytest.raises(BenchmarkDatabaseError):
+        check_benchmark_url("mysql+pymysql://u:p@db:3306/kami")
+    with pytest.raises(BenchmarkDatabaseError):
+        check_benchmark_url("mysql+pymysql://u:p@db:3306/kami_bench")
+    check_benchmark_url("mysql+pymysql://u:p@localhost:3306/kami_bench")
+    assert bench_user_ids(900000, 3) == [900000, 900001, 900002]
@@ -0,0 +1,37 @@
+import asyncio
+
+from app.domain.briefing.schema.request import BriefingGenerateRequest
+from app.services.briefing import idempotency
+
+
+def test_key_is_scoped_by_request_and_client_key():
+    req = BriefingGenerateRequest(user_id=1, village_id=2, time_slot="morning")
+    assert idempotency.idempotency_key(req) == idempotency.idempotency_key(req.model_copy())
+    assert idempotency.idempotency_key(req) != idempotency.idempotency_key(req.model_copy(update={"village_id": 3}))
+    other_user = req.model_copy(update={"user_id": 9})
+    assert idempotency.idempotency_key(req, "abc") != idempotency.idempotency_key(other_user, "abc")
+    assert idempotency.idempotency_key(req, "abc") == idempotency.idempotency_key(req.model_copy(), "abc")
+    for update in ({"village_id": 3}, {"time_slot": "evening"}):
+        assert idempotency.idempotency_key(req, "abc") != idempotency.idempotency_key(req.model_copy(update=update), "abc")
+
+
+def test_concurrent_calls_share_one_generation(monkeypatch, session_local):
+    calls = []
+
+    async def fake_generate(req, db, idempotency_key=None):
+        calls.append(idempotency_key)
+        await asyncio.sleep(0.05)
+        return "response"
+
+    monkeypatch.setattr(idempotency, "generate_briefing", fake_generate)
+    session_local(idempotency)
+    monkeypatch.setattr(idempotency, "find_snapshot", lambda db, user_id, key: None)
+    req = BriefingGenerateRequest(user_id=1, village_id=2)
+
+    async def run():
+        return await asyncio.gather(*(idempotency.generate_briefing_idempotent(req, db=None) for _ in range(3)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert sorted(replayed for _r, replayed in results) == [False, True, True]
+    assert not idempotency._inflight
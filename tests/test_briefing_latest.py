@@ -0,0 +1,26 @@
+from fastapi.testclient import TestClient
+
+from app.core.database import get_db
+from app.main import app
+from app.services.briefing.snapshot_cache import latest_snapshot_cache
+
+client = TestClient(app)
+
+
+class _NoDB:
+    def __getattr__(self, name):
+        raise AssertionError("cache hit must not touch the DB")
+
+
+def test_latest_served_from_serialized_cache():
+    app.dependency_overrides[get_db] = _NoDB
+    try:
+        body = '{"user_id":1,"village":{"name":"내 포트폴리오"}}'.encode("utf-8")
+        latest_snapshot_cache.put(1, 101, body)
+        res = client.get("/api/v1/briefing/latest", params={"user_id": 1, "village_id": 101})
+        assert res.status_code == 200
+        assert res.headers["content-type"] == "application/json"
+        assert res.content == body
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        latest_snapshot_cache.invalidate(1, 101)
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+import pytest
+
+from app.core import briefing_store as store_module
+from app.domain.briefing.model import ScheduledSummary
+
+
+@pytest.fixture
+def store(session_local, monkeypatch):
+    session_local(store_module, ScheduledSummary)
+    monkeypatch.setattr(store_module.settings, "DB_ENABLED", True)
+    return store_module.BriefingStore(ttl_seconds=60, max_entries=100)
+
+
+def test_other_process_reads_from_db(store):
+    store.set("morning", tickers=["AAPL"], user_id=1, time_slot="morning", generated_at=datetime(2026, 1, 2, 0, 0))
+    store.set("evening", user_id=1, time_slot="evening", generated_at=datetime(2026, 1, 2, 8, 0))
+    # 같은 키 재저장은 upsert
+    store.set("morning v2", tickers=["AAPL"], user_id=1, time_slot="morning", generated_at=datetime(2026, 1, 2, 1, 0))
+
+    other = store_module.BriefingStore(ttl_seconds=60, max_entries=100)
+    assert other.get(user_id=1, time_slot="morning")["summary"] == "morning v2"
+    assert other.get(user_id=1)["summary"] == "evening"
+    assert other.get(user_id=2) is None
+    assert other.stats()["misses"] == 3
+    assert other.get(user_id=1, time_slot="morning")["tickers"] == ["AAPL"]
+    assert other.stats()["hits"] == 1
@@ -0,0 +1,42 @@
+import pytest
+
+from app.services.briefing import batch
+from app.services.market_data import MarketSnapshot
+from app.tasks import briefing_task
+
+
+def test_parse_selectors():
+    assert briefing_task.parse_ids("1, 5-7,5") == [1, 5, 6, 7]
+    assert briefing_task.parse_pairs(["# user,village", "1,101", "2\t102  # tab", "", "1,101"]) == [(1, 101), (2, 102)]
+    with pytest.raises(ValueError):
+        briefing_task.parse_pairs(["1,2,3"])
+
+
+def test_batch_resumes_and_reports_throughput(monkeypatch, session_local):
+    generated = []
+
+    async def fake_generate(req, db, village_prompts=None, market=None, idempotency_key=None):
+        assert idempotency_key
+        generated.append((req.user_id, req.village_id))
+
+    monkeypatch.setattr(batch.settings, "DB_ENABLED", True)
+    session_local(batch)
+    monkeypatch.setattr(batch, "find_generated_pairs", lambda db, pairs, slot: {(1, 101)})
+    monkeypatch.setattr(batch, "prefetch_market_for_villages", lambda db, ids: MarketSnapshot())
+    monkeypatch.setattr(batch.prompt_registry, "resolve_villages", lambda ids: {v: None for v in ids})
+    monkeypatch.setattr(batch.fragment_store, "get_fragments", lambda quotes, slot, db=None: None)
+    monkeypatch.setattr(batch, "generate_briefing", fake_generate)
+
+    pairs = [(1, 101), (2, 102), (3, 103), (4, 104)]
+    stats = batch.run_batch_briefing("morning", pairs=pairs, max_workers=2, skip_existing=True)
+
+    assert sorted(generated) == [(2, 102), (3, 103), (4, 104)]
+    assert stats["skipped"] == 1
+    assert stats["total"] == stats["done"] == 3
+    assert stats["failed"] == 0
+    assert stats["pairs_per_second"] > 0
+    assert stats["latency_p95_ms"] is not None
+    # 반환값은 종료 후 상태
+    assert (stats["running"], stats["stage"]) == (False, "finished")
+    assert stats["finished_at"] is not None
+    assert stats == batch.get_batch_progress()
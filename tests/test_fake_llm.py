@@ -0,0 +1,74 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services.briefing import fake_llm
+from app.services.briefing.agents.news_agent import NEWS_RELEVANCE_SYSTEM_PROMPT, NEWS_SYSTEM_PROMPT, _build_news_prompt
+from app.services.briefing.agents.orchestrator import ORCHESTRATOR_SYSTEM_PROMPT
+from app.services.briefing.agents.stock_agent import STOCK_SYSTEM_PROMPT, _build_stock_prompt
+from app.services.briefing.fragments import TICKER_FRAGMENT_SYSTEM_PROMPT, _build_fragment_prompt
+from app.services.briefing.json_stream import extract_json
+from app.services.briefing.parser import parse_briefing_response
+from app.services.market_data import TickerQuote
+
+QUOTES = [
+    TickerQuote(ticker="AAPL", price=190.0, change_percent=1.25, previous_close=187.7),
+    TickerQuote(ticker="TSLA", price=240.0, change_percent=-2.5, previous_close=246.2),
+]
+NEWS = [{"index": 0, "title": "Apple beats"}, {"index": 1, "title": "Tesla recalls"}]
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(fake_llm, "time", SimpleNamespace(sleep=recorded.append))
+    monkeypatch.setattr(settings, "FAKE_LLM_ERROR_RATE", 0.0)
+    return recorded
+
+
+def _text(system_prompt, user_prompt):
+    return fake_llm.call_fake(system_prompt, user_prompt, temperature=None).text
+
+
+def test_agents_get_parseable_responses(sleeps):
+    relevance = extract_json(_text(NEWS_RELEVANCE_SYSTEM_PROMPT, f"### 뉴스 목록\n{json.dumps(NEWS)}"))
+    assert set(relevance["relevant_indices"]) <= {0, 1}
+
+    news = extract_json(_text(NEWS_SYSTEM_PROMPT, _build_news_prompt(NEWS, ["AAPL", "TSLA"], "morning")))
+    assert set(news["ticker_specific"]) == {"AAPL", "TSLA"}
+    assert [h["title"] for h in news["key_headlines"]] == ["Apple beats", "Tesla recalls"]
+
+    stock = extract_json(_text(STOCK_SYSTEM_PROMPT, _build_stock_prompt(QUOTES, [], "user", "morning")))
+    assert {"market_summary", "portfolio_performance", "key_movers", "technical_insights"} <= set(stock)
+
+    fragment = _text(TICKER_FRAGMENT_SYSTEM_PROMPT, _build_fragment_prompt(QUOTES[1], "evening"))
+    assert fragment.startswith("TSLA") and "-2.50%" in fragment
+
+    voice, visual = parse_briefing_response(_text(ORCHESTRATOR_SYSTEM_PROMPT, "저녁 브리핑"))
+    assert voice.startswith("오늘 하루 수고하셨습니다.")
+    assert {"advice", "checklist", "stock_rationales"} <= set(visual)
+
+    assert _text("리밸런싱 추천 전문가", "요약").startswith("risk_balance")
+
+
+def test_latency_and_errors_are_deterministic_per_prompt(sleeps, monkeypatch):
+    monkeypatch.setattr(settings, "FAKE_LLM_LATENCY_MEDIAN_MS", 100.0)
+    assert _text(STOCK_SYSTEM_PROMPT, "a") == _text(STOCK_SYSTEM_PROMPT, "a")
+    _text(STOCK_SYSTEM_PROMPT, "b")
+    assert sleeps[0] == sleeps[1] != sleeps[2]
+    assert all(0 < s <= settings.FAKE_LLM_LATENCY_MAX_MS / 1000.0 for s in sleeps)
+
+    monkeypatch.setattr(settings, "FAKE_LLM_ERROR_RATE", 0.5)
+
+    def fails(prompt):
+        try:
+            _text(STOCK_SYSTEM_PROMPT, prompt)
+            return False
+        except fake_llm.FakeLLMError:
+            return True
+
+    outcomes = [fails(f"p{i}") for i in range(20)]
+    assert outcomes == [fails(f"p{i}") for i in range(20)]
+    assert any(outcomes) and not all(outcomes)
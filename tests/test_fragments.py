@@ -0,0 +1,48 @@
+from app.core.config import settings
+from app.services.briefing import fragments as fragments_module
+from app.services.briefing.agents.stock_agent import assemble_stock_analysis
+from app.services.market_data import TickerQuote
+
+
+def test_fragments_generated_once_per_ticker(monkeypatch):
+    calls = []
+
+    def fake_call_llm(system_prompt, user_prompt, **kwargs):
+        calls.append(user_prompt)
+        return "NVDA는 2.50% 상승했습니다."
+
+    monkeypatch.setattr(fragments_module, "call_llm", fake_call_llm)
+    monkeypatch.setattr(settings, "TICKER_FRAGMENT_MODE", "llm")
+    store = fragments_module.FragmentStore()
+    quotes = [
+        TickerQuote(ticker="NVDA", price=100.0, change_percent=2.5),
+        TickerQuote(ticker="AAPL", price=200.0, change_percent=None),
+    ]
+
+    first = store.get_fragments(quotes, "morning")
+    second = store.get_fragments(quotes[:1], "morning")
+
+    # 등락률이 없는 종목은 LLM 없이 템플릿
+    assert len(calls) == 1
+    assert first["NVDA"].source == "llm"
+    assert first["AAPL"].source == "template"
+    assert second["NVDA"] is first["NVDA"]
+
+    analysis = assemble_stock_analysis(quotes, first)
+    assert analysis["key_movers"] == ["가장 큰 상승 종목: NVDA는 2.50% 상승했습니다."]
+    assert analysis["ticker_notes"]["AAPL"] == "AAPL: 시세 데이터 부족"
+
+    # 등락률이 바뀌면 이전 노트를 재사용하지 않음
+    moved = store.get_fragments([TickerQuote(ticker="NVDA", price=98.0, change_percent=-1.2)], "morning")
+    assert len(calls) == 2 and moved["NVDA"].change_percent == -1.2
+
+
+def test_key_movers_label_follows_sign():
+    quotes = [TickerQuote(ticker="A", change_percent=-0.5), TickerQuote(ticker="B", change_percent=-3.0)]
+    assert assemble_stock_analysis(quotes, {})["key_movers"] == ["가장 큰 하락 종목: B -3.00%"]
+
+    quotes = [TickerQuote(ticker="A", change_percent=1.0), TickerQuote(ticker="B", change_percent=-3.0)]
+    assert assemble_stock_analysis(quotes, {})["key_movers"] == ["가장 큰 상승 종목: A +1.00%", "가장 큰 하락 종목: B -3.00%"]
+
+    flat = assemble_stock_analysis([TickerQuote(ticker="A", change_percent=0.0)], {})
+    assert flat["key_movers"] == ["가장 큰 변동 종목: A +0.00%"]
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+from app.domain.common.model import decode_payload
+from app.services.briefing.incremental import StageCache
+
+
+def test_unchanged_stage_reuses_previous_output():
+    calls = []
+    first = StageCache()
+    assert first.run("news", "fp1", lambda: calls.append(1) or {"summary": "a"}) == {"summary": "a"}
+    # 실패(None)는 저장하지 않음
+    assert first.run("stock", "fp2", lambda: None) is None
+
+    state = decode_payload(first.encode())
+    second = StageCache(previous=state["stages"])
+    assert second.run("news", "fp1", lambda: calls.append(2) or {"summary": "b"}) == {"summary": "a"}
+    assert second.run("stock", "fp2", lambda: {"market_summary": "ok"}) == {"market_summary": "ok"}
+    assert second.run("news", "fp1-changed", lambda: {"summary": "c"}) == {"summary": "c"}
+    assert calls == [1]
+    assert second.reused == ["news"]
+
+
+def test_arun_keeps_event_loop_responsive():
+    release = threading.Event()
+    ticks = []
+
+    def blocking_compute():
+        # dispatcher 슬롯 대기처럼 스레드를 막는 호출
+        return {"released": release.wait(1)}
+
+    async def main():
+        cache = StageCache()
+        task = asyncio.create_task(cache.arun("news", "fp", blocking_compute))
+        for _ in range(3):
+            await asyncio.sleep(0.01)
+            ticks.append(1)
+        release.set()
+        result = await task
+        return cache, result
+
+    cache, result = asyncio.run(main())
+    # compute가 루프 스레드에서 돌았다면 release.set()에 도달하지 못해 False
+    assert result == {"released": True}
+    assert ticks == [1, 1, 1]
+    assert cache.current["news"] == {"fp": "fp", "output": {"released": True}}
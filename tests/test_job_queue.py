@@ -0,0 +1,60 @@
+import pytest
+
+from app.core.config import settings
+from app.domain.job.model import Job
+from app.services.jobs import queue
+
+
+@pytest.fixture
+def db(sqlite_sessions):
+    session = sqlite_sessions(Job)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def test_dedup_claim_retry_and_complete(db, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 0.0)
+    first = queue.enqueue(db, "briefing.generate", {"user_id": 1}, dedup_key="k1", max_attempts=2)
+    again = queue.enqueue(db, "briefing.generate", {"user_id": 1}, dedup_key="k1")
+    assert again.id == first.id
+
+    job = queue.claim(db, "w1", ["briefing.generate"])
+    assert job.id == first.id and job.status == "running" and job.attempts == 1
+    assert queue.claim(db, "w2", ["briefing.generate"]) is None
+
+    queue.fail(db, job, "boom")
+    assert job.status == "queued" and job.active_dedup_key == "k1"
+
+    job = queue.claim(db, "w1", ["briefing.generate"])
+    queue.complete(db, job, {"ok": True})
+    assert job.status == "succeeded" and job.active_dedup_key is None
+
+    # 완료 후에는 같은 키로 새 작업 등록 가능
+    assert queue.enqueue(db, "briefing.generate", {"user_id": 1}, dedup_key="k1").id != first.id
+
+
+def test_kind_concurrency_limit(db, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_KIND_CONCURRENCY", {"village.one_liner": 1})
+    queue.enqueue(db, "village.one_liner", {"village_id": 1})
+    queue.enqueue(db, "village.one_liner", {"village_id": 2})
+    assert queue.claim(db, "w1", ["village.one_liner"]) is not None
+    assert queue.claim(db, "w2", ["village.one_liner"]) is None
+
+
+def test_async_briefing_submit_dedups_and_bounds(db, monkeypatch):
+    from app.domain.briefing.schema.request import BriefingGenerateRequest
+    from app.services.briefing import async_jobs
+
+    monkeypatch.setattr(async_jobs, "find_snapshot", lambda _db, _user_id, _key: None)
+    monkeypatch.setattr(settings, "BRIEFING_ASYNC_MAX_PENDING", 1)
+    req = BriefingGenerateRequest(user_id=1, village_id=2)
+
+    job, existing = async_jobs.submit_briefing_job(db, req)
+    assert existing is None and job.payload["lane"] == "interactive"
+    again, _ = async_jobs.submit_briefing_job(db, req)
+    assert again.id == job.id
+
+    with pytest.raises(async_jobs.BriefingQueueFull):
+        async_jobs.submit_briefing_job(db, req.model_copy(update={"village_id": 3}))
@@ -0,0 +1,26 @@
+from app.services.briefing.json_stream import JSONStreamParser, extract_json
+
+
+def test_extract_fenced_and_bare():
+    fenced = 'prefix\n```json\n{"a": 1, "b": [1, 2]}\n```\nsuffix'
+    assert extract_json(fenced) == {"a": 1, "b": [1, 2]}
+    assert extract_json('결과: {"relevant_indices": [0, 2]} 입니다.') == {"relevant_indices": [0, 2]}
+    assert extract_json("no json here") is None
+
+
+def test_fields_emitted_as_they_close():
+    parser = JSONStreamParser()
+    assert parser.feed('```json\n{"market_summary": "상승 ') == []
+    assert parser.feed('우세", "key_movers": ["A",') == [("market_summary", "상승 우세")]
+    assert parser.feed(' "B"], "x": {"y": "}"}}') == [("key_movers", ["A", "B"]), ("x", {"y": "}"})]
+    assert parser.done
+    assert parser.finish() == {"market_summary": "상승 우세", "key_movers": ["A", "B"], "x": {"y": "}"}}
+
+
+def test_truncated_output_is_recovered():
+    assert extract_json('{"advice": ["a", "b"], "checklist": ["c", "d') == {
+        "advice": ["a", "b"],
+        "checklist": ["c", "d"],
+    }
+    assert extract_json('{"advice": ["a"], "checklist"') == {"advice": ["a"]}
+    assert extract_json('{"score": 1.5, "next": 3.') == {"score": 1.5}
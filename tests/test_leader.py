@@ -0,0 +1,36 @@
+import time
+
+from sqlalchemy.dialects import mysql
+
+from app.domain.job.model import SchedulerLease
+from app.services import leader as leader_module
+
+
+def test_single_leader_and_failover(session_local):
+    session_local(leader_module, SchedulerLease)
+    events = []
+    a = leader_module.LeaderElector("s", lambda: events.append("a+"), lambda: events.append("a-"), ttl_seconds=0.2)
+    b = leader_module.LeaderElector("s", lambda: events.append("b+"), lambda: events.append("b-"), ttl_seconds=0.2)
+
+    a.tick()
+    b.tick()
+    assert (a.is_leader, b.is_leader) == (True, False)
+
+    # a가 갱신을 멈추면 TTL 후 b가 넘겨받음
+    time.sleep(0.3)
+    b.tick()
+    a.tick()
+    assert (a.is_leader, b.is_leader) == (False, True)
+    assert events == ["a+", "b+", "a-"]
+
+
+def test_lease_times_come_from_the_database():
+    elector = leader_module.LeaderElector("s", lambda: None, lambda: None, ttl_seconds=30)
+    stmt = (
+        leader_module.update(SchedulerLease)
+        .where(SchedulerLease.expires_at < leader_module.db_now_plus())
+        .values(holder=elector.holder, expires_at=leader_module.db_now_plus(30))
+    )
+    compiled = stmt.compile(dialect=mysql.dialect())
+    assert str(compiled).count("NOW(6)") == 2
+    assert 30_000_000 in compiled.params.values()
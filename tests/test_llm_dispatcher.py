@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+
+from app.services.briefing import llm
+from app.services.briefing.llm import LLMDispatcher, LLMQueueTimeout, LLMResponse
+
+
+def test_interactive_preempts_queued_batch():
+    d = LLMDispatcher(max_concurrency=1, batch_max_concurrency=1)
+    order = []
+    d.acquire("batch")
+
+    def worker(lane):
+        d.acquire(lane)
+        order.append(lane)
+        d.release(lane)
+
+    batch = threading.Thread(target=worker, args=("batch",))
+    batch.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=worker, args=("interactive",))
+    interactive.start()
+    time.sleep(0.05)
+
+    stats = d.stats()
+    assert stats["lanes"]["batch"]["queued"] == 1
+    assert stats["lanes"]["interactive"]["queued"] == 1
+
+    d.release("batch")
+    batch.join(1)
+    interactive.join(1)
+    assert order == ["interactive", "batch"]
+
+
+def test_batch_lane_cap_and_timeout():
+    d = LLMDispatcher(max_concurrency=2, batch_max_concurrency=1)
+    d.acquire("batch")
+    with pytest.raises(LLMQueueTimeout):
+        d.acquire("batch", timeout=0.05)
+    # interactive still has headroom
+    d.acquire("interactive", timeout=0.05)
+    assert d.stats()["in_flight"] == 2
+    assert d.stats()["lanes"]["batch"]["timeouts"] == 1
+
+
+class _Health:
+    def __init__(self):
+        self.records = []
+        self.timeouts = []
+
+    def record(self, provider, success, _latency):
+        self.records.append((provider, success))
+
+    def record_timeout(self, provider):
+        self.timeouts.append(provider)
+
+    def hedge_delay(self, _provider):
+        return 0.02
+
+    def prefer(self, _primary, _secondary):
+        return False
+
+
+def _provider(text, gate=None, calls=None):
+    def call(_system, _user, _temperature, _timeout):
+        if calls is not None:
+            calls.append(text)
+        if gate is not None:
+            gate.wait(2)
+        return LLMResponse(text=text, model="test")
+
+    return call
+
+
+def _in_flight(d, expected):
+    # 슬롯은 요청 완료 콜백에서 반환되므로 잠시 기다린다
+    for _ in range(100):
+        if d.stats()["in_flight"] == expected:
+            break
+        time.sleep(0.01)
+    return d.stats()["in_flight"]
+
+
+@pytest.fixture
+def health(monkeypatch):
+    h = _Health()
+    monkeypatch.setattr(llm, "provider_health", h)
+    return h
+
+
+def test_deadline_keeps_slot_until_provider_returns(monkeypatch, health):
+    d = LLMDispatcher(max_concurrency=2, batch_max_concurrency=1)
+    gate = threading.Event()
+    monkeypatch.setattr(llm, "dispatcher", d)
+    monkeypatch.setitem(llm._PROVIDERS, "slow", _provider("late", gate))
+
+    assert llm.call_llm("s", "u", provider="slow", timeout=0.05) is None
+    assert health.timeouts == ["slow"]
+    # 타임아웃 후에도 실행 중인 요청이 슬롯을 차지한다
+    assert d.stats()["in_flight"] == 1
+
+    gate.set()
+    assert _in_flight(d, 0) == 0
+    # 포기한 요청의 결과는 건강 점수에 다시 기록되지 않는다
+    assert health.records == []
+
+
+def test_hedge_uses_its_own_slot(monkeypatch, health):
+    d = LLMDispatcher(max_concurrency=2, batch_max_concurrency=1)
+    gate = threading.Event()
+    monkeypatch.setattr(llm, "dispatcher", d)
+    monkeypatch.setattr(llm.settings, "LLM_HEDGE_ENABLED", True)
+    monkeypatch.setattr(llm.settings, "LLM_HEDGE_PROVIDER", "fast")
+    monkeypatch.setitem(llm._PROVIDERS, "slow", _provider("slow", gate))
+    monkeypatch.setitem(llm._PROVIDERS, "fast", _provider("fast"))
+
+    assert llm.call_llm("s", "u", provider="slow", timeout=1.0) == "fast"
+    assert d.stats()["lanes"]["interactive"]["acquired"] == 2
+    assert _in_flight(d, 1) == 1  # 진 primary가 아직 실행 중
+
+    gate.set()
+    assert _in_flight(d, 0) == 0
+    assert health.records == [("fast", True)]
+
+
+def test_hedge_skipped_without_free_slot(monkeypatch, health):
+    d = LLMDispatcher(max_concurrency=1, batch_max_concurrency=1)
+    calls = []
+    monkeypatch.setattr(llm, "dispatcher", d)
+    monkeypatch.setattr(llm.settings, "LLM_HEDGE_ENABLED", True)
+    monkeypatch.setattr(llm.settings, "LLM_HEDGE_PROVIDER", "fast")
+    gate = threading.Event()
+    threading.Timer(0.1, gate.set).start()
+    monkeypatch.setitem(llm._PROVIDERS, "slow", _provider("slow", gate, calls))
+    monkeypatch.setitem(llm._PROVIDERS, "fast", _provider("fast", calls=calls))
+
+    assert llm.call_llm("s", "u", provider="slow", timeout=1.0) == "slow"
+    assert calls == ["slow"]
+    assert _in_flight(d, 0) == 0
+
+
+def test_fake_mode_overrides_pinned_provider(monkeypatch, health):
+    monkeypatch.setattr(llm, "dispatcher", LLMDispatcher(max_concurrency=2, batch_max_concurrency=1))
+    monkeypatch.setattr(llm.settings, "BRIEFING_LLM_PROVIDER", "fake")
+    calls = []
+    monkeypatch.setitem(llm._PROVIDERS, "fake", _provider("fake", calls=calls))
+    monkeypatch.setitem(llm._PROVIDERS, "openai", _provider("openai", calls=calls))
+
+    assert llm.call_llm("s", "u", provider="openai") == "fake"
+    assert llm.call_llm("s", "u", provider="none") is None
+    assert calls == ["fake"]
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.domain.briefing.model import LLMCallLog
+from app.services.briefing import llm_metrics
+from app.services.briefing.llm_metrics import (
+    LLMCallRecord,
+    LLMMetrics,
+    estimate_cost,
+    llm_call_collector,
+    persist_llm_calls,
+    record_llm_call,
+)
+
+
+def _record(agent="stock", model="gpt-4o-mini", **kw):
+    return LLMCallRecord(agent=agent, provider="openai", model=model, lane="interactive", **kw)
+
+
+def test_cost_uses_per_million_pricing():
+    assert estimate_cost("gpt-4o-mini", 1_000_000, 1_000_000) == pytest.approx(0.75)
+    assert estimate_cost("gpt-4o", 2_000, 500) == pytest.approx((2_000 * 2.50 + 500 * 10.00) / 1_000_000)
+    assert estimate_cost("unknown-model", 1_000, 1_000) == 0.0
+
+
+def test_metrics_aggregate_by_agent_and_model():
+    m = LLMMetrics()
+    m.record(_record(prompt_tokens=10, completion_tokens=5, latency_ms=100.0, cost_usd=0.001))
+    m.record(_record(prompt_tokens=20, completion_tokens=5, latency_ms=300.0, cost_usd=0.002, success=False))
+    m.record(_record(agent="news", latency_ms=50.0))
+    (news, stock) = m.snapshot()
+    assert (news["agent"], news["calls"]) == ("news", 1)
+    assert (stock["calls"], stock["errors"], stock["prompt_tokens"], stock["completion_tokens"]) == (2, 1, 30, 10)
+    assert (stock["cost_usd"], stock["avg_latency_ms"]) == (0.003, 200.0)
+
+
+def test_collector_gathers_calls_of_one_briefing(monkeypatch):
+    monkeypatch.setattr(llm_metrics, "metrics", LLMMetrics())
+    record_llm_call(_record(agent="outside"))
+
+    async def stage():
+        # 스테이지는 worker 스레드에서 실행되지만 수집기는 컨텍스트로 따라간다
+        await asyncio.to_thread(record_llm_call, _record(agent="news"))
+
+    with llm_call_collector() as records:
+        record_llm_call(_record(agent="stock"))
+        asyncio.run(stage())
+    record_llm_call(_record(agent="after"))
+    assert [r.agent for r in records] == ["stock", "news"]
+
+
+def test_persist_llm_calls_links_briefing(sqlite_sessions, monkeypatch):
+    db = sqlite_sessions(LLMCallLog)()
+    records = [_record(prompt_tokens=10, completion_tokens=2, cost_usd=0.5), _record(agent="news")]
+
+    monkeypatch.setattr(settings, "LLM_CALL_LOG_ENABLED", False)
+    persist_llm_calls(db, records, user_id=1, village_id=2, briefing_id=3)
+    assert db.query(LLMCallLog).count() == 0
+
+    monkeypatch.setattr(settings, "LLM_CALL_LOG_ENABLED", True)
+    persist_llm_calls(db, records, user_id=1, village_id=2, briefing_id=3)
+    rows = db.query(LLMCallLog).order_by(LLMCallLog.id).all()
+    assert [(r.agent, r.user_id, r.village_id, r.briefing_id) for r in rows] == [
+        ("stock", 1, 2, 3),
+        ("news", 1, 2, 3),
+    ]
+    assert (rows[0].prompt_tokens, float(rows[0].cost_usd)) == (10, 0.5)
+    db.close()
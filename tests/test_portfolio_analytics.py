@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from app.services.portfolio.analytics import HoldingsFrame, Membership, weighted_period_returns
+
+
+def _frame():
+    return HoldingsFrame(
+        user_ids=np.array([1, 1, 1, 2]),
+        asset_ids=np.array([10, 11, 12, 10]),
+        quantity=np.array([2.0, 1.0, 4.0, 3.0]),
+        avg_buy=np.array([100.0, 50.0, 0.0, 120.0]),
+        price=np.array([110.0, 40.0, 10.0, 110.0]),
+        daily_change=np.array([1.0, -2.0, 0.5, 1.0]),
+    )
+
+
+def test_totals_returns_and_groups():
+    frame = _frame()
+    totals = frame.totals(frame.user_ids == 1)
+    assert (totals.value, totals.cost) == (300.0, 250.0)
+    assert totals.return_rate == pytest.approx(20.0)
+    assert frame.asset_return_rates().tolist() == pytest.approx([10.0, -20.0, 0.0, -8.3333333])
+
+    by_user = frame.by_user()
+    assert by_user[2].value == 330.0 and by_user[2].cost == 360.0
+
+    villages = frame.group_totals(frame.memberships({10: [101], 11: [101, 102]}))
+    assert villages[101].value == 220.0 + 40.0 + 330.0
+    assert villages[102].cost == 50.0
+    buckets = frame.group_totals(Membership.from_lists([["tech"], ["tech", "growth"], [], ["tech"]]))
+    assert list(buckets) == ["tech", "growth"]
+
+    top, bottom = frame.ranked(2)
+    assert top == [0, 2] and bottom == [1, 3]
+    assert frame.weighted_daily_change(frame.user_ids == 1) == pytest.approx((220 - 80 + 20) / 300.0)
+
+
+def test_weighted_period_returns_skips_missing_closes():
+    closes = np.array([[100.0, 110.0, 121.0], [50.0, np.nan, 40.0]])
+    rates = weighted_period_returns(np.array([1.0, 2.0]), closes)
+    assert rates.tolist() == pytest.approx([10.0, 10.0])
+    assert weighted_period_returns(np.array([1.0]), np.array([[100.0]])).size == 0
@@ -0,0 +1,61 @@
+import csv
+import io
+import zipfile
+from datetime import date
+from xml.etree import ElementTree
+
+from fastapi.testclient import TestClient
+
+from app.domain.asset.model import Asset, AssetPrice, AssetPriceMonthly
+from app.domain.portfolio import controller
+from app.domain.portfolio.model import PortfolioAssetValuation, PortfolioVillageValuation, UserPortfolio
+from app.domain.village.model import Village, VillageAsset
+from app.main import app
+from app.services.portfolio import export
+
+_TABLES = [Asset, AssetPrice, AssetPriceMonthly, UserPortfolio, Village, VillageAsset, PortfolioAssetValuation, PortfolioVillageValuation]
+_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def _seed(db, months):
+    db.add(Asset(asset_id=1, symbol="005930", name="삼성전자 <보통주>", country_code="KR", asset_type="STOCK"))
+    db.add(AssetPrice(asset_id=1, price=70000))
+    db.add(UserPortfolio(user_id=5, asset_id=1, quantity=3, avg_buy_price=60000))
+    for i in range(months):
+        db.add(AssetPriceMonthly(asset_id=1, month=date(2000 + i // 12, i % 12 + 1, 1), close_price=1000 + i))
+    db.commit()
+
+
+def test_csv_history_streams_in_chunks(session_local, monkeypatch):
+    db = session_local(controller, *_TABLES)()
+    _seed(db, months=240)
+    monkeypatch.setattr(export, "_CHUNK_BYTES", 1024)
+
+    chunks = list(export.iter_export(db, 5, "csv", "history"))
+    assert len(chunks) > 3
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8-sig"))))
+    assert rows[0] == export.HISTORY_HEADER
+    assert len(rows) == 241
+    assert rows[1] == ["2000-01-01", "005930", "삼성전자 <보통주>", "3.0", "1000.0", "3000.0"]
+    db.close()
+
+
+def test_xlsx_export_route(session_local):
+    db = session_local(controller, *_TABLES)()
+    _seed(db, months=3)
+    db.close()
+
+    response = TestClient(app).get("/api/v1/portfolio/export", params={"user_id": 5, "format": "xlsx"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == export.MEDIA_TYPES["xlsx"]
+
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.testzip() is None
+    holdings = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml")).findall(".//s:row", _NS)
+    history = ElementTree.fromstring(archive.read("xl/worksheets/sheet2.xml")).findall(".//s:row", _NS)
+    assert len(holdings) == 2 and len(history) == 4
+    assert holdings[1].find("s:c/s:is/s:t", _NS).text == "005930"
+    assert [v.text for v in holdings[1].findall("s:c/s:v", _NS)][-3:] == ["210000.0", "180000.0", "16.67"]
+
+    bad = TestClient(app).get("/api/v1/portfolio/export", params={"user_id": 5, "format": "pdf"})
+    assert bad.status_code == 400
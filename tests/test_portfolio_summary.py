@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import event
+
+from app.domain.asset.model import Asset, AssetPrice
+from app.domain.portfolio.model import RebalancingSnapshot, UserPortfolio
+from app.domain.village.model import Village, VillageAsset
+from app.services.market_data import MarketContext
+from app.services.portfolio import rebalancing
+from app.services.portfolio import summary as summary_module
+
+_TABLES = [Asset, AssetPrice, UserPortfolio, Village, VillageAsset, RebalancingSnapshot]
+
+
+@pytest.fixture
+def db(sqlite_sessions, monkeypatch):
+    factory = sqlite_sessions(*_TABLES)
+
+    async def no_market(*_args, **_kwargs):
+        return MarketContext()
+
+    monkeypatch.setattr(summary_module, "get_market_context", no_market)
+    monkeypatch.setattr(summary_module, "get_usdkrw_rate", lambda: 1300.0)
+    monkeypatch.setattr(summary_module, "_upsert_asset_prices", lambda db, price_map: None)
+    monkeypatch.setattr(rebalancing, "call_llm", lambda *args, **kwargs: None)
+    session = factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _seed(db, user_id, village_count):
+    for i in range(village_count):
+        asset_id = user_id * 100 + i
+        village_id = user_id * 100 + i
+        db.add(Asset(asset_id=asset_id, symbol=f"S{asset_id}", name=f"asset {asset_id}", country_code="KR", asset_type="STOCK"))
+        db.add(AssetPrice(asset_id=asset_id, price=110 + i))
+        db.add(UserPortfolio(user_id=user_id, asset_id=asset_id, quantity=10, avg_buy_price=100))
+        db.add(Village(village_id=village_id, user_id=user_id, name=f"village {i}"))
+        db.add(VillageAsset(village_id=village_id, asset_id=asset_id))
+    # 첫 마을은 모든 자산을 함께 담는다
+    for i in range(1, village_count):
+        db.add(VillageAsset(village_id=user_id * 100, asset_id=user_id * 100 + i))
+    db.commit()
+
+
+def _count_queries(db, user_id):
+    statements = []
+    engine = db.get_bind()
+
+    def count(*_args):
+        statements.append(1)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        result = asyncio.run(summary_module.build_portfolio_summary(user_id, db, include_rebalancing=False))
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return result, len(statements)
+
+
+def test_village_totals_use_constant_query_count(db):
+    _seed(db, user_id=1, village_count=1)
+    _seed(db, user_id=2, village_count=6)
+
+    _small, small_queries = _count_queries(db, 1)
+    large, large_queries = _count_queries(db, 2)
+
+    assert small_queries == large_queries
+    rates = {r.village_id: r.return_rate for r in large.village_return_rates}
+    assert rates[201] == 11.0
+    # (110+111+...+115)*10 / (100*10*6) - 1
+    assert rates[200] == pytest.approx((sum(range(110, 116)) / 600.0 - 1) * 100.0, abs=0.01)
+    assert large.summary.village_count == 6
+
+
+def test_summary_reads_rebalancing_from_snapshot_without_llm(db, monkeypatch):
+    _seed(db, user_id=3, village_count=2)
+
+    def no_llm(*_args, **_kwargs):
+        raise AssertionError("LLM called on the read path")
+
+    monkeypatch.setattr(rebalancing, "call_llm", no_llm)
+    tasks = BackgroundTasks()
+    first = asyncio.run(summary_module.build_portfolio_summary(3, db, background_tasks=tasks))
+    assert [r.id for r in first.rebalancing_recommendations] == ["strengthen_dividend"]
+    assert len(tasks.tasks) == 1
+
+    monkeypatch.setattr(rebalancing, "call_llm", lambda *args, **kwargs: "risk_balance, strengthen_dividend")
+    refreshed = rebalancing.refresh_rebalancing_snapshot(db, 3)
+    assert [r.id for r in refreshed] == ["risk_balance", "strengthen_dividend"]
+
+    monkeypatch.setattr(rebalancing, "call_llm", no_llm)
+    tasks = BackgroundTasks()
+    second = asyncio.run(summary_module.build_portfolio_summary(3, db, background_tasks=tasks))
+    assert second.rebalancing_recommendations == refreshed
+    assert not tasks.tasks
@@ -0,0 +1,93 @@
+import pytest
+
+from app.domain.asset.model import Asset, AssetPrice
+from app.domain.portfolio.model import PortfolioAssetValuation, PortfolioVillageValuation, UserPortfolio
+from app.domain.village.model import Village, VillageAsset
+from app.services.portfolio import valuation
+
+_TABLES = [Asset, AssetPrice, UserPortfolio, Village, VillageAsset, PortfolioAssetValuation, PortfolioVillageValuation]
+
+
+@pytest.fixture
+def db(sqlite_sessions):
+    session = sqlite_sessions(*_TABLES)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _seed(db):
+    for asset_id, price in ((1, 100.0), (2, 50.0), (3, 10.0)):
+        db.add(Asset(asset_id=asset_id, symbol=f"A{asset_id}", name=f"asset {asset_id}", country_code="KR", asset_type="STOCK"))
+        db.add(AssetPrice(asset_id=asset_id, price=price))
+    for user_id in (7, 8):
+        db.add(UserPortfolio(user_id=user_id, asset_id=1, quantity=2, avg_buy_price=90))
+        db.add(UserPortfolio(user_id=user_id, asset_id=2, quantity=4, avg_buy_price=60))
+        db.add(Village(village_id=user_id * 10, user_id=user_id, name="growth"))
+        db.add(Village(village_id=user_id * 10 + 1, user_id=user_id, name="all"))
+        db.add(VillageAsset(village_id=user_id * 10, asset_id=1))
+        db.add(VillageAsset(village_id=user_id * 10 + 1, asset_id=1))
+        db.add(VillageAsset(village_id=user_id * 10 + 1, asset_id=2))
+    db.commit()
+
+
+def _village_values(db, user_id):
+    return {vid: float(row.market_value) for vid, row in valuation.get_village_valuations(db, user_id).items()}
+
+
+def test_price_ingest_updates_only_changed_holdings_incrementally(db):
+    _seed(db)
+    valuation.refresh_user_valuations(db, 7)
+    assert _village_values(db, 7) == {70: 200.0, 71: 400.0}
+
+    changed = valuation.ingest_asset_prices(db, {1: 110.0, 2: 50.0, 3: 12.0})
+    assert changed == {1, 3}
+
+    rows = {r.asset_id: r for r in valuation.get_asset_valuations(db, 7)}
+    assert float(rows[1].market_value) == 220.0 and float(rows[2].market_value) == 200.0
+    assert _village_values(db, 7) == {70: 220.0, 71: 420.0}
+    totals = valuation.get_user_totals(db, 7)
+    assert (totals.value, totals.cost) == (420.0, 420.0)
+
+    # 증분 결과는 원천에서 다시 계산한 값과 같다
+    valuation.refresh_user_valuations(db, 7)
+    assert _village_values(db, 7) == {70: 220.0, 71: 420.0}
+
+
+def test_unmaterialized_user_is_filled_on_first_read(db):
+    _seed(db)
+    valuation.ingest_asset_prices(db, {2: 55.0})
+    assert db.query(PortfolioAssetValuation).filter_by(user_id=8).count() == 0
+
+    assert _village_values(db, 8) == {80: 200.0, 81: 420.0}
+
+
+def test_concurrent_ingests_from_same_snapshot_do_not_double_count(db, monkeypatch):
+    _seed(db)
+    valuation.refresh_user_valuations(db, 7)
+
+    # 두 수집이 같은 시작 상태(가격 100)를 읽는 경합 재현: 두 번째 수집의 SELECT는 첫 번째가 본 결과를 그대로 받는다
+    snapshot = {}
+    mode = {"value": "record"}
+    real_execute = db.execute
+
+    def execute(stmt, *args, **kwargs):
+        sql = str(stmt)
+        if not sql.lstrip().upper().startswith("SELECT"):
+            return real_execute(stmt, *args, **kwargs)
+        if mode["value"] == "replay" and sql in snapshot:
+            return snapshot[sql]()
+        frozen = real_execute(stmt, *args, **kwargs).freeze()
+        snapshot.setdefault(sql, frozen)
+        return frozen()
+
+    monkeypatch.setattr(db, "execute", execute)
+    assert valuation.ingest_asset_prices(db, {1: 110.0}) == {1}
+    mode["value"] = "replay"
+    assert valuation.ingest_asset_prices(db, {1: 120.0}) == {1}
+    monkeypatch.undo()
+
+    rows = {r.asset_id: r for r in valuation.get_asset_valuations(db, 7)}
+    assert float(rows[1].market_value) == 240.0
+    assert _village_values(db, 7) == {70: 240.0, 71: 440.0}
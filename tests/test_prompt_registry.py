@@ -0,0 +1,72 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core import database
+from app.core.config import settings
+from app.domain.prompt import controller as prompt_controller
+from app.domain.prompt.controller import link_village_prompt, list_prompts
+from app.domain.prompt.model import Prompt, PromptRegistryVersion, VillagePrompt
+from app.domain.prompt.schema.request import VillagePromptLinkRequest
+from app.services.briefing import prompt_registry as registry_module
+from app.services.briefing.prompt_registry import STOCK_PROMPT_KEY, PromptRegistry
+
+
+@pytest.fixture
+def prompts_db(session_local, monkeypatch):
+    factory = session_local(database, Prompt, VillagePrompt, PromptRegistryVersion)
+    monkeypatch.setattr(settings, "DB_ENABLED", True)
+    registry = PromptRegistry(ttl_seconds=0)
+    monkeypatch.setattr(registry_module, "prompt_registry", registry)
+    monkeypatch.setattr(prompt_controller, "prompt_registry", registry)
+    db = factory()
+    db.add_all(
+        [
+            Prompt(prompt_id=1, prompt_key=STOCK_PROMPT_KEY, title="stock", content="BASE"),
+            Prompt(prompt_id=2, prompt_key=f"{STOCK_PROMPT_KEY}:a", title="a", content="A"),
+            Prompt(prompt_id=3, prompt_key=f"{STOCK_PROMPT_KEY}:b", title="b", content="B"),
+            Prompt(prompt_id=4, prompt_key=f"{STOCK_PROMPT_KEY}:off", title="off", content="OFF", is_active=False),
+            VillagePrompt(village_id=7, prompt_id=2, sort_order=1),
+            VillagePrompt(village_id=7, prompt_id=3, sort_order=2),
+            VillagePrompt(village_id=7, prompt_id=4, sort_order=3),
+            VillagePrompt(village_id=7, prompt_id=1, sort_order=0),
+        ]
+    )
+    db.commit()
+    db.close()
+    return factory
+
+
+def test_village_overrides_follow_sort_order(prompts_db):
+    registry = registry_module.prompt_registry
+    prompts = registry.for_village(7)
+    assert prompts.overrides == {STOCK_PROMPT_KEY: ["A", "B"]}
+    assert prompts.system(STOCK_PROMPT_KEY, "DEFAULT").endswith("\n\n## 마을 추가 지침\nA\n\nB")
+    assert registry.for_village(8).system(STOCK_PROMPT_KEY, "DEFAULT") == "BASE"
+    assert registry.for_village(8).system("briefing.missing", "DEFAULT") == "DEFAULT"
+
+
+def test_link_change_invalidates_other_process_cache(prompts_db):
+    # 다른 프로세스의 레지스트리: 오버라이드를 캐시한 상태
+    other = PromptRegistry(ttl_seconds=0)
+    assert other.for_village(7).overrides[STOCK_PROMPT_KEY] == ["A", "B"]
+
+    # 건수·활성 수가 그대로인 sort_order 변경도 버전 카운터로 감지
+    db = prompts_db()
+    link_village_prompt(7, VillagePromptLinkRequest(prompt_key=f"{STOCK_PROMPT_KEY}:a", sort_order=5), db=db)
+    db.close()
+
+    assert other.for_village(7).overrides[STOCK_PROMPT_KEY] == ["B", "A"]
+
+
+def test_cache_version_is_the_counter_and_base_keys_are_rejected(prompts_db):
+    db = prompts_db()
+    registry_module.prompt_registry.refresh(force=True)
+    assert list_prompts(db=db).cache_version == 0
+
+    with pytest.raises(HTTPException) as exc:
+        link_village_prompt(7, VillagePromptLinkRequest(prompt_key=STOCK_PROMPT_KEY), db=db)
+    assert exc.value.status_code == 400
+
+    link_village_prompt(7, VillagePromptLinkRequest(prompt_key=f"{STOCK_PROMPT_KEY}:a", sort_order=4), db=db)
+    assert list_prompts(db=db).cache_version == 1
+    db.close()
@@ -0,0 +1,10 @@
+from app.domain.briefing.model import BriefingSnapshot
+
+
+def test_payload_round_trip_and_legacy_read():
+    snapshot = BriefingSnapshot(user_id=1, village_id=2, time_slot="morning", payload={"title": "오늘의 브리핑"})
+    assert snapshot.payload_json is None
+    assert snapshot.payload == {"title": "오늘의 브리핑"}
+
+    legacy = BriefingSnapshot(user_id=1, village_id=2, time_slot="morning", payload_json={"title": "old"})
+    assert legacy.payload == {"title": "old"}
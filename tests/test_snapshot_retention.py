@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta
+
+from app.domain.briefing.model import BriefingSnapshot, BriefingSnapshotArchive
+from app.services.snapshot_retention import archive_old_snapshots
+
+
+def test_archive_keeps_latest_per_village(sqlite_sessions):
+    db = sqlite_sessions(BriefingSnapshot, BriefingSnapshotArchive)()
+    base = datetime(2026, 1, 1)
+    for i in range(5):
+        row = BriefingSnapshot(user_id=1, village_id=10, time_slot="morning", created_at=base + timedelta(hours=i))
+        row.payload = {"i": i}
+        db.add(row)
+    for i in range(2):
+        db.add(BriefingSnapshot(user_id=1, village_id=11, time_slot="morning", created_at=base, payload_json={"j": i}))
+    db.commit()
+
+    moved = archive_old_snapshots(db, BriefingSnapshot, BriefingSnapshotArchive, ("user_id", "village_id"), keep=2, batch_size=1)
+
+    assert moved == 3
+    kept = db.query(BriefingSnapshot).filter(BriefingSnapshot.village_id == 10).all()
+    assert sorted(r.payload["i"] for r in kept) == [3, 4]
+    assert db.query(BriefingSnapshot).filter(BriefingSnapshot.village_id == 11).count() == 2
+    archived = db.query(BriefingSnapshotArchive).all()
+    assert sorted(r.payload["i"] for r in archived) == [0, 1, 2]
+    assert all(r.payload_json is None for r in archived)
+    db.close()
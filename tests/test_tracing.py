@@ -0,0 +1,71 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import tracing
+from app.main import app
+from app.services import market_data
+from app.services.market_data import TickerQuote
+
+
+class MemoryExporter(tracing.SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def exporter():
+    exp = MemoryExporter()
+    tracing.set_exporter(exp)
+    try:
+        yield exp
+    finally:
+        tracing.set_exporter(None)
+
+
+def test_spans_disabled_without_exporter():
+    with tracing.span("noop", a=1) as s:
+        s.set_attribute("b", 2)
+    assert tracing.current_span() is None
+
+
+def test_prefetch_spans_nest_across_threads(exporter, monkeypatch):
+    monkeypatch.setattr(market_data, "_fetch_yfinance_quote", lambda t: TickerQuote(ticker=t, price=1.0))
+    monkeypatch.setattr(market_data, "_fetch_google_news", lambda t, q, limit: [{"title": f"{t} news"}])
+
+    with tracing.span("root") as root:
+        market_data.prefetch_market_snapshot(["AAPL", "MSFT"], news_per_ticker=1)
+
+    by_name = {}
+    for s in exporter.spans:
+        by_name.setdefault(s.name, []).append(s)
+    prefetch = by_name["market.prefetch"][0]
+    assert prefetch.parent_id == root.span_id
+    assert prefetch.attributes["ticker_count"] == 2
+    assert len(by_name["market.quote"]) == 2
+    assert {s.parent_id for s in by_name["market.quote"] + by_name["market.news"]} == {prefetch.span_id}
+    assert {s.trace_id for s in exporter.spans} == {root.trace_id}
+    assert all(s.attributes["news_count"] == 1 for s in by_name["market.news"])
+
+
+def test_http_request_span(exporter):
+    response = TestClient(app).get("/health")
+    http = [s for s in exporter.spans if s.name == "http.request"]
+    assert len(http) == 1
+    assert http[0].attributes["status_code"] == 200
+    assert http[0].attributes["route"] == "/health"
+    assert response.headers["X-Trace-Id"] == http[0].trace_id
+
+
+class _NoExport(tracing.SpanExporter):
+    pass
+
+
+def test_custom_exporters_are_checked_when_built():
+    with pytest.raises(TypeError):
+        _NoExport()
+    assert isinstance(tracing._build_exporter("tests.test_tracing:MemoryExporter"), MemoryExporter)
+    with pytest.raises(TypeError):
+        tracing._build_exporter("builtins:dict")